@@ -0,0 +1,192 @@
+import random
+import threading
+from array import array
+from logica import TIEMPO_LIMITE
+from muestreo import TablaAliasDinamica
+from pregunta import Operacion
+
+# Tamaños de los conjuntos que puede pedir el motor
+TAMAÑOS = range(3, 7)
+# Respuestas despues de las cuales una respuesta vieja pesa la mitad
+VIDA_MEDIA = 20
+# Precision en la que la partida no es ni aburrida ni frustrante
+PRECISION_OBJETIVO = 0.75
+# Cuanto se aleja la precision del objetivo antes de que un tamaño deje de elegirse
+ANCHO_ZONA = 0.25
+# Peso minimo de cada categoria; ninguna deja de aparecer del todo
+PESO_MINIMO = 0.1
+# Respuestas imaginarias con la precision objetivo con las que empieza cada categoria
+RESPUESTAS_PREVIAS = 2.0
+# Cuando la escala pasa este valor se normalizan los contadores
+LIMITE_ESCALA = 1e100
+
+
+# Contadores con decaimiento exponencial de varias categorias
+# En lugar de multiplicar todos los contadores por el decaimiento en cada respuesta,
+# las respuestas nuevas se suman con un peso (escala) que crece; asi cada respuesta es O(1)
+class ContadoresDecaidos:
+    def __init__(self, cantidad, vida_media=VIDA_MEDIA, respuestas_previas=RESPUESTAS_PREVIAS,
+                 precision_previa=PRECISION_OBJETIVO, tiempo_previo=TIEMPO_LIMITE / 2):
+        """
+        Args:
+            cantidad: Cantidad de categorias
+            vida_media: Respuestas despues de las cuales una respuesta pesa la mitad
+            respuestas_previas: Evidencia inicial de cada categoria
+            precision_previa: Precision de esa evidencia inicial
+            tiempo_previo: Tiempo de respuesta de esa evidencia inicial
+        """
+        self.crecimiento = 2.0 ** (1.0 / vida_media)
+        self.escala = 1.0
+        self.respuestas = array("d", [respuestas_previas] * cantidad)
+        self.aciertos = array("d", [respuestas_previas * precision_previa] * cantidad)
+        self.tiempos = array("d", [respuestas_previas * tiempo_previo] * cantidad)
+
+    def avanzar(self):
+        """
+        Cuenta una respuesta mas: todo lo anterior pierde peso
+        """
+        self.escala *= self.crecimiento
+        if self.escala > LIMITE_ESCALA:
+            # Muy de vez en cuando (cada miles de respuestas): volver a escala 1
+            for contadores in (self.respuestas, self.aciertos, self.tiempos):
+                for i in range(len(contadores)):
+                    contadores[i] /= self.escala
+            self.escala = 1.0
+
+    def registrar(self, i, correcta, tiempo):
+        """
+        Suma una respuesta a la categoria i, con el peso de la respuesta actual
+        """
+        self.respuestas[i] += self.escala
+        if correcta:
+            self.aciertos[i] += self.escala
+        self.tiempos[i] += self.escala * tiempo
+
+    def precision(self, i):
+        """
+        Retorna la proporcion de aciertos reciente de la categoria i
+        """
+        return self.aciertos[i] / self.respuestas[i]
+
+    def tiempo_medio(self, i):
+        """
+        Retorna el tiempo de respuesta reciente de la categoria i, en segundos
+        """
+        return self.tiempos[i] / self.respuestas[i]
+
+    def evidencia(self, i):
+        """
+        Retorna cuantas respuestas (ya decaidas) hay de la categoria i
+        """
+        return self.respuestas[i] / self.escala
+
+
+# Clase que elige operacion y tamaños de las preguntas segun como viene respondiendo el jugador
+# Las operaciones que mas le cuestan (errores y lentitud) salen mas seguido; los tamaños
+# se eligen cerca de los que responde con la precision objetivo
+class MotorAdaptativo:
+    def __init__(self, operaciones=len(Operacion), tamaños=TAMAÑOS, tiempo_limite=TIEMPO_LIMITE,
+                 vida_media=VIDA_MEDIA):
+        """
+        Args:
+            operaciones: Cantidad de operaciones (valores de pregunta.Operacion)
+            tamaños: Tamaños de conjunto posibles, consecutivos
+            tiempo_limite: Segundos para responder; una respuesta tan lenta cuenta
+                como muy dificil
+            vida_media: Respuestas despues de las cuales una respuesta pesa la mitad
+        """
+        self.tamaños = tamaños
+        self.tiempo_limite = tiempo_limite
+        self.operaciones = ContadoresDecaidos(operaciones, vida_media,
+                                              tiempo_previo=tiempo_limite / 2)
+        self.por_tamaño = ContadoresDecaidos(len(tamaños), vida_media,
+                                             tiempo_previo=tiempo_limite / 2)
+        self.tabla_operaciones = TablaAliasDinamica(
+            [self.peso_operacion(i) for i in range(operaciones)])
+        self.tabla_tamaños = TablaAliasDinamica(
+            [self.peso_tamaño(i) for i in range(len(tamaños))])
+
+        # El hilo de preguntas elige mientras el principal registra respuestas
+        self.bloqueo = threading.Lock()
+
+    def peso_operacion(self, i):
+        """
+        Peso de una operacion: mas errores y mas lentitud, mas seguido aparece
+        """
+        lentitud = min(1.0, self.operaciones.tiempo_medio(i) / self.tiempo_limite)
+        return PESO_MINIMO + (1.0 - self.operaciones.precision(i)) + 0.5 * lentitud
+
+    def peso_tamaño(self, i):
+        """
+        Peso de un tamaño: maximo si su precision esta en el objetivo, y baja si es
+        demasiado facil o demasiado dificil
+        """
+        distancia = abs(self.por_tamaño.precision(i) - PRECISION_OBJETIVO)
+        return PESO_MINIMO + max(0.0, 1.0 - distancia / ANCHO_ZONA)
+
+    def elegir_operacion(self, rng=random):
+        """
+        Retorna el valor de la operacion de la proxima pregunta, en O(1)
+        """
+        with self.bloqueo:
+            return self.tabla_operaciones.elegir(rng)
+
+    def elegir_tamaño(self, rng=random):
+        """
+        Retorna la cantidad de elementos de un conjunto de la proxima pregunta, en O(1)
+        """
+        with self.bloqueo:
+            return self.tamaños[self.tabla_tamaños.elegir(rng)]
+
+    def registrar(self, pregunta, correcta, tiempo):
+        """
+        Actualiza las estadisticas con una respuesta, en O(1): solo cambian los pesos
+        de la operacion y los tamaños de esta pregunta
+
+        Args:
+            pregunta: Pregunta respondida
+            correcta: True si la respuesta fue correcta (una pregunta vencida cuenta como error)
+            tiempo: Segundos que tardo en responder
+        """
+        with self.bloqueo:
+            operacion = int(pregunta.operacion)
+            self.operaciones.avanzar()
+            self.operaciones.registrar(operacion, correcta, tiempo)
+            self.tabla_operaciones.actualizar(operacion, self.peso_operacion(operacion))
+
+            self.por_tamaño.avanzar()
+            for conjunto in (pregunta.conjunto_a, pregunta.conjunto_b):
+                # Preguntas de otro origen pueden tener tamaños que el motor no elige
+                i = len(conjunto) - self.tamaños.start
+                if 0 <= i < len(self.tamaños):
+                    self.por_tamaño.registrar(i, correcta, tiempo)
+                    self.tabla_tamaños.actualizar(i, self.peso_tamaño(i))
+
+    def resumen(self):
+        """
+        Retorna las estadisticas actuales
+
+        Returns:
+            Diccionario con 'operaciones' y 'tamaños': nombre -> precision, tiempo
+            medio, evidencia y probabilidad de salir
+        """
+        with self.bloqueo:
+            return {
+                "operaciones": self.resumir(self.operaciones, self.tabla_operaciones,
+                                            [operacion.nombre for operacion in Operacion]),
+                "tamaños": self.resumir(self.por_tamaño, self.tabla_tamaños, list(self.tamaños)),
+            }
+
+    def resumir(self, contadores, tabla, nombres):
+        """
+        Arma el resumen de un grupo de categorias
+        """
+        return {
+            nombre: {
+                "precision": round(contadores.precision(i), 3),
+                "tiempo_medio": round(contadores.tiempo_medio(i), 2),
+                "evidencia": round(contadores.evidencia(i), 2),
+                "probabilidad": round(tabla.pesos[i] / tabla.total, 3),
+            }
+            for i, nombre in enumerate(nombres)
+        }
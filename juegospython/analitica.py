@@ -0,0 +1,388 @@
+import os
+import sys
+import mmap
+import time
+import queue
+import random
+import struct
+import argparse
+import threading
+from pregunta import NOMBRES
+
+# Formato del archivo: cabecera y despues registros de tamaño fijo, solo se agregan al final
+MAGICO = b"SZAN"
+VERSION_ANALITICA = 1
+CABECERA = struct.Struct("<4sHH")           # magico, version, tamaño de cada registro
+# tipo, operacion, mascara_a, mascara_b, elegida, correcta, tiempo_ms, puntos, partida, momento_ms
+REGISTRO = struct.Struct("<BBHHBBIiIQ4x")
+
+TIPO_RESPUESTA = 1
+TIPO_VENCIDA = 2
+TIPO_FIN = 3
+
+# Valor de 'elegida' cuando la pregunta vencio sin respuesta
+SIN_RESPUESTA = 255
+
+# Registros juntados antes de escribir, y segundos maximos que uno espera en memoria
+TAMAÑO_TANDA = 64
+INTERVALO_ESCRITURA = 2.0
+# Registros que el lector procesa por vez
+TAMAÑO_BLOQUE = 1 << 18
+
+
+def tipo_numpy():
+    """
+    Retorna el dtype de NumPy con los mismos campos que REGISTRO, para leer el
+    archivo sin copiarlo
+
+    Raises:
+        ImportError si NumPy no esta instalado
+    """
+    # Import local: solo el lector necesita NumPy, el juego escribe sin el
+    try:
+        import numpy as np
+    except ImportError:
+        raise ImportError("leer el registro de analitica necesita NumPy (pip install numpy)")
+    tipo = np.dtype([
+        ("tipo", "u1"), ("operacion", "u1"), ("mascara_a", "<u2"), ("mascara_b", "<u2"),
+        ("elegida", "u1"), ("correcta", "u1"), ("tiempo_ms", "<u4"), ("puntos", "<i4"),
+        ("partida", "<u4"), ("momento_ms", "<u8"), ("relleno", "V4"),
+    ])
+    assert tipo.itemsize == REGISTRO.size
+    return tipo
+
+
+def ruta_por_defecto():
+    """
+    Retorna la ruta del registro dentro del directorio de datos del usuario
+    """
+    base = os.environ.get("XDG_DATA_HOME") or os.path.join(os.path.expanduser("~"), ".local", "share")
+    return os.path.join(base, "set-zero", f"analitica_v{VERSION_ANALITICA}.bin")
+
+
+def leer_cabecera(archivo):
+    """
+    Revisa la cabecera de un archivo abierto al principio
+
+    Raises:
+        ValueError si no es un registro de esta version
+    """
+    datos = archivo.read(CABECERA.size)
+    if len(datos) < CABECERA.size:
+        raise ValueError("registro de analitica incompleto")
+    magico, version, tamaño = CABECERA.unpack(datos)
+    if magico != MAGICO or version != VERSION_ANALITICA or tamaño != REGISTRO.size:
+        raise ValueError("registro de analitica incompatible")
+
+
+# Clase que agrega registros al final del archivo desde un hilo propio
+# El hilo del juego solo pone una tupla en una cola; empaquetar y escribir pasa en el otro hilo,
+# en tandas, asi el disco nunca frena un cuadro
+class RegistroAnalitica:
+    def __init__(self, ruta=None, tamaño_tanda=TAMAÑO_TANDA, intervalo=INTERVALO_ESCRITURA):
+        """
+        Abre (o crea) el archivo y arranca el hilo escritor
+
+        Args:
+            ruta: Archivo del registro (por defecto en el directorio de datos del usuario)
+            tamaño_tanda: Registros que se juntan antes de escribir
+            intervalo: Segundos maximos entre que se agrega un registro y se escribe
+
+        Raises:
+            OSError si no se puede abrir el archivo
+            ValueError si el archivo existe pero no es un registro de esta version
+        """
+        self.ruta = ruta or ruta_por_defecto()
+        self.tamaño_tanda = tamaño_tanda
+        self.intervalo = intervalo
+        self.archivo = self.abrir(self.ruta)
+
+        self.cola = queue.SimpleQueue()
+        self.escritos = 0
+        self.hilo = threading.Thread(target=self.escribir, name="RegistroAnalitica", daemon=True)
+        self.hilo.start()
+
+    @staticmethod
+    def abrir(ruta):
+        """
+        Abre el archivo para agregar registros; si el juego se cerro a mitad de un
+        registro, descarta ese pedazo para que los siguientes queden alineados
+        """
+        carpeta = os.path.dirname(ruta)
+        if carpeta:
+            os.makedirs(carpeta, exist_ok=True)
+        archivo = open(ruta, "a+b")
+        archivo.seek(0, os.SEEK_END)
+        tamaño = archivo.tell()
+        if tamaño == 0:
+            archivo.write(CABECERA.pack(MAGICO, VERSION_ANALITICA, REGISTRO.size))
+            archivo.flush()
+            return archivo
+
+        try:
+            archivo.seek(0)
+            leer_cabecera(archivo)
+        except ValueError:
+            archivo.close()
+            raise
+        sobrante = (tamaño - CABECERA.size) % REGISTRO.size
+        if sobrante:
+            archivo.truncate(tamaño - sobrante)
+        return archivo
+
+    def agregar(self, tipo, operacion=0, mascara_a=0, mascara_b=0, elegida=SIN_RESPUESTA,
+                correcta=False, tiempo_ms=0, puntos=0, partida=0):
+        """
+        Encola un registro; no escribe nada en este hilo
+        """
+        self.cola.put((tipo, operacion, mascara_a, mascara_b, elegida, correcta, tiempo_ms,
+                       puntos, partida, int(time.time() * 1000)))
+
+    def respuesta(self, partida, pregunta, elegida, correcta, tiempo, puntos):
+        """
+        Registra una pregunta respondida
+
+        Args:
+            partida: Identificador de la partida
+            pregunta: Pregunta respondida
+            elegida: Posicion de la opcion elegida
+            correcta: True si fue correcta
+            tiempo: Segundos que tardo en responder
+            puntos: Puntaje despues de responder
+        """
+        self.agregar(TIPO_RESPUESTA, int(pregunta.operacion), pregunta.conjunto_a.mascara,
+                     pregunta.conjunto_b.mascara, elegida, correcta, round(tiempo * 1000),
+                     puntos, partida)
+
+    def vencida(self, partida, pregunta, tiempo, puntos):
+        """
+        Registra una pregunta que vencio sin respuesta
+        """
+        self.agregar(TIPO_VENCIDA, int(pregunta.operacion), pregunta.conjunto_a.mascara,
+                     pregunta.conjunto_b.mascara, SIN_RESPUESTA, False, round(tiempo * 1000),
+                     puntos, partida)
+
+    def fin(self, partida, puntos, duracion):
+        """
+        Registra el puntaje final de una partida
+
+        Args:
+            partida: Identificador de la partida
+            puntos: Puntaje final
+            duracion: Segundos que duro la partida
+        """
+        self.agregar(TIPO_FIN, tiempo_ms=round(duracion * 1000), puntos=puntos, partida=partida)
+
+    @staticmethod
+    def nueva_partida():
+        """
+        Retorna un identificador al azar para una partida
+        """
+        return random.getrandbits(32)
+
+    def escribir(self):
+        """
+        Loop del hilo escritor: junta registros y los escribe en una sola llamada
+        cuando hay una tanda completa, cuando el mas viejo espero el intervalo o al cerrar
+        """
+        tanda = bytearray()
+        limite = None
+        terminar = False
+        while not terminar:
+            espera = None if limite is None else max(0.0, limite - time.monotonic())
+            try:
+                registro = self.cola.get(timeout=espera)
+                if registro is None:
+                    terminar = True
+                else:
+                    tanda += REGISTRO.pack(*registro)
+                    if limite is None:
+                        limite = time.monotonic() + self.intervalo
+            except queue.Empty:
+                pass
+
+            if tanda and (terminar or len(tanda) >= self.tamaño_tanda * REGISTRO.size
+                          or time.monotonic() >= limite):
+                self.archivo.write(tanda)
+                self.archivo.flush()
+                self.escritos += len(tanda) // REGISTRO.size
+                tanda = bytearray()
+                limite = None
+        self.archivo.close()
+
+    def cerrar(self):
+        """
+        Escribe lo pendiente y cierra el archivo
+        """
+        if self.hilo is None:
+            return
+        self.cola.put(None)
+        self.hilo.join()
+        self.hilo = None
+
+
+# Clase que lee el registro mapeado en memoria, por bloques, sin cargarlo entero
+class LectorAnalitica:
+    def __init__(self, ruta=None):
+        """
+        Args:
+            ruta: Archivo del registro (por defecto en el directorio de datos del usuario)
+
+        Raises:
+            ImportError si NumPy no esta instalado
+            OSError si no se puede abrir el archivo
+            ValueError si no es un registro de esta version
+        """
+        self.tipo = tipo_numpy()
+        self.ruta = ruta or ruta_por_defecto()
+        self.archivo = open(self.ruta, "rb")
+        try:
+            leer_cabecera(self.archivo)
+        except ValueError:
+            self.archivo.close()
+            raise
+        # Un registro cortado al final no se lee
+        tamaño = os.fstat(self.archivo.fileno()).st_size
+        self.cantidad = (tamaño - CABECERA.size) // REGISTRO.size
+        self.mapa = None
+        if self.cantidad:
+            self.mapa = mmap.mmap(self.archivo.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self):
+        return self.cantidad
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.cerrar()
+
+    def bloques(self, tamaño=TAMAÑO_BLOQUE):
+        """
+        Recorre el registro por bloques; cada bloque es una vista del archivo
+        mapeado (no se copia) y solo se leen del disco las paginas que se tocan
+
+        Returns:
+            Iterador de arrays estructurados con los campos de REGISTRO
+        """
+        import numpy as np
+        for inicio in range(0, self.cantidad, tamaño):
+            cantidad = min(tamaño, self.cantidad - inicio)
+            yield np.frombuffer(self.mapa, dtype=self.tipo, count=cantidad,
+                                offset=CABECERA.size + inicio * REGISTRO.size)
+
+    def errores_por_operacion(self):
+        """
+        Calcula por operacion cuantas preguntas se respondieron mal o vencieron
+
+        Returns:
+            Diccionario nombre de operacion -> preguntas, errores, vencidas,
+            tasa_error (errores y vencidas sobre preguntas) y tiempo medio en ms
+            de las respondidas
+        """
+        import numpy as np
+        operaciones = len(NOMBRES)
+        preguntas = np.zeros(operaciones, dtype=np.int64)
+        errores = np.zeros(operaciones, dtype=np.int64)
+        vencidas = np.zeros(operaciones, dtype=np.int64)
+        respondidas = np.zeros(operaciones, dtype=np.int64)
+        tiempo = np.zeros(operaciones, dtype=np.float64)
+        for bloque in self.bloques():
+            tipo = bloque["tipo"]
+            operacion = bloque["operacion"]
+            es_respuesta = tipo == TIPO_RESPUESTA
+            es_vencida = tipo == TIPO_VENCIDA
+            operacion_respuesta = operacion[es_respuesta]
+            respondidas += np.bincount(operacion_respuesta, minlength=operaciones)
+            errores += np.bincount(operacion[es_respuesta & (bloque["correcta"] == 0)],
+                                   minlength=operaciones)
+            vencidas += np.bincount(operacion[es_vencida], minlength=operaciones)
+            tiempo += np.bincount(operacion_respuesta, weights=bloque["tiempo_ms"][es_respuesta],
+                                  minlength=operaciones)
+        preguntas = respondidas + vencidas
+
+        return {
+            nombre: {
+                "preguntas": int(preguntas[i]),
+                "errores": int(errores[i]),
+                "vencidas": int(vencidas[i]),
+                "tasa_error": round(float(errores[i] + vencidas[i]) / float(preguntas[i]), 4) if preguntas[i] else 0.0,
+                "tiempo_medio_ms": round(float(tiempo[i]) / float(respondidas[i]), 1) if respondidas[i] else 0.0,
+            }
+            for i, nombre in enumerate(NOMBRES)
+        }
+
+    def mejores_puntajes(self, cantidad=10):
+        """
+        Busca los puntajes finales mas altos
+
+        Args:
+            cantidad: Cuantos puntajes retornar
+
+        Returns:
+            Lista de diccionarios (puntos, duracion en segundos, momento como
+            segundos desde 1970, partida), del mayor al menor
+        """
+        import numpy as np
+        mejores = np.empty(0, dtype=self.tipo)
+        for bloque in self.bloques():
+            finales = bloque[bloque["tipo"] == TIPO_FIN]
+            if len(finales) > cantidad:
+                # Quedarse con los mayores sin ordenar todo el bloque
+                finales = finales[np.argpartition(-finales["puntos"], cantidad - 1)[:cantidad]]
+            mejores = np.concatenate([mejores, finales])
+        mejores = mejores[np.argsort(-mejores["puntos"], kind="stable")[:cantidad]]
+        return [
+            {
+                "puntos": int(fila["puntos"]),
+                "duracion": int(fila["tiempo_ms"]) / 1000,
+                "momento": int(fila["momento_ms"]) / 1000,
+                "partida": int(fila["partida"]),
+            }
+            for fila in mejores
+        ]
+
+    def cerrar(self):
+        """
+        Libera el archivo mapeado
+        """
+        if self.mapa is not None:
+            self.mapa.close()
+            self.mapa = None
+        self.archivo.close()
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(
+        description="Resume el registro de analitica: errores por operacion y mejores puntajes")
+    parser.add_argument("archivo", nargs="?", help="registro a leer (por defecto el del usuario)")
+    parser.add_argument("--mejores", type=int, default=10, help="cuantos puntajes mostrar")
+    args = parser.parse_args(argumentos)
+
+    try:
+        lector = LectorAnalitica(args.archivo)
+    except (OSError, ValueError) as error:
+        print(f"no se pudo leer el registro: {error}", file=sys.stderr)
+        return 1
+
+    with lector:
+        inicio = time.perf_counter()
+        errores = lector.errores_por_operacion()
+        mejores = lector.mejores_puntajes(args.mejores)
+        segundos = time.perf_counter() - inicio
+
+    print(f"{len(lector)} registros en {lector.ruta}")
+    for nombre, datos in errores.items():
+        print(f"{nombre:22} preguntas {datos['preguntas']:8}  errores {datos['errores']:7}  "
+              f"vencidas {datos['vencidas']:6}  tasa de error {datos['tasa_error']:6.1%}  "
+              f"tiempo medio {datos['tiempo_medio_ms']:7.1f} ms")
+    print("mejores puntajes:")
+    for posicion, datos in enumerate(mejores, 1):
+        momento = time.strftime("%Y-%m-%d %H:%M", time.localtime(datos["momento"]))
+        print(f"  {posicion:2}. {datos['puntos']:5} puntos  {momento}  ({datos['duracion']:.0f} s)")
+    print(f"leido en {segundos * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,628 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import tracemalloc
+
+# Correr sin ventana real
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from main import JuegoSetZero, FPS
+from temporizador import RelojSimulado
+from logica import TIEMPO_LIMITE
+from texto import motor_texto
+from conjuntos import ConjuntoBits, MASCARA_UNIVERSO
+from grabacion import Grabacion, reproducir
+from generador import GeneradorConjuntos
+from analitica import RegistroAnalitica, LectorAnalitica
+
+# Posiciones de los botones en la ventana de 1080x600
+POS_JUGAR = (540, 330)
+POS_TUTORIAL = (540, 410)
+POS_SALIR = (540, 490)
+POS_VOLVER = (150, 545)
+POS_ANTERIOR = (420, 545)
+POS_SIGUIENTE = (660, 545)
+POS_RESPUESTAS = [(380, 480), (700, 480), (380, 560), (700, 560)]
+POS_VACIA = (10, 300)
+
+# Posiciones por las que pasa el mouse en la guardia de memoria (sobre un boton
+# de respuesta y fuera de todos), y cada cuantos cuadros se mueve
+POS_GUARDIA = [POS_RESPUESTAS[0], POS_VACIA, POS_RESPUESTAS[3], POS_VACIA]
+INTERVALO_MOUSE = 25
+
+# Posiciones por las que pasa el mouse en la guardia de dibujo: fuera de todo,
+# sobre cada boton y donde Volver se superpone con la tercera respuesta
+POS_DIBUJO = [POS_VACIA, *POS_RESPUESTAS, POS_VOLVER, (240, 545), POS_ANTERIOR,
+              POS_SIGUIENTE, POS_JUGAR, POS_TUTORIAL, POS_SALIR, POS_VACIA]
+
+# Lo unico que puede asignar un cuadro de la guardia: la lista de regiones que
+# cambiaron, con lugar para unos pocos rectangulos, y el Rect que retorna cada
+# Surface.blit (pygame lo crea siempre; se libera antes del blit siguiente)
+CUPO_REGIONES = sys.getsizeof([None] * 4) + sys.getsizeof(pygame.Rect(0, 0, 0, 0))
+
+# Metricas que se comparan contra la linea base (mayor es peor)
+METRICAS_COMPARADAS = ["p50_ms", "p95_ms", "p99_ms"]
+
+
+# Clase que simula el mouse durante la prueba
+class MouseSimulado:
+    def __init__(self):
+        """
+        Reemplaza pygame.mouse.get_pos por una posicion controlada por el guion
+        """
+        self.posicion = POS_VACIA
+        self.original = pygame.mouse.get_pos
+
+    def __enter__(self):
+        pygame.mouse.get_pos = self.get_pos
+        return self
+
+    def __exit__(self, *args):
+        pygame.mouse.get_pos = self.original
+
+    def get_pos(self):
+        return self.posicion
+
+    def mover(self, pos):
+        """
+        Mueve el cursor y publica el evento de movimiento
+        """
+        self.posicion = pos
+        pygame.event.post(pygame.event.Event(
+            pygame.MOUSEMOTION, pos=pos, rel=(0, 0), buttons=(0, 0, 0)))
+
+    def click(self, pos):
+        """
+        Mueve el cursor y publica un click izquierdo
+        """
+        self.mover(pos)
+        pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=1))
+
+
+def tecla(key):
+    """
+    Publica una tecla presionada
+    """
+    pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key, mod=0, unicode="", scancode=0))
+
+
+# Cada escenario tiene una preparacion y un guion de eventos por cuadro
+def preparar_menu(juego, mouse):
+    juego.cambiar_estado("menu")
+
+
+def guion_menu_reposo(juego, mouse, cuadro):
+    pass
+
+
+def guion_menu_hover(juego, mouse, cuadro):
+    # Barrido vertical por los tres botones
+    y = 280 + (cuadro * 7) % 260
+    mouse.mover((540, y))
+
+
+def preparar_pregunta(juego, mouse):
+    juego.cambiar_estado("juego")
+    juego.juego.iniciar_juego()
+
+
+def guion_pregunta(juego, mouse, cuadro):
+    pass
+
+
+def guion_feedback(juego, mouse, cuadro):
+    # Responder en cuanto termina el feedback anterior
+    if not juego.juego.partida.mostrando_feedback:
+        mouse.click(POS_RESPUESTAS[cuadro % 4])
+
+
+def preparar_tutorial(juego, mouse):
+    juego.cambiar_estado("tutorial")
+    juego.tutorial.pagina_actual = 0
+
+
+def guion_tutorial(juego, mouse, cuadro):
+    # Cambiar de pagina cada 10 cuadros: avanzar hasta el final y volver
+    if cuadro % 10 == 0:
+        pasos = len(juego.tutorial.conceptos) - 1
+        adelante = (cuadro // 10 // pasos) % 2 == 0
+        mouse.click(POS_SIGUIENTE if adelante else POS_ANTERIOR)
+
+
+ESCENARIOS = {
+    "menu_reposo": (preparar_menu, guion_menu_reposo),
+    "menu_hover": (preparar_menu, guion_menu_hover),
+    "pregunta_activa": (preparar_pregunta, guion_pregunta),
+    "feedback": (preparar_pregunta, guion_feedback),
+    "tutorial_paginas": (preparar_tutorial, guion_tutorial),
+}
+
+
+def percentil(valores_ordenados, p):
+    """
+    Retorna el percentil p (0-100) de una lista ya ordenada
+    """
+    if not valores_ordenados:
+        return 0.0
+    indice = min(len(valores_ordenados) - 1, int(round(p / 100 * (len(valores_ordenados) - 1))))
+    return valores_ordenados[indice]
+
+
+def cuadro(juego, segundos=1 / FPS):
+    """
+    Ejecuta un cuadro del loop principal sin esperar; el reloj simulado de los
+    temporizadores avanza lo que dura un cuadro a FPS
+    """
+    juego.planificador.reloj.avanzar(segundos)
+    juego.manejar_eventos()
+    juego.actualizar()
+    juego.dibujar()
+
+
+def medir_escenario(juego, nombre, cuadros, calentamiento=30):
+    """
+    Mide el tiempo y las asignaciones de memoria por cuadro de un escenario
+
+    Args:
+        juego: Instancia de JuegoSetZero
+        nombre: Nombre del escenario en ESCENARIOS
+        cuadros: Cantidad de cuadros a medir
+        calentamiento: Cuadros que se ejecutan antes de medir
+
+    Returns:
+        Diccionario con percentiles, FPS sin limite y asignaciones por cuadro
+    """
+    preparar, guion = ESCENARIOS[nombre]
+
+    with MouseSimulado() as mouse:
+        preparar(juego, mouse)
+        for i in range(calentamiento):
+            guion(juego, mouse, i)
+            cuadro(juego)
+
+        # Pasada de tiempo, sin tracemalloc para no distorsionar
+        tiempos = []
+        inicio_total = time.perf_counter()
+        for i in range(cuadros):
+            guion(juego, mouse, i)
+            inicio = time.perf_counter()
+            cuadro(juego)
+            tiempos.append((time.perf_counter() - inicio) * 1000)
+        total = time.perf_counter() - inicio_total
+
+        # Pasada de memoria: bytes pico por cuadro y bloques que quedan vivos
+        preparar(juego, mouse)
+        for i in range(calentamiento):
+            guion(juego, mouse, i)
+            cuadro(juego)
+        tracemalloc.start()
+        antes = tracemalloc.take_snapshot()
+        bytes_pico = 0
+        for i in range(cuadros):
+            guion(juego, mouse, i)
+            actual = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            cuadro(juego)
+            bytes_pico += tracemalloc.get_traced_memory()[1] - actual
+        despues = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+
+    filtro = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    diferencias = despues.filter_traces(filtro).compare_to(antes.filter_traces(filtro), "filename")
+    bloques = sum(d.count_diff for d in diferencias if d.count_diff > 0)
+
+    tiempos.sort()
+    return {
+        "cuadros": cuadros,
+        "p50_ms": round(percentil(tiempos, 50), 4),
+        "p95_ms": round(percentil(tiempos, 95), 4),
+        "p99_ms": round(percentil(tiempos, 99), 4),
+        "fps_sin_limite": round(cuadros / total, 1),
+        "bytes_por_cuadro": round(bytes_pico / cuadros, 1),
+        "bloques_netos_por_cuadro": round(bloques / cuadros, 3),
+    }
+
+
+def verificar_asignaciones(juego, cuadros=300, calentamiento=90):
+    """
+    Guardia de memoria: con una pregunta en pantalla, cuadros a FPS con el reloj
+    de la partida avanzando (el reloj se redibuja una vez por segundo) y el mouse
+    moviendose de vez en cuando, ningun cuadro debe asignar memoria de Python
+    salvo la lista de regiones que cambiaron
+
+    Args:
+        juego: Instancia de JuegoSetZero
+        cuadros: Cuadros revisados; tienen que terminar antes de que venza la pregunta
+        calentamiento: Cuadros que se ejecutan antes de revisar; pasan por al menos
+            un cambio de segundo para que los caches ya esten llenos
+
+    Returns:
+        Tupla (lista de (cuadro, bytes) de los cuadros que asignaron mas que el cupo,
+        cantidad de cuadros revisados que redibujaron el reloj)
+
+    Raises:
+        ValueError si los cuadros no entran en el tiempo de una pregunta
+    """
+    if (calentamiento + cuadros) / FPS >= TIEMPO_LIMITE - 1:
+        raise ValueError("demasiados cuadros: la pregunta venceria durante la guardia")
+    partida = juego.juego.partida
+    with MouseSimulado() as mouse:
+        preparar_pregunta(juego, mouse)
+
+        # tracemalloc ve todos los hilos: primero dejar que el productor llene la
+        # cola, y recien despues calentar, para que lo que el productor libero no
+        # cambie las primeras asignaciones del cuadro
+        cola = juego.juego.cola_preguntas.cola
+        limite = time.perf_counter() + 5
+        while not cola.full() and time.perf_counter() < limite:
+            time.sleep(0.01)
+        time.sleep(0.05)
+        # El calentamiento ya corre con tracemalloc, asi tambien se llenan las listas
+        # libres que usa la propia medicion. El mouse se mueve sin publicar eventos
+        # (pygame crea un objeto por cada evento); Juego.dibujar ve la posicion nueva
+        # y revisa los botones
+        tracemalloc.start()
+        for i in range(calentamiento):
+            mouse.posicion = POS_GUARDIA[i // INTERVALO_MOUSE % len(POS_GUARDIA)]
+            cuadro(juego)
+
+        asignaciones = []
+        cuadros_reloj = 0
+        # El cuadro -1 no cuenta: puede pagar la tupla que retorna la propia
+        # medicion si la lista libre de tuplas quedo vacia
+        for i in range(-1, cuadros):
+            mouse.posicion = POS_GUARDIA[(calentamiento + i) // INTERVALO_MOUSE % len(POS_GUARDIA)]
+            segundos = partida.tiempo_restante
+            actual = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            cuadro(juego)
+            pico = tracemalloc.get_traced_memory()[1] - actual
+            if i < 0:
+                continue
+            if partida.tiempo_restante != segundos:
+                cuadros_reloj += 1
+            if pico > CUPO_REGIONES:
+                asignaciones.append((i, pico))
+        tracemalloc.stop()
+    return asignaciones, cuadros_reloj
+
+
+def diferencia_con_dibujo_completo(juego):
+    """
+    Compara la pantalla, tal como la dejo el ultimo cuadro, con la pantalla actual
+    dibujada completa desde el fondo; despues la pantalla queda dibujada completa
+
+    Returns:
+        Tupla (pixeles distintos, rectangulo que los contiene), o None si son iguales
+    """
+    pantalla = juego.pantalla
+    parcial = pantalla.copy()
+    actual = juego.pantalla_actual()
+    actual.redibujo_completo = True
+    actual.dibujar(pantalla)
+
+    iguales = pygame.mask.from_threshold(parcial, (0, 0, 0, 0), (1, 1, 1, 255), pantalla)
+    distintos = pantalla.get_width() * pantalla.get_height() - iguales.count()
+    if not distintos:
+        return None
+    iguales.invert()
+    regiones = iguales.get_bounding_rects()
+    return distintos, regiones[0].unionall(regiones)
+
+
+def verificar_redibujo(juego):
+    """
+    Guardia de dibujo: cada cuadro que solo redibuja lo que cambio tiene que dejar
+    la pantalla igual a dibujarla completa. El mouse pasa por todos los botones
+    (tambien donde se superponen) en el menu, el tutorial y una pregunta, antes
+    de responder y durante el feedback de cada respuesta
+
+    Args:
+        juego: Instancia de JuegoSetZero
+
+    Returns:
+        Lista de (descripcion del cuadro, pixeles distintos, rectangulo que los contiene)
+    """
+    diferencias = []
+
+    def revisar(descripcion):
+        cuadro(juego)
+        diferencia = diferencia_con_dibujo_completo(juego)
+        if diferencia is not None:
+            diferencias.append((descripcion, *diferencia))
+
+    with MouseSimulado() as mouse:
+        for estado in ("menu", "tutorial"):
+            juego.cambiar_estado(estado)
+            cuadro(juego)
+            for pos in POS_DIBUJO:
+                mouse.mover(pos)
+                revisar(f"{estado}, mouse en {pos}")
+
+        preparar_pregunta(juego, mouse)
+        cuadro(juego)
+        for respuesta in range(-1, len(POS_RESPUESTAS)):
+            if respuesta >= 0:
+                # Esperar a que termine el feedback anterior y responder
+                while juego.juego.partida.mostrando_feedback:
+                    cuadro(juego)
+                mouse.click(POS_RESPUESTAS[respuesta])
+                revisar(f"respuesta {respuesta}, click")
+            for pos in POS_DIBUJO:
+                mouse.mover(pos)
+                etapa = "sin responder" if respuesta < 0 else f"feedback de la respuesta {respuesta}"
+                revisar(f"{etapa}, mouse en {pos}")
+    return diferencias
+
+
+def medir_texto(repeticiones=5, tamaños=(24, 28, 36), color=(50, 50, 50)):
+    """
+    Compara los textos de todos los conjuntos hechos con Font.render contra el
+    atlas de glifos, dibujandolos en la ventana y creando superficies nuevas
+    (como hace el hilo de preguntas); necesita una ventana ya creada
+
+    Args:
+        repeticiones: Pasadas por todos los conjuntos
+        tamaños: Tamaños de fuente a medir
+        color: Color del texto
+
+    Returns:
+        Diccionario tamaño -> microsegundos por texto con cada metodo
+    """
+    textos = [ConjuntoBits.desde_mascara(m).texto for m in range(1, MASCARA_UNIVERSO + 1)]
+    destino = pygame.display.get_surface()
+    resultados = {}
+    for tamaño in tamaños:
+        fuente = motor_texto.fuente(tamaño)
+        atlas = motor_texto.atlas(tamaño, color)
+        for texto in textos:
+            atlas.diagramar(texto)
+
+        inicio = time.perf_counter()
+        for _ in range(repeticiones):
+            for texto in textos:
+                superficie = fuente.render(texto, True, color)
+                destino.blit(superficie, superficie.get_rect(center=(540, 300)))
+        render = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        for _ in range(repeticiones):
+            for texto in textos:
+                atlas.dibujar(destino, texto, 540, 300)
+        glifos = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        for _ in range(repeticiones):
+            for texto in textos:
+                fuente.render(texto, True, color)
+        render_superficie = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        for _ in range(repeticiones):
+            for texto in textos:
+                atlas.renderizar(texto)
+        glifos_superficie = time.perf_counter() - inicio
+
+        cantidad = repeticiones * len(textos)
+        resultados[tamaño] = {
+            "font_render_us": round(render / cantidad * 1e6, 2),
+            "atlas_us": round(glifos / cantidad * 1e6, 2),
+            "font_render_superficie_us": round(render_superficie / cantidad * 1e6, 2),
+            "atlas_superficie_us": round(glifos_superficie / cantidad * 1e6, 2),
+        }
+    return resultados
+
+
+def medir_sesion(ruta):
+    """
+    Usa una partida grabada como carga: la reproduce dibujando cada cuadro y
+    mide cuanto tarda cada uno
+
+    Args:
+        ruta: Archivo grabado con main.py --grabar
+
+    Returns:
+        Diccionario con percentiles por cuadro y si la partida coincidio con la grabacion
+    """
+    grabacion = Grabacion.cargar(ruta)
+    juego = JuegoSetZero(dificultad=grabacion.dificultad, reloj=RelojSimulado(),
+                         semilla=grabacion.semilla)
+    with MouseSimulado() as mouse:
+        resultado = reproducir(juego, grabacion, mouse=mouse)
+    juego.cerrar()
+
+    tiempos = sorted(resultado["tiempos_ms"])
+    return {
+        "cuadros": resultado["cuadros"],
+        "p50_ms": round(percentil(tiempos, 50), 4),
+        "p95_ms": round(percentil(tiempos, 95), 4),
+        "p99_ms": round(percentil(tiempos, 99), 4),
+        "max_ms": round(tiempos[-1], 4) if tiempos else 0.0,
+        "coincide": resultado["coincide"],
+        "diferencia": resultado["diferencia"],
+    }
+
+
+def medir_analitica(registros):
+    """
+    Escribe un registro de analitica con muchas respuestas y partidas y lo vuelve a leer
+
+    Args:
+        registros: Cantidad de registros a escribir
+
+    Returns:
+        Diccionario con el costo de anotar un registro en el hilo que llama, cuanto
+        tardo en llegar todo al disco y cuantos registros por segundo lee el lector
+    """
+    rng = random.Random(0)
+    generador = GeneradorConjuntos(random.Random(0))
+    preguntas = [generador.generar_pregunta() for _ in range(1000)]
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        ruta = os.path.join(carpeta, "analitica.bin")
+        registro = RegistroAnalitica(ruta)
+        anotar = 0.0
+        for i in range(registros):
+            pregunta = preguntas[i % len(preguntas)]
+            inicio = time.perf_counter()
+            if i % 40 == 39:
+                registro.fin(i // 40, rng.randrange(400), 120)
+            elif rng.random() < 0.05:
+                registro.vencida(i // 40, pregunta, 15, 0)
+            else:
+                correcta = rng.random() < 0.7
+                registro.respuesta(i // 40, pregunta, 0, correcta, rng.uniform(1, 10), 0)
+            anotar += time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        registro.cerrar()
+        vaciar = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        with LectorAnalitica(ruta) as lector:
+            lector.errores_por_operacion()
+            lector.mejores_puntajes()
+        leer = time.perf_counter() - inicio
+        tamaño = os.path.getsize(ruta)
+
+    return {
+        "registros": registros,
+        "anotar_us": round(anotar / registros * 1e6, 3),
+        "vaciar_ms": round(vaciar * 1000, 1),
+        "leer_ms": round(leer * 1000, 1),
+        "registros_por_segundo": round(registros / leer),
+        "bytes": tamaño,
+    }
+
+
+def comparar(resultados, base, tolerancia, margen_ms):
+    """
+    Compara los resultados contra una linea base
+
+    Args:
+        resultados: Resultados de esta corrida
+        base: Resultados guardados de una corrida anterior
+        tolerancia: Aumento relativo permitido (0.2 = 20%)
+        margen_ms: Aumento absoluto que siempre se permite, para cuadros muy cortos
+
+    Returns:
+        Lista de textos describiendo cada regresion encontrada
+    """
+    regresiones = []
+    for nombre, metricas in resultados["escenarios"].items():
+        anterior = base.get("escenarios", {}).get(nombre)
+        if anterior is None:
+            continue
+        for metrica in METRICAS_COMPARADAS:
+            limite = anterior[metrica] * (1 + tolerancia) + margen_ms
+            if metricas[metrica] > limite:
+                regresiones.append(
+                    f"{nombre}.{metrica}: {metricas[metrica]} > {anterior[metrica]} (+{tolerancia:.0%})")
+    return regresiones
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Mide el costo por cuadro de Set-Zero sin ventana")
+    parser.add_argument("--cuadros", type=int, default=300, help="cuadros medidos por escenario")
+    parser.add_argument("--escenarios", default=",".join(ESCENARIOS),
+                        help="escenarios separados por coma")
+    parser.add_argument("--salida", help="archivo JSON donde guardar los resultados")
+    parser.add_argument("--base", help="JSON de una corrida anterior para comparar")
+    parser.add_argument("--tolerancia", type=float, default=0.2,
+                        help="aumento relativo permitido antes de fallar")
+    parser.add_argument("--margen-ms", type=float, default=0.05,
+                        help="aumento absoluto en ms que no cuenta como regresion")
+    parser.add_argument("--guardia-memoria", action="store_true",
+                        help="fallar si un cuadro estable con una pregunta en pantalla asigna memoria")
+    parser.add_argument("--guardia-dibujo", action="store_true",
+                        help="fallar si un cuadro dibujado en parte no coincide con la pantalla completa")
+    parser.add_argument("--texto", action="store_true",
+                        help="comparar Font.render con el atlas de glifos para los textos de conjuntos")
+    parser.add_argument("--analitica", type=int, metavar="REGISTROS",
+                        help="escribir y leer un registro de analitica de ese tamaño")
+    parser.add_argument("--sesion", metavar="ARCHIVO",
+                        help="medir los cuadros de una partida grabada con main.py --grabar")
+    args = parser.parse_args(argumentos)
+    
+    if args.analitica:
+        metricas = medir_analitica(args.analitica)
+        print(f"analitica {metricas['registros']} registros ({metricas['bytes'] / 1e6:.1f} MB): "
+              f"anotar {metricas['anotar_us']:.3f} us  vaciar al cerrar {metricas['vaciar_ms']:.1f} ms  "
+              f"leer {metricas['leer_ms']:.1f} ms ({metricas['registros_por_segundo'] / 1e6:.1f} M/s)")
+        return 0
+    
+    if args.sesion:
+        metricas = medir_sesion(args.sesion)
+        print(f"sesion {metricas['cuadros']} cuadros  p50 {metricas['p50_ms']:7.3f} ms  "
+              f"p95 {metricas['p95_ms']:7.3f} ms  p99 {metricas['p99_ms']:7.3f} ms  "
+              f"max {metricas['max_ms']:7.3f} ms")
+        if not metricas["coincide"]:
+            print("la reproduccion no coincide con la grabacion:", metricas["diferencia"])
+            return 1
+        return 0
+
+    # Reloj simulado: los temporizadores no dependen de la velocidad de la maquina
+    juego = JuegoSetZero(reloj=RelojSimulado())
+    
+    if args.guardia_memoria:
+        asignaciones, cuadros_reloj = verificar_asignaciones(juego, args.cuadros)
+        juego.cerrar()
+        for i, bytes_asignados in asignaciones[:10]:
+            print(f"ASIGNACION cuadro {i}: {bytes_asignados} B (cupo {CUPO_REGIONES} B)")
+        print(f"guardia de memoria: {len(asignaciones)} de {args.cuadros} cuadros asignaron "
+              f"memoria ({cuadros_reloj} redibujaron el reloj)")
+        if not cuadros_reloj:
+            print("la guardia no paso por ningun cambio de segundo")
+            return 1
+        return 1 if asignaciones else 0
+    
+    if args.guardia_dibujo:
+        diferencias = verificar_redibujo(juego)
+        juego.cerrar()
+        for descripcion, pixeles, rect in diferencias[:10]:
+            print(f"DIBUJO {descripcion}: {pixeles} pixeles distintos en {rect}")
+        print(f"guardia de dibujo: {len(diferencias)} cuadros no coinciden con la pantalla completa")
+        return 1 if diferencias else 0
+    
+    if args.texto:
+        for tamaño, tiempos in medir_texto().items():
+            print(f"tamaño {tamaño}: dibujar font.render {tiempos['font_render_us']:6.2f} us  "
+                  f"atlas {tiempos['atlas_us']:6.2f} us  |  superficie nueva font.render "
+                  f"{tiempos['font_render_superficie_us']:6.2f} us  atlas {tiempos['atlas_superficie_us']:6.2f} us")
+        juego.cerrar()
+        return 0
+    resultados = {"cuadros": args.cuadros, "escenarios": {}}
+
+    for nombre in args.escenarios.split(","):
+        metricas = medir_escenario(juego, nombre, args.cuadros)
+        resultados["escenarios"][nombre] = metricas
+        print(f"{nombre:18} p50 {metricas['p50_ms']:7.3f} ms  p95 {metricas['p95_ms']:7.3f} ms  "
+              f"p99 {metricas['p99_ms']:7.3f} ms  {metricas['fps_sin_limite']:8.1f} fps  "
+              f"{metricas['bytes_por_cuadro']:9.1f} B/cuadro  "
+              f"{metricas['bloques_netos_por_cuadro']:6.3f} bloques/cuadro")
+
+    juego.cerrar()
+
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            json.dump(resultados, archivo, indent=2)
+
+    if args.base:
+        with open(args.base, encoding="utf-8") as archivo:
+            base = json.load(archivo)
+        regresiones = comparar(resultados, base, args.tolerancia, args.margen_ms)
+        for regresion in regresiones:
+            print("REGRESION", regresion)
+        if regresiones:
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
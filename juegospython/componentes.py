@@ -1,5 +1,11 @@
 import pygame
-import random
+from texto import motor_texto
+# GeneradorConjuntos no usa pygame; se importa desde aca por compatibilidad
+from generador import GeneradorConjuntos
+
+# Colores de feedback de los botones de respuesta
+COLOR_CORRECTO = (0, 200, 0)
+COLOR_INCORRECTO = (200, 0, 0)
 
 # Clase para crear botones interactivos
 class Boton:
@@ -16,33 +22,176 @@ class Boton:
             color_texto: Color del texto
         """
         self.rect = pygame.Rect(x, y, ancho, alto)
-        self.texto = texto
-        self.color = color
-        self.color_hover = color_hover
+        self._texto = texto
+        self._color = color
+        self._color_hover = color_hover
         self.color_texto = color_texto
-        self.fuente = pygame.font.Font(None, 36)
-        
-    def dibujar(self, pantalla):
+        self.tamaño_fuente = 36
+
+        # Estado de feedback: None, True (correcta) o False (incorrecta)
+        self.feedback = None
+
+        # Superficies ya dibujadas para cada estado del boton
+        self.superficies = {}
+
+        # Ultima superficie puesta en pantalla, para saber si hay que redibujar
+        self.superficie_dibujada = None
+
+    @property
+    def texto(self):
+        return self._texto
+
+    @texto.setter
+    def texto(self, valor):
+        if valor != self._texto:
+            self._texto = valor
+            self.superficies.clear()
+
+    @property
+    def color(self):
+        return self._color
+
+    @color.setter
+    def color(self, valor):
+        if valor != self._color:
+            self._color = valor
+            self.superficies.clear()
+
+    @property
+    def color_hover(self):
+        return self._color_hover
+
+    @color_hover.setter
+    def color_hover(self, valor):
+        if valor != self._color_hover:
+            self._color_hover = valor
+            self.superficies.clear()
+
+    def estado(self, mouse_pos):
         """
-        Dibuja el boton en la pantalla
-        Cambia de color si el mouse esta encima
+        Determina el estado visual del boton
+
+        Args:
+            mouse_pos: Posicion del mouse en este cuadro
+
+        Returns:
+            'correcto', 'incorrecto', 'hover' o 'normal'
         """
-        mouse_pos = pygame.mouse.get_pos()
-        
-        # Determinar color segun posicion del mouse
+        if self.feedback is not None:
+            return "correcto" if self.feedback else "incorrecto"
         if self.rect.collidepoint(mouse_pos):
-            color_actual = self.color_hover
+            return "hover"
+        return "normal"
+
+    def superficie(self, estado):
+        """
+        Retorna la superficie de un estado, dibujandola solo la primera vez
+
+        Args:
+            estado: Estado visual del boton
+
+        Returns:
+            Surface del tamaño del boton
+        """
+        superficie = self.superficies.get(estado)
+        if superficie is not None:
+            return superficie
+
+        texto_surface = motor_texto.renderizar(self._texto, self.tamaño_fuente, self.color_texto)
+        superficie = self.componer(estado, texto_surface)
+        if pygame.display.get_surface() is not None:
+            superficie = superficie.convert_alpha()
+
+        self.superficies[estado] = superficie
+        return superficie
+
+    def componer(self, estado, texto_surface):
+        """
+        Dibuja el fondo de un estado con el texto centrado encima
+        No usa caches compartidos, asi que se puede llamar desde otro hilo
+
+        Args:
+            estado: Estado visual del boton
+            texto_surface: Texto ya renderizado
+
+        Returns:
+            Surface nueva del tamaño del boton
+        """
+        if estado == "correcto":
+            color_fondo = COLOR_CORRECTO
+        elif estado == "incorrecto":
+            color_fondo = COLOR_INCORRECTO
+        elif estado == "hover":
+            color_fondo = self._color_hover
         else:
-            color_actual = self.color
-            
+            color_fondo = self._color
+
+        superficie = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+
         # Dibujar rectangulo del boton
-        pygame.draw.rect(pantalla, color_actual, self.rect, border_radius=12)
-        
+        pygame.draw.rect(superficie, color_fondo, superficie.get_rect(), border_radius=12)
+
         # Dibujar texto centrado
-        texto_surface = self.fuente.render(self.texto, True, self.color_texto)
-        texto_rect = texto_surface.get_rect(center=self.rect.center)
-        pantalla.blit(texto_surface, texto_rect)
-        
+        texto_rect = texto_surface.get_rect(center=superficie.get_rect().center)
+        superficie.blit(texto_surface, texto_rect)
+        return superficie
+
+    def preparar(self, texto, atlas):
+        """
+        Dibuja por adelantado los estados normal y hover para otro texto
+
+        Args:
+            texto: Texto que mostrara el boton
+            atlas: AtlasGlifos del tamaño y color del texto del boton; si ya tiene
+                todos los caracteres del texto se puede usar desde otro hilo
+
+        Returns:
+            Diccionario estado -> Surface para pasar a asignar
+        """
+        texto_surface = atlas.renderizar(texto)
+        return {
+            "normal": self.componer("normal", texto_surface),
+            "hover": self.componer("hover", texto_surface)
+        }
+
+    def asignar(self, texto, superficies):
+        """
+        Cambia el texto usando superficies ya preparadas
+
+        Args:
+            texto: Nuevo texto del boton
+            superficies: Resultado de preparar con ese mismo texto
+        """
+        self._texto = texto
+        self.superficies = dict(superficies)
+
+    def dibujar(self, pantalla, mouse_pos=None):
+        """
+        Dibuja el boton en la pantalla
+        Cambia de color si el mouse esta encima
+
+        Args:
+            pantalla: Surface de pygame
+            mouse_pos: Posicion del mouse en este cuadro (se consulta si es None)
+        """
+        if mouse_pos is None:
+            mouse_pos = pygame.mouse.get_pos()
+
+        self.superficie_dibujada = self.superficie(self.estado(mouse_pos))
+        pantalla.blit(self.superficie_dibujada, self.rect)
+
+    def cambio(self, mouse_pos):
+        """
+        Verifica si el boton se ve distinto a la ultima vez que se dibujo
+
+        Args:
+            mouse_pos: Posicion del mouse en este cuadro
+
+        Returns:
+            True si hay que redibujar el boton
+        """
+        return self.superficie(self.estado(mouse_pos)) is not self.superficie_dibujada
+
     def click(self, evento):
         """
         Verifica si el boton fue clickeado
@@ -55,115 +204,86 @@ class Boton:
                 return True
         return False
 
-# Clase para manejar la logica de conjuntos
-class GeneradorConjuntos:
+# Clase para guardar las capas estaticas de fondo de una pantalla
+class CapasEstaticas:
     def __init__(self):
         """
-        Inicializa el generador de conjuntos y preguntas
+        Inicializa el cache de capas vacio
         """
-        self.operaciones = [
-            {"simbolo": "U", "nombre": "union"},
-            {"simbolo": "n", "nombre": "interseccion"},
-            {"simbolo": "-", "nombre": "diferencia"},
-            {"simbolo": "Δ", "nombre": "diferencia_simetrica"}
-        ]
+        self.capas = {}
+        self.tamaño = None
         
-    def generar_conjunto(self, min_elementos=3, max_elementos=6):
+    def obtener(self, pantalla, clave, construir):
         """
-        Genera un conjunto aleatorio de numeros
+        Retorna la capa de fondo para una clave, construyendola solo la primera vez
         
         Args:
-            min_elementos: Minimo numero de elementos
-            max_elementos: Maximo numero de elementos
+            pantalla: Surface donde se va a mostrar la capa
+            clave: Identifica el contenido de la capa (por ejemplo la pagina)
+            construir: Funcion que dibuja el contenido estatico sobre la capa
             
         Returns:
-            Set con numeros aleatorios
+            Surface del tamaño de la pantalla en el formato del display
         """
-        cantidad = random.randint(min_elementos, max_elementos)
-        return set(random.sample(range(1, 11), cantidad))
-    
-    def union(self, conjunto_a, conjunto_b):
-        """Retorna la union de dos conjuntos"""
-        return conjunto_a | conjunto_b
-    
-    def interseccion(self, conjunto_a, conjunto_b):
-        """Retorna la interseccion de dos conjuntos"""
-        return conjunto_a & conjunto_b
-    
-    def diferencia(self, conjunto_a, conjunto_b):
-        """Retorna la diferencia A - B"""
-        return conjunto_a - conjunto_b
-    
-    def diferencia_simetrica(self, conjunto_a, conjunto_b):
-        """Retorna la diferencia simetrica de dos conjuntos"""
-        return conjunto_a ^ conjunto_b
-    
-    def calcular_operacion(self, conjunto_a, conjunto_b, operacion):
-        """
-        Calcula el resultado de una operacion entre dos conjuntos
+        # Si cambio el tamaño de la ventana ninguna capa sirve
+        tamaño = pantalla.get_size()
+        if tamaño != self.tamaño:
+            self.capas.clear()
+            self.tamaño = tamaño
         
-        Args:
-            conjunto_a: Primer conjunto
-            conjunto_b: Segundo conjunto
-            operacion: Nombre de la operacion a realizar
-            
-        Returns:
-            Resultado de la operacion
-        """
-        if operacion == "union":
-            return self.union(conjunto_a, conjunto_b)
-        elif operacion == "interseccion":
-            return self.interseccion(conjunto_a, conjunto_b)
-        elif operacion == "diferencia":
-            return self.diferencia(conjunto_a, conjunto_b)
-        elif operacion == "diferencia_simetrica":
-            return self.diferencia_simetrica(conjunto_a, conjunto_b)
-        return set()
+        capa = self.capas.get(clave)
+        if capa is None:
+            capa = pygame.Surface(tamaño)
+            if pygame.display.get_surface() is not None:
+                capa = capa.convert()
+            construir(capa)
+            self.capas[clave] = capa
+        return capa
     
-    def generar_pregunta(self):
+    def limpiar(self):
         """
-        Genera una pregunta completa con conjuntos y operacion
-        
-        Returns:
-            Diccionario con la pregunta, conjuntos, operacion y respuesta correcta
+        Descarta todas las capas para que se vuelvan a construir
         """
-        # Generar dos conjuntos aleatorios
-        conjunto_a = self.generar_conjunto()
-        conjunto_b = self.generar_conjunto()
-        
-        # Seleccionar operacion aleatoria
-        operacion_info = random.choice(self.operaciones)
-        operacion = operacion_info["nombre"]
-        simbolo = operacion_info["simbolo"]
-        
-        # Calcular respuesta correcta
-        respuesta_correcta = self.calcular_operacion(conjunto_a, conjunto_b, operacion)
-        
-        # Generar opciones incorrectas
-        opciones = [respuesta_correcta]
-        
-        # Agregar 3 opciones incorrectas
-        while len(opciones) < 4:
-            # Generar conjunto aleatorio diferente
-            opcion_falsa = self.generar_conjunto(min_elementos=2, max_elementos=7)
-            
-            # Asegurar que no sea igual a la correcta ni a otras opciones
-            if opcion_falsa not in opciones and len(opcion_falsa) > 0:
-                opciones.append(opcion_falsa)
-        
-        # Mezclar opciones
-        random.shuffle(opciones)
-        
-        return {
-            "conjunto_a": conjunto_a,
-            "conjunto_b": conjunto_b,
-            "operacion": operacion,
-            "simbolo": simbolo,
-            "respuesta_correcta": respuesta_correcta,
-            "opciones": opciones
-        }
+        self.capas.clear()
 
 # Funciones auxiliares para dibujar elementos
+def redibujar_botones(pantalla, botones, mouse_pos, fondo, rects):
+    """
+    Redibuja solo los botones que cambiaron desde el ultimo cuadro, y los que se
+    les superponen: al borrar un boton con el fondo tambien se borra la parte de
+    los botones que lo tocan
+    
+    Args:
+        pantalla: Surface de pygame
+        botones: Botones visibles de la pantalla, en el orden en que se dibujan
+        mouse_pos: Posicion del mouse en este cuadro
+        fondo: Capa estatica con la que se borra el area del boton
+        rects: Lista donde se agregan las regiones modificadas
+    """
+    cantidad = len(rects)
+    for boton in botones:
+        if boton.cambio(mouse_pos):
+            rects.append(boton.rect)
+    if len(rects) == cantidad:
+        return
+    
+    # Agregar los botones que tocan una region a redibujar hasta que no aparezca
+    # ninguno nuevo; la lista de regiones hace de conjunto y no se asigna otra
+    while cantidad != len(rects):
+        cantidad = len(rects)
+        for boton in botones:
+            if boton.rect not in rects and boton.rect.collidelist(rects) != -1:
+                rects.append(boton.rect)
+    
+    # Primero se borran todos y despues se dibujan en orden, como en el dibujo
+    # completo: asi el que va despues queda encima
+    for boton in botones:
+        if boton.rect in rects:
+            pantalla.blit(fondo, boton.rect, boton.rect)
+    for boton in botones:
+        if boton.rect in rects:
+            boton.dibujar(pantalla, mouse_pos)
+
 def dibujar_texto(pantalla, texto, x, y, tamaño, color, centrado=True):
     """
     Dibuja texto en la pantalla
@@ -176,8 +296,7 @@ def dibujar_texto(pantalla, texto, x, y, tamaño, color, centrado=True):
         color: Color del texto
         centrado: Si True, centra el texto en x, y
     """
-    fuente = pygame.font.Font(None, tamaño)
-    superficie_texto = fuente.render(texto, True, color)
+    superficie_texto = motor_texto.renderizar(texto, tamaño, color)
     
     if centrado:
         rect = superficie_texto.get_rect(center=(x, y))
@@ -192,7 +311,7 @@ def dibujar_conjunto(pantalla, conjunto, x, y, ancho, alto, etiqueta, color_bord
     
     Args:
         pantalla: Surface de pygame
-        conjunto: Set de elementos a mostrar
+        conjunto: ConjuntoBits a mostrar
         x, y: Posicion de la caja
         ancho, alto: Dimensiones de la caja
         etiqueta: Nombre del conjunto (A, B, etc)
@@ -207,16 +326,139 @@ def dibujar_conjunto(pantalla, conjunto, x, y, ancho, alto, etiqueta, color_bord
     # Dibujar etiqueta del conjunto
     dibujar_texto(pantalla, f"Conjunto {etiqueta}", x + ancho // 2, y + 25, 32, color_borde)
     
-    # Convertir conjunto a lista ordenada para mostrar
-    elementos = sorted(list(conjunto))
-    texto_elementos = "{" + ", ".join(map(str, elementos)) + "}"
+    # Dibujar elementos con el texto ya formateado del conjunto, glifo por glifo
+    motor_texto.atlas(28, (50, 50, 50)).dibujar(pantalla, conjunto.texto, x + ancho // 2, y + 60)
+
+# Clase para dibujar diagramas de Venn de dos conjuntos
+class DiagramaVenn:
+    # Circulos translucidos ya dibujados, por (radio, color_a, color_b)
+    geometrias = {}
     
-    # Dibujar elementos
-    dibujar_texto(pantalla, texto_elementos, x + ancho // 2, y + 60, 28, (50, 50, 50))
+    def __init__(self, radio=80, separacion=100, color_a=(102, 126, 234),
+                 color_b=(118, 75, 162), color_fondo=(248, 249, 250)):
+        """
+        Inicializa el diagrama con su geometria y colores
+        
+        Args:
+            radio: Radio de cada circulo
+            separacion: Distancia entre los centros de los circulos
+            color_a: Color del conjunto A
+            color_b: Color del conjunto B
+            color_fondo: Color del area donde se dibuja el diagrama
+        """
+        self.radio = radio
+        self.separacion = separacion
+        self.color_a = color_a
+        self.color_b = color_b
+        self.color_fondo = color_fondo
+        
+        # Ultima distribucion dibujada y los conjuntos que la generaron
+        self.clave = None
+        self.superficie = None
+        
+    def circulo(self, color):
+        """
+        Retorna la superficie translucida de un circulo, creandola solo una vez
+        
+        Args:
+            color: Color del circulo
+            
+        Returns:
+            Surface con transparencia del tamaño del circulo
+        """
+        clave = (self.radio, color)
+        superficie = DiagramaVenn.geometrias.get(clave)
+        if superficie is None:
+            superficie = pygame.Surface((self.radio * 2, self.radio * 2), pygame.SRCALPHA)
+            pygame.draw.circle(superficie, (*color, 100), (self.radio, self.radio), self.radio)
+            DiagramaVenn.geometrias[clave] = superficie
+        return superficie
+    
+    def colocar_region(self, superficie, elementos, centro_x, centro_y, columnas):
+        """
+        Escribe los elementos de una region en una grilla centrada
+        
+        Args:
+            superficie: Surface del diagrama
+            elementos: Lista ordenada de elementos de la region
+            centro_x, centro_y: Centro de la region
+            columnas: Cantidad de columnas de la grilla
+        """
+        filas = (len(elementos) + columnas - 1) // columnas
+        alto_fila = 22
+        ancho_columna = 26
+        inicio_y = centro_y - (filas - 1) * alto_fila // 2
+        atlas = motor_texto.atlas(24, (50, 50, 50))
+        
+        for i, elemento in enumerate(elementos):
+            fila, columna = divmod(i, columnas)
+            en_fila = min(columnas, len(elementos) - fila * columnas)
+            x = centro_x + (columna * 2 - (en_fila - 1)) * ancho_columna // 2
+            atlas.dibujar(superficie, str(elemento), x, inicio_y + fila * alto_fila)
+    
+    def preparar(self, conjunto_a, conjunto_b):
+        """
+        Dibuja el diagrama completo de una pregunta sobre una superficie
+        
+        Args:
+            conjunto_a: Primer conjunto
+            conjunto_b: Segundo conjunto
+            
+        Returns:
+            Surface con los circulos, etiquetas y elementos de cada region
+        """
+        clave = (conjunto_a, conjunto_b)
+        if clave == self.clave:
+            return self.superficie
+        
+        radio = self.radio
+        ancho = radio * 2 + self.separacion
+        superficie = pygame.Surface((ancho, radio * 2))
+        if pygame.display.get_surface() is not None:
+            superficie = superficie.convert()
+        superficie.fill(self.color_fondo)
+        
+        # Circulos: A a la izquierda y B a la derecha
+        centro_a = radio
+        centro_b = radio + self.separacion
+        superficie.blit(self.circulo(self.color_a), (0, 0))
+        superficie.blit(self.circulo(self.color_b), (self.separacion, 0))
+        
+        # Etiquetas A y B en la parte superior de cada circulo
+        dibujar_texto(superficie, "A", centro_a - radio // 2, radio // 3, 36, self.color_a)
+        dibujar_texto(superficie, "B", centro_b + radio // 2, radio // 3, 36, self.color_b)
+        
+        # Repartir los elementos en las tres regiones
+        solo_a = (conjunto_a - conjunto_b).elementos
+        ambos = (conjunto_a & conjunto_b).elementos
+        solo_b = (conjunto_b - conjunto_a).elementos
+        
+        centro_y = radio + radio // 6
+        borde_a = centro_b - radio
+        borde_b = centro_a + radio
+        self.colocar_region(superficie, solo_a, (centro_a - radio + borde_a) // 2, centro_y, 2)
+        self.colocar_region(superficie, ambos, (borde_a + borde_b) // 2, centro_y,
+                            1 if len(ambos) <= 4 else 2)
+        self.colocar_region(superficie, solo_b, (borde_b + centro_b + radio) // 2, centro_y, 2)
+        
+        self.clave = clave
+        self.superficie = superficie
+        return superficie
+    
+    def dibujar(self, pantalla, x, y, conjunto_a, conjunto_b):
+        """
+        Dibuja el diagrama centrado en x, y
+        """
+        superficie = self.preparar(conjunto_a, conjunto_b)
+        pantalla.blit(superficie, superficie.get_rect(center=(x, y)))
+
+# Diagrama compartido por dibujar_diagrama_venn
+diagrama_venn = DiagramaVenn()
 
 def dibujar_diagrama_venn(pantalla, x, y, conjunto_a, conjunto_b):
     """
-    Dibuja un diagrama de Venn simple mostrando dos conjuntos
+    Dibuja un diagrama de Venn mostrando los elementos de dos conjuntos
+    La distribucion se dibuja una sola vez por cada par de conjuntos
     
     Args:
         pantalla: Surface de pygame
@@ -224,23 +466,4 @@ def dibujar_diagrama_venn(pantalla, x, y, conjunto_a, conjunto_b):
         conjunto_a: Primer conjunto
         conjunto_b: Segundo conjunto
     """
-    # Colores con transparencia
-    color_a = (102, 126, 234)
-    color_b = (118, 75, 162)
-    
-    # Crear surfaces con transparencia
-    radio = 80
-    superficie_a = pygame.Surface((radio * 2, radio * 2), pygame.SRCALPHA)
-    superficie_b = pygame.Surface((radio * 2, radio * 2), pygame.SRCALPHA)
-    
-    # Dibujar circulos con transparencia
-    pygame.draw.circle(superficie_a, (*color_a, 100), (radio, radio), radio)
-    pygame.draw.circle(superficie_b, (*color_b, 100), (radio, radio), radio)
-    
-    # Posicionar circulos
-    pantalla.blit(superficie_a, (x - 50, y - radio))
-    pantalla.blit(superficie_b, (x + 50 - radio * 2, y - radio))
-    
-    # Etiquetas A y B
-    dibujar_texto(pantalla, "A", x - 70, y, 36, color_a)
-    dibujar_texto(pantalla, "B", x + 70, y, 36, color_b)
\ No newline at end of file
+    diagrama_venn.dibujar(pantalla, x, y, conjunto_a, conjunto_b)
@@ -0,0 +1,102 @@
+# Universo de los conjuntos del juego: numeros del 1 al 10
+UNIVERSO = range(1, 11)
+MASCARA_UNIVERSO = (1 << len(UNIVERSO)) - 1
+
+# Clase para representar un subconjunto del universo como una mascara de bits
+class ConjuntoBits:
+    __slots__ = ("mascara", "elementos", "texto", "cantidad")
+
+    # Una instancia por mascara; se llena al final del modulo
+    instancias = []
+
+    def __new__(cls, elementos=()):
+        """
+        Retorna el conjunto con los elementos dados
+
+        Args:
+            elementos: Numeros del universo (1 a 10)
+
+        Returns:
+            La instancia compartida para esa combinacion de elementos
+
+        Raises:
+            ValueError si algun elemento no pertenece al universo
+        """
+        mascara = 0
+        for elemento in elementos:
+            if elemento not in UNIVERSO:
+                raise ValueError(f"elemento fuera del universo: {elemento!r}")
+            mascara |= 1 << (elemento - 1)
+        return cls.instancias[mascara]
+
+    @classmethod
+    def desde_mascara(cls, mascara):
+        """
+        Retorna el conjunto representado por una mascara de bits
+
+        Args:
+            mascara: Entero donde el bit i indica si el elemento i + 1 esta presente
+        """
+        return cls.instancias[mascara]
+
+    @classmethod
+    def _crear(cls, mascara):
+        """
+        Construye la instancia de una mascara con sus datos ya calculados
+        """
+        conjunto = object.__new__(cls)
+        elementos = tuple(e for i, e in enumerate(UNIVERSO) if mascara >> i & 1)
+        conjunto.mascara = mascara
+        conjunto.elementos = elementos
+        conjunto.texto = "{" + ", ".join(map(str, elementos)) + "}"
+        conjunto.cantidad = len(elementos)
+        return conjunto
+
+    def __or__(self, otro):
+        return ConjuntoBits.instancias[self.mascara | otro.mascara]
+
+    def __and__(self, otro):
+        return ConjuntoBits.instancias[self.mascara & otro.mascara]
+
+    def __sub__(self, otro):
+        return ConjuntoBits.instancias[self.mascara & ~otro.mascara]
+
+    def __xor__(self, otro):
+        return ConjuntoBits.instancias[self.mascara ^ otro.mascara]
+
+    def complemento(self):
+        """Retorna el complemento respecto al universo"""
+        return ConjuntoBits.instancias[MASCARA_UNIVERSO & ~self.mascara]
+
+    def __eq__(self, otro):
+        if isinstance(otro, ConjuntoBits):
+            return self.mascara == otro.mascara
+        return NotImplemented
+
+    def __hash__(self):
+        return self.mascara
+
+    def __len__(self):
+        return self.cantidad
+
+    def __bool__(self):
+        return self.mascara != 0
+
+    def __iter__(self):
+        return iter(self.elementos)
+
+    def __contains__(self, elemento):
+        return 1 <= elemento <= len(UNIVERSO) and bool(self.mascara >> (elemento - 1) & 1)
+
+    def __repr__(self):
+        return f"ConjuntoBits({self.texto})"
+
+    def __str__(self):
+        return self.texto
+
+    def __reduce__(self):
+        return (ConjuntoBits.desde_mascara, (self.mascara,))
+
+
+ConjuntoBits.instancias = [ConjuntoBits._crear(m) for m in range(MASCARA_UNIVERSO + 1)]
+VACIO = ConjuntoBits.instancias[0]
@@ -0,0 +1,137 @@
+import pygame
+
+# Unicos eventos que el juego procesa; el resto ni siquiera entra a la cola
+EVENTOS_USADOS = [
+    pygame.QUIT,
+    pygame.KEYDOWN,
+    pygame.MOUSEBUTTONDOWN,
+    pygame.MOUSEMOTION,
+    pygame.VIDEOEXPOSE,
+    pygame.WINDOWEXPOSED,
+    pygame.WINDOWRESTORED,
+]
+
+# Lado de cada celda de la grilla de botones, en pixeles
+TAMAÑO_CELDA = 64
+
+
+def configurar_eventos():
+    """
+    Restringe la cola de pygame a EVENTOS_USADOS
+    Se llama despues de crear la ventana
+    """
+    pygame.event.set_blocked(None)
+    pygame.event.set_allowed(EVENTOS_USADOS)
+
+
+def leer_eventos(previos=()):
+    """
+    Retorna los eventos pendientes, con todos los MOUSEMOTION del cuadro
+    reducidos al ultimo (la posicion del mouse es lo unico que importa)
+
+    Args:
+        previos: Eventos ya sacados de la cola (por ejemplo con pygame.event.wait)
+
+    Returns:
+        Lista de eventos en el orden en que llegaron
+    """
+    eventos = pygame.event.get()
+    if previos:
+        eventos = list(previos) + eventos
+    if not eventos:
+        return eventos
+
+    ultimo_movimiento = None
+    for i, evento in enumerate(eventos):
+        if evento.type == pygame.MOUSEMOTION:
+            ultimo_movimiento = i
+    if ultimo_movimiento is None:
+        return eventos
+
+    # Un bucle y no una comprension: la comprension usaria ultimo_movimiento como
+    # celda de clausura, que se crea en cada llamada aunque la cola este vacia
+    coalescidos = []
+    for i, evento in enumerate(eventos):
+        if evento.type != pygame.MOUSEMOTION or i == ultimo_movimiento:
+            coalescidos.append(evento)
+    return coalescidos
+
+
+# Clase que asocia botones y teclas de una pantalla con sus funciones
+class MapaEntrada:
+    def __init__(self, tamaño_celda=TAMAÑO_CELDA):
+        """
+        Inicializa el mapa vacio
+
+        Args:
+            tamaño_celda: Lado de las celdas de la grilla que indexa los botones
+        """
+        self.tamaño_celda = tamaño_celda
+        # (columna, fila) -> lista de (boton, funcion) cuyo rect toca esa celda
+        self.celdas = {}
+        # tecla -> funcion
+        self.teclas = {}
+
+    def boton(self, boton, funcion):
+        """
+        Registra la funcion que se llama al hacer click en el boton
+        El rect del boton no debe cambiar despues de registrarlo
+
+        Args:
+            boton: Boton
+            funcion: Funcion sin argumentos
+        """
+        rect = boton.rect
+        for columna in range(rect.left // self.tamaño_celda, (rect.right - 1) // self.tamaño_celda + 1):
+            for fila in range(rect.top // self.tamaño_celda, (rect.bottom - 1) // self.tamaño_celda + 1):
+                self.celdas.setdefault((columna, fila), []).append((boton, funcion))
+
+    def tecla(self, tecla, funcion):
+        """
+        Registra la funcion que se llama al presionar una tecla
+
+        Args:
+            tecla: Constante de pygame (pygame.K_SPACE, ...)
+            funcion: Funcion sin argumentos
+        """
+        self.teclas[tecla] = funcion
+
+    def buscar(self, pos):
+        """
+        Retorna el boton registrado en una posicion
+
+        Returns:
+            Tupla (boton, funcion) o None
+        """
+        candidatos = self.celdas.get((pos[0] // self.tamaño_celda, pos[1] // self.tamaño_celda))
+        if candidatos:
+            for boton, funcion in candidatos:
+                if boton.rect.collidepoint(pos):
+                    return boton, funcion
+        return None
+
+    def click(self, pos):
+        """
+        Llama a la funcion del boton que esta en pos, si hay uno
+
+        Returns:
+            True si se hizo click en un boton
+        """
+        encontrado = self.buscar(pos)
+        if encontrado is None:
+            return False
+        encontrado[1]()
+        return True
+
+    def presionar(self, tecla):
+        """
+        Llama a la funcion de la tecla, si tiene una
+
+        Returns:
+            True si la tecla estaba registrada
+        """
+        funcion = self.teclas.get(tecla)
+        if funcion is None:
+            return False
+        funcion()
+        return True
@@ -0,0 +1,359 @@
+import random
+import keyword
+from functools import lru_cache
+from conjuntos import ConjuntoBits, MASCARA_UNIVERSO
+
+# Operadores binarios: simbolo del juego -> (precedencia, operador de Python sobre mascaras)
+# Al leer, la interseccion se agrupa antes que union, diferencia y diferencia simetrica;
+# al escribir no se cuenta con eso (ver formatear)
+OPERADORES = {
+    "U": (1, "|"),
+    "n": (2, "&"),
+    "-": (1, "& ~"),
+    "Δ": (1, "^"),
+}
+
+# Simbolos alternativos que tambien acepta el parser
+SINONIMOS = {"∪": "U", "∩": "n", "\\": "-", "^": "Δ"}
+
+
+# Nodos del arbol de una expresion
+class Expresion:
+    __slots__ = ("clave", "hash", "nombres")
+
+    def __eq__(self, otra):
+        return isinstance(otra, Expresion) and self.clave == otra.clave
+
+    def __hash__(self):
+        return self.hash
+
+    def __repr__(self):
+        return f"Expresion({formatear(self)})"
+
+    def __str__(self):
+        return formatear(self)
+
+
+class Variable(Expresion):
+    __slots__ = ("nombre",)
+
+    def __init__(self, nombre):
+        """
+        Args:
+            nombre: Nombre del conjunto, como 'A'
+
+        Raises:
+            ValueError si el nombre no es un identificador de Python
+        """
+        if not isinstance(nombre, str) or not nombre.isidentifier() or keyword.iskeyword(nombre):
+            raise ValueError(f"nombre de variable invalido: {nombre!r}")
+        self.nombre = nombre
+        self.clave = ("var", nombre)
+        self.nombres = (nombre,)
+        self.hash = hash(self.clave)
+
+
+class Universo(Expresion):
+    __slots__ = ()
+
+    def __init__(self):
+        self.clave = ("U",)
+        self.nombres = ()
+        self.hash = hash(self.clave)
+
+
+class Complemento(Expresion):
+    __slots__ = ("hijo",)
+
+    def __init__(self, hijo):
+        self.hijo = hijo
+        self.clave = ("'", hijo.clave)
+        self.nombres = hijo.nombres
+        self.hash = hash(self.clave)
+
+
+class Binaria(Expresion):
+    __slots__ = ("operador", "izquierda", "derecha")
+
+    def __init__(self, operador, izquierda, derecha):
+        self.operador = operador
+        self.izquierda = izquierda
+        self.derecha = derecha
+        self.clave = (operador, izquierda.clave, derecha.clave)
+        self.nombres = tuple(sorted(set(izquierda.nombres + derecha.nombres)))
+        self.hash = hash(self.clave)
+
+
+# Parser
+def separar(texto):
+    """
+    Divide el texto en simbolos, ignorando espacios
+
+    Raises:
+        ValueError si hay un caracter que no pertenece al lenguaje
+    """
+    simbolos = []
+    for caracter in texto:
+        if caracter.isspace():
+            continue
+        caracter = SINONIMOS.get(caracter, caracter)
+        if caracter in OPERADORES or caracter in "()'" or caracter.isalpha():
+            simbolos.append(caracter)
+        else:
+            raise ValueError(f"simbolo desconocido: {caracter!r}")
+    return simbolos
+
+
+class Parser:
+    def __init__(self, texto):
+        self.simbolos = separar(texto)
+        self.posicion = 0
+
+    def actual(self):
+        if self.posicion < len(self.simbolos):
+            return self.simbolos[self.posicion]
+        return None
+
+    def avanzar(self):
+        simbolo = self.actual()
+        self.posicion += 1
+        return simbolo
+
+    def operando(self):
+        """
+        Lee un operando seguido de sus complementos
+        En esta posicion 'U' es el universo, no la union
+        """
+        simbolo = self.avanzar()
+        if simbolo is None:
+            raise ValueError("expresion incompleta")
+        if simbolo == "(":
+            nodo = self.expresion(0)
+            if self.avanzar() != ")":
+                raise ValueError("falta ')'")
+        elif simbolo == "U":
+            nodo = Universo()
+        elif simbolo.isupper():
+            nodo = Variable(simbolo)
+        else:
+            raise ValueError(f"se esperaba un conjunto y se encontro {simbolo!r}")
+
+        while self.actual() == "'":
+            self.avanzar()
+            nodo = Complemento(nodo)
+        return nodo
+
+    def expresion(self, precedencia_minima):
+        """
+        Lee operadores binarios de izquierda a derecha respetando precedencias
+        """
+        izquierda = self.operando()
+        while True:
+            simbolo = self.actual()
+            if simbolo not in OPERADORES:
+                return izquierda
+            precedencia = OPERADORES[simbolo][0]
+            if precedencia < precedencia_minima:
+                return izquierda
+            self.avanzar()
+            derecha = self.expresion(precedencia + 1)
+            izquierda = Binaria(simbolo, izquierda, derecha)
+
+
+def analizar(texto):
+    """
+    Convierte texto como "(A U B)' n C" en un arbol de expresion
+
+    Raises:
+        ValueError si el texto no es una expresion valida
+    """
+    parser = Parser(texto)
+    nodo = parser.expresion(0)
+    if parser.actual() is not None:
+        raise ValueError(f"simbolo inesperado: {parser.actual()!r}")
+    return nodo
+
+
+def formatear(nodo, padre=None, lado_derecho=False):
+    """
+    Escribe una expresion con los simbolos del juego
+    Solo omite parentesis cuando el operador se repite por la izquierda (A U B U C);
+    entre operadores distintos siempre los pone, porque la notacion de conjuntos no
+    tiene una precedencia acordada y quien lee de izquierda a derecha entenderia
+    A U B n C como (A U B) n C
+    """
+    if isinstance(nodo, Variable):
+        return nodo.nombre
+    if isinstance(nodo, Universo):
+        return "U"
+    if isinstance(nodo, Complemento):
+        return formatear(nodo.hijo, nodo) + "'"
+
+    texto = (formatear(nodo.izquierda, nodo) + f" {nodo.operador} " +
+             formatear(nodo.derecha, nodo, True))
+    if padre is None:
+        return texto
+    if isinstance(padre, Binaria) and nodo.operador == padre.operador and not lado_derecho:
+        return texto
+    return "(" + texto + ")"
+
+
+def variables(nodo):
+    """
+    Retorna los nombres de las variables de la expresion, ordenados
+    """
+    return nodo.nombres
+
+
+# Compilacion a una funcion sobre mascaras
+def codigo(nodo, parametros):
+    """
+    Traduce el arbol a una expresion de Python sobre mascaras enteras
+
+    Args:
+        nodo: Expresion
+        parametros: Diccionario nombre de variable -> nombre del parametro que la
+            reemplaza; los nombres de las variables nunca llegan al codigo
+    """
+    if isinstance(nodo, Variable):
+        return parametros[nodo.nombre]
+    if isinstance(nodo, Universo):
+        return str(MASCARA_UNIVERSO)
+    if isinstance(nodo, Complemento):
+        return f"({codigo(nodo.hijo, parametros)} ^ {MASCARA_UNIVERSO})"
+    return (f"({codigo(nodo.izquierda, parametros)} {OPERADORES[nodo.operador][1]} "
+            f"{codigo(nodo.derecha, parametros)})")
+
+
+@lru_cache(maxsize=1024)
+def compilar(nodo):
+    """
+    Compila una expresion una sola vez en una funcion de Python
+
+    Returns:
+        Funcion que recibe una mascara por variable (en el orden de variables(nodo))
+        y retorna la mascara del resultado
+    """
+    # Cada variable pasa a ser un parametro posicional m0, m1, ...; asi el codigo solo
+    # contiene esos parametros, numeros y operadores de OPERADORES
+    parametros = {nombre: f"m{i}" for i, nombre in enumerate(variables(nodo))}
+    fuente = f"lambda {', '.join(parametros.values())}: {codigo(nodo, parametros)}"
+    return eval(compile(fuente, "<expresion>", "eval"), {"__builtins__": {}})
+
+
+def interpretar(nodo, valores):
+    """
+    Evalua el arbol directamente, sin compilarlo
+
+    Args:
+        nodo: Expresion
+        valores: Diccionario nombre -> mascara
+    """
+    if isinstance(nodo, Variable):
+        return valores[nodo.nombre]
+    if isinstance(nodo, Universo):
+        return MASCARA_UNIVERSO
+    if isinstance(nodo, Complemento):
+        return interpretar(nodo.hijo, valores) ^ MASCARA_UNIVERSO
+    a = interpretar(nodo.izquierda, valores)
+    b = interpretar(nodo.derecha, valores)
+    if nodo.operador == "U":
+        return a | b
+    elif nodo.operador == "n":
+        return a & b
+    elif nodo.operador == "-":
+        return a & ~b
+    return a ^ b
+
+
+# Veces que se evaluo cada expresion todavia sin compilar
+usos = {}
+UMBRAL_COMPILACION = 2
+
+
+@lru_cache(maxsize=8192)
+def evaluar_mascaras(nodo, mascaras):
+    """
+    Evalua una expresion, con memoria por expresion y operandos
+    Las expresiones que se usan una sola vez se interpretan; compilar cuesta
+    mas que evaluar, asi que se compila recien cuando la expresion se repite
+
+    Args:
+        nodo: Expresion
+        mascaras: Tupla con una mascara por variable, en el orden de variables(nodo)
+
+    Returns:
+        Mascara del resultado
+    """
+    veces = usos.get(nodo, 0) + 1
+    if veces >= UMBRAL_COMPILACION:
+        usos.pop(nodo, None)
+        return compilar(nodo)(*mascaras)
+
+    if len(usos) > 4096:
+        usos.clear()
+    usos[nodo] = veces
+    return interpretar(nodo, dict(zip(variables(nodo), mascaras)))
+
+
+def evaluar(nodo, conjuntos):
+    """
+    Evalua una expresion sobre conjuntos con nombre
+
+    Args:
+        nodo: Expresion
+        conjuntos: Diccionario nombre -> ConjuntoBits
+
+    Returns:
+        ConjuntoBits con el resultado
+    """
+    mascaras = tuple(conjuntos[nombre].mascara for nombre in variables(nodo))
+    return ConjuntoBits.desde_mascara(evaluar_mascaras(nodo, mascaras))
+
+
+# Generacion y variantes
+def expresion_aleatoria(profundidad, nombres=("A", "B", "C"), prob_complemento=0.25, rng=random):
+    """
+    Genera una expresion al azar de la profundidad dada
+
+    Args:
+        profundidad: Niveles de operadores binarios (0 es solo una variable)
+        nombres: Variables que se pueden usar
+        prob_complemento: Probabilidad de complementar cada subexpresion
+        rng: Fuente de numeros aleatorios
+
+    Returns:
+        Expresion
+    """
+    if profundidad <= 0:
+        nodo = Variable(rng.choice(nombres))
+    else:
+        operador = rng.choice(list(OPERADORES))
+        izquierda = expresion_aleatoria(profundidad - 1, nombres, prob_complemento, rng)
+        derecha = expresion_aleatoria(rng.randint(0, profundidad - 1), nombres, prob_complemento, rng)
+        if rng.random() < 0.5:
+            izquierda, derecha = derecha, izquierda
+        nodo = Binaria(operador, izquierda, derecha)
+
+    if rng.random() < prob_complemento and not isinstance(nodo, Complemento):
+        nodo = Complemento(nodo)
+    return nodo
+
+
+def variantes(nodo):
+    """
+    Genera expresiones con un error tipico: otro operador o un complemento olvidado
+
+    Returns:
+        Lista de expresiones distintas a la original
+    """
+    if isinstance(nodo, Complemento):
+        resultado = [nodo.hijo]
+        resultado.extend(Complemento(v) for v in variantes(nodo.hijo))
+        return resultado
+    if isinstance(nodo, Binaria):
+        resultado = [Binaria(op, nodo.izquierda, nodo.derecha) for op in OPERADORES if op != nodo.operador]
+        resultado.extend(Binaria(nodo.operador, v, nodo.derecha) for v in variantes(nodo.izquierda))
+        resultado.extend(Binaria(nodo.operador, nodo.izquierda, v) for v in variantes(nodo.derecha))
+        return resultado
+    return []
@@ -0,0 +1,240 @@
+import random
+from conjuntos import ConjuntoBits, UNIVERSO, VACIO
+from expresiones import evaluar, expresion_aleatoria, variantes
+from pregunta import Operacion, Pregunta
+
+# Clase para manejar la logica de conjuntos
+class GeneradorConjuntos:
+    def __init__(self, rng=None):
+        """
+        Inicializa el generador de conjuntos y preguntas
+        
+        Args:
+            rng: random.Random de donde salen todas las decisiones al azar; con uno
+                creado a partir de una semilla las preguntas se repiten. Por defecto
+                usa el modulo random
+        """
+        self.rng = rng if rng is not None else random
+        self.operaciones = list(Operacion)
+        
+        # Si hay un muestreador del indice de preguntas, las preguntas salen de ahi
+        self.muestreador = None
+        
+        # Si hay un motor adaptativo, elige la operacion y los tamaños de los conjuntos
+        self.adaptativo = None
+        
+    def usar_muestreador(self, muestreador):
+        """
+        Hace que las preguntas se elijan del indice precalculado
+        
+        Args:
+            muestreador: MuestreadorPreguntas, o None para volver a generar al azar
+        """
+        self.muestreador = muestreador
+        
+    def usar_adaptativo(self, motor):
+        """
+        Hace que la operacion y los tamaños de los conjuntos dependan de como
+        viene respondiendo el jugador
+        
+        Args:
+            motor: adaptativo.MotorAdaptativo, o None para volver a elegir al azar
+        """
+        self.adaptativo = motor
+        
+    def generar_conjunto(self, min_elementos=3, max_elementos=6):
+        """
+        Genera un conjunto aleatorio de numeros
+        
+        Args:
+            min_elementos: Minimo numero de elementos
+            max_elementos: Maximo numero de elementos
+            
+        Returns:
+            ConjuntoBits con numeros aleatorios
+        """
+        cantidad = self.rng.randint(min_elementos, max_elementos)
+        return ConjuntoBits(self.rng.sample(range(1, 11), cantidad))
+    
+    def union(self, conjunto_a, conjunto_b):
+        """Retorna la union de dos conjuntos"""
+        return conjunto_a | conjunto_b
+    
+    def interseccion(self, conjunto_a, conjunto_b):
+        """Retorna la interseccion de dos conjuntos"""
+        return conjunto_a & conjunto_b
+    
+    def diferencia(self, conjunto_a, conjunto_b):
+        """Retorna la diferencia A - B"""
+        return conjunto_a - conjunto_b
+    
+    def diferencia_simetrica(self, conjunto_a, conjunto_b):
+        """Retorna la diferencia simetrica de dos conjuntos"""
+        return conjunto_a ^ conjunto_b
+    
+    def calcular_operacion(self, conjunto_a, conjunto_b, operacion):
+        """
+        Calcula el resultado de una operacion entre dos conjuntos
+        
+        Args:
+            conjunto_a: Primer conjunto
+            conjunto_b: Segundo conjunto
+            operacion: Operacion a realizar
+            
+        Returns:
+            Resultado de la operacion
+        """
+        if operacion == Operacion.UNION:
+            return self.union(conjunto_a, conjunto_b)
+        elif operacion == Operacion.INTERSECCION:
+            return self.interseccion(conjunto_a, conjunto_b)
+        elif operacion == Operacion.DIFERENCIA:
+            return self.diferencia(conjunto_a, conjunto_b)
+        elif operacion == Operacion.DIFERENCIA_SIMETRICA:
+            return self.diferencia_simetrica(conjunto_a, conjunto_b)
+        return VACIO
+    
+    def generar_distractores(self, conjunto_a, conjunto_b, operacion, respuesta, cantidad=3):
+        """
+        Genera opciones incorrectas a partir de errores comunes
+        Revisa a lo sumo 14 candidatos, sin reintentos
+        
+        Args:
+            conjunto_a: Primer conjunto
+            conjunto_b: Segundo conjunto
+            operacion: Operacion de la pregunta
+            respuesta: Respuesta correcta
+            cantidad: Cantidad de opciones incorrectas
+            
+        Returns:
+            Lista de conjuntos distintos entre si, no vacios y distintos a la respuesta
+        """
+        # Errores tipicos: aplicar otra operacion o invertir la diferencia
+        errores = [
+            self.calcular_operacion(conjunto_a, conjunto_b, otra)
+            for otra in self.operaciones if otra != operacion
+        ]
+        if operacion == Operacion.DIFERENCIA:
+            errores.append(self.diferencia(conjunto_b, conjunto_a))
+        return self.elegir_distractores(errores, respuesta, cantidad)
+    
+    def elegir_distractores(self, errores, respuesta, cantidad=3):
+        """
+        Elige opciones incorrectas, primero entre los errores y luego entre
+        la respuesta con un elemento de mas o de menos
+        
+        Args:
+            errores: Resultados de errores tipicos
+            respuesta: Respuesta correcta
+            cantidad: Cantidad de opciones incorrectas
+            
+        Returns:
+            Lista de conjuntos distintos entre si, no vacios y distintos a la respuesta
+        """
+        errores = list(errores)
+        self.rng.shuffle(errores)
+        
+        # La respuesta con un elemento de mas o de menos; son 10 conjuntos
+        # distintos y a lo sumo uno es vacio, asi que siempre alcanzan
+        cercanos = [ConjuntoBits.desde_mascara(respuesta.mascara ^ (1 << i))
+                    for i in range(len(UNIVERSO))]
+        self.rng.shuffle(cercanos)
+        
+        distractores = []
+        for candidato in errores + cercanos:
+            if candidato and candidato != respuesta and candidato not in distractores:
+                distractores.append(candidato)
+                if len(distractores) == cantidad:
+                    break
+        return distractores
+    
+    def generar_pregunta(self):
+        """
+        Genera una pregunta completa con conjuntos y operacion
+        
+        Returns:
+            Pregunta con los conjuntos, la operacion, las opciones y la posicion de la correcta
+        """
+        if self.muestreador is not None:
+            # Elegir del indice una pregunta que ya cumple el filtro
+            mascara_a, mascara_b, nombre = self.muestreador.elegir(self.rng)
+            conjunto_a = ConjuntoBits.desde_mascara(mascara_a)
+            conjunto_b = ConjuntoBits.desde_mascara(mascara_b)
+            operacion = Operacion.desde_nombre(nombre)
+        elif self.adaptativo is not None:
+            # Operacion y tamaños segun las estadisticas del jugador
+            operacion = self.operaciones[self.adaptativo.elegir_operacion(self.rng)]
+            tamaño = self.adaptativo.elegir_tamaño(self.rng)
+            conjunto_a = self.generar_conjunto(tamaño, tamaño)
+            tamaño = self.adaptativo.elegir_tamaño(self.rng)
+            conjunto_b = self.generar_conjunto(tamaño, tamaño)
+        else:
+            # Generar dos conjuntos aleatorios
+            conjunto_a = self.generar_conjunto()
+            conjunto_b = self.generar_conjunto()
+            
+            # Seleccionar operacion aleatoria
+            operacion = self.rng.choice(self.operaciones)
+        
+        # Calcular respuesta correcta
+        respuesta_correcta = self.calcular_operacion(conjunto_a, conjunto_b, operacion)
+        
+        # Agregar 3 opciones incorrectas basadas en errores comunes
+        opciones = [respuesta_correcta]
+        opciones.extend(self.generar_distractores(conjunto_a, conjunto_b, operacion, respuesta_correcta))
+        
+        # Mezclar opciones; los distractores son distintos a la respuesta,
+        # asi que aparece una sola vez
+        self.rng.shuffle(opciones)
+        
+        return Pregunta(conjunto_a, conjunto_b, operacion, opciones, opciones.index(respuesta_correcta))
+
+    def generar_preguntas(self, n, seed=None):
+        """
+        Genera N preguntas de una vez con NumPy, para hojas de ejercicios o analisis
+        No usa el muestreador; para lotes que no caben en memoria ver lote.iterar_lotes
+        
+        Args:
+            n: Cantidad de preguntas
+            seed: Semilla para repetir el mismo lote
+            
+        Returns:
+            LotePreguntas; iterarlo da objetos Pregunta, como generar_pregunta
+        """
+        # Import local: el juego no necesita NumPy si nunca genera lotes
+        from lote import generar_preguntas
+        return generar_preguntas(n, seed)
+
+    def generar_pregunta_expresion(self, profundidad=2, nombres=("A", "B", "C"), max_errores=4):
+        """
+        Genera una pregunta con una expresion de varios conjuntos, para niveles dificiles
+        
+        Args:
+            profundidad: Niveles de operadores de la expresion
+            nombres: Nombres de los conjuntos que participan
+            max_errores: Cantidad maxima de expresiones con errores que se evaluan
+            
+        Returns:
+            Diccionario con los conjuntos, la expresion, su texto, la respuesta y las opciones
+        """
+        expresion = expresion_aleatoria(profundidad, nombres, rng=self.rng)
+        conjuntos = {nombre: self.generar_conjunto() for nombre in nombres}
+        respuesta_correcta = evaluar(expresion, conjuntos)
+        
+        # Errores tipicos: cambiar un operador u olvidar un complemento
+        candidatas = variantes(expresion)
+        if len(candidatas) > max_errores:
+            candidatas = self.rng.sample(candidatas, max_errores)
+        errores = [evaluar(variante, conjuntos) for variante in candidatas]
+        
+        opciones = [respuesta_correcta]
+        opciones.extend(self.elegir_distractores(errores, respuesta_correcta))
+        self.rng.shuffle(opciones)
+        
+        return {
+            "conjuntos": conjuntos,
+            "expresion": expresion,
+            "texto": str(expresion),
+            "respuesta_correcta": respuesta_correcta,
+            "opciones": opciones
+        }
@@ -0,0 +1,296 @@
+import struct
+import time
+import pygame
+
+# Formato del archivo: cabecera y despues registros, cada uno empieza con su tipo
+MAGICO = b"SZRG"
+VERSION_GRABACION = 1
+CABECERA = struct.Struct("<4sHQB")          # magico, version, semilla, dificultad
+CUADRO = struct.Struct("<BdH")              # tipo, tiempo, cantidad de eventos
+EVENTO = struct.Struct("<BIhh")             # codigo, tecla o boton, x, y
+PREGUNTA = struct.Struct("<BHHBB")          # tipo, mascara_a, mascara_b, operacion, correcta
+PUNTOS = struct.Struct("<Bi")               # tipo, puntos
+FIN = struct.Struct("<Bd")                  # tipo, tiempo
+
+TIPO_CUADRO = 1
+TIPO_PREGUNTA = 2
+TIPO_PUNTOS = 3
+TIPO_FIN = 4
+
+# Dificultad de la partida; la posicion es lo que se guarda
+DIFICULTADES = [None, "facil", "media", "dificil", "adaptativa"]
+
+# Eventos que se graban y su codigo en el archivo
+CODIGOS = {
+    pygame.QUIT: 0,
+    pygame.KEYDOWN: 1,
+    pygame.MOUSEBUTTONDOWN: 2,
+    pygame.MOUSEMOTION: 3,
+    pygame.VIDEOEXPOSE: 4,
+    pygame.WINDOWEXPOSED: 5,
+    pygame.WINDOWRESTORED: 6,
+}
+TIPOS = {codigo: tipo for tipo, codigo in CODIGOS.items()}
+
+
+def codificar_evento(evento):
+    """
+    Retorna los bytes de un evento, o None si es de un tipo que no se graba
+    """
+    codigo = CODIGOS.get(evento.type)
+    if codigo is None:
+        return None
+    if evento.type == pygame.KEYDOWN:
+        return EVENTO.pack(codigo, evento.key, 0, 0)
+    if evento.type == pygame.MOUSEBUTTONDOWN:
+        return EVENTO.pack(codigo, evento.button, *evento.pos)
+    if evento.type == pygame.MOUSEMOTION:
+        return EVENTO.pack(codigo, 0, *evento.pos)
+    return EVENTO.pack(codigo, 0, 0, 0)
+
+
+def decodificar_evento(codigo, valor, x, y):
+    """
+    Reconstruye un evento con los atributos que usa el juego
+    """
+    tipo = TIPOS[codigo]
+    if tipo == pygame.KEYDOWN:
+        return pygame.event.Event(tipo, key=valor, mod=0, unicode="", scancode=0)
+    if tipo == pygame.MOUSEBUTTONDOWN:
+        return pygame.event.Event(tipo, pos=(x, y), button=valor)
+    if tipo == pygame.MOUSEMOTION:
+        return pygame.event.Event(tipo, pos=(x, y), rel=(0, 0), buttons=(0, 0, 0))
+    return pygame.event.Event(tipo)
+
+
+# Clase que sigue las preguntas y el puntaje de una partida, cuadro a cuadro
+class Seguimiento:
+    def __init__(self):
+        self.pregunta = None
+        self.puntos = 0
+        # (mascara_a, mascara_b, operacion, indice_correcto) de cada pregunta mostrada
+        self.preguntas = []
+        # Cada valor que tomo el puntaje
+        self.historial_puntos = []
+
+    def observar(self, juego):
+        """
+        Revisa la pantalla de juego despues de un cuadro
+
+        Args:
+            juego: JuegoSetZero
+
+        Returns:
+            Tupla (pregunta nueva o None, puntos nuevos o None)
+        """
+        pantalla = juego.pantallas.get("juego")
+        if pantalla is None:
+            return None, None
+
+        partida = pantalla.partida
+        nueva = None
+        pregunta = partida.pregunta
+        if pregunta is not self.pregunta and pregunta is not None:
+            self.pregunta = pregunta
+            nueva = (pregunta.conjunto_a.mascara, pregunta.conjunto_b.mascara,
+                     int(pregunta.operacion), pregunta.indice_correcto)
+            self.preguntas.append(nueva)
+
+        puntos = None
+        if partida.puntos != self.puntos:
+            self.puntos = puntos = partida.puntos
+            self.historial_puntos.append(puntos)
+        return nueva, puntos
+
+
+# Clase que escribe una partida en un archivo binario mientras se juega
+class Grabador:
+    def __init__(self, ruta, reloj, semilla, dificultad=None):
+        """
+        Crea el archivo y escribe la cabecera
+
+        Args:
+            ruta: Archivo de la grabacion
+            reloj: Reloj del planificador; los tiempos se guardan desde su valor actual
+            semilla: Semilla de las preguntas de la partida
+            dificultad: Dificultad de la partida, o None
+        """
+        self.reloj = reloj
+        self.inicio = reloj()
+        self.seguimiento = Seguimiento()
+        self.archivo = open(ruta, "wb")
+        self.archivo.write(CABECERA.pack(MAGICO, VERSION_GRABACION, semilla,
+                                         DIFICULTADES.index(dificultad)))
+
+    def cuadro(self, eventos):
+        """
+        Graba los eventos atendidos en un cuadro, con el tiempo del cuadro
+        """
+        codificados = [datos for datos in map(codificar_evento, eventos) if datos is not None]
+        self.archivo.write(CUADRO.pack(TIPO_CUADRO, self.reloj() - self.inicio, len(codificados)))
+        self.archivo.write(b"".join(codificados))
+
+    def observar(self, juego):
+        """
+        Graba la pregunta o el puntaje si cambiaron en este cuadro
+        """
+        pregunta, puntos = self.seguimiento.observar(juego)
+        if pregunta is not None:
+            self.archivo.write(PREGUNTA.pack(TIPO_PREGUNTA, *pregunta))
+            # Una vez por pregunta: si el juego se cierra mal se pierde poco
+            self.archivo.flush()
+        if puntos is not None:
+            self.archivo.write(PUNTOS.pack(TIPO_PUNTOS, puntos))
+
+    def cerrar(self):
+        """
+        Marca el final de la partida y cierra el archivo
+        """
+        if self.archivo.closed:
+            return
+        self.archivo.write(FIN.pack(TIPO_FIN, self.reloj() - self.inicio))
+        self.archivo.close()
+
+
+# Clase con una partida grabada, lista para reproducir
+class Grabacion:
+    def __init__(self, semilla, dificultad, cuadros, preguntas, historial_puntos, duracion=None):
+        """
+        Args:
+            semilla: Semilla de las preguntas
+            dificultad: Dificultad de la partida, o None
+            cuadros: Lista de (tiempo, lista de eventos)
+            preguntas: Preguntas mostradas, como en Seguimiento.preguntas
+            historial_puntos: Valores que tomo el puntaje
+            duracion: Tiempo del final de la partida, o None si el archivo quedo cortado
+        """
+        self.semilla = semilla
+        self.dificultad = dificultad
+        self.cuadros = cuadros
+        self.preguntas = preguntas
+        self.historial_puntos = historial_puntos
+        self.duracion = duracion
+
+    @classmethod
+    def cargar(cls, ruta):
+        """
+        Lee un archivo escrito por Grabador
+
+        Raises:
+            ValueError si el archivo no es una grabacion de esta version
+        """
+        with open(ruta, "rb") as archivo:
+            datos = archivo.read()
+
+        if len(datos) < CABECERA.size:
+            raise ValueError("grabacion incompleta")
+        magico, version, semilla, dificultad = CABECERA.unpack_from(datos)
+        if magico != MAGICO or version != VERSION_GRABACION:
+            raise ValueError("grabacion incompatible")
+
+        cuadros = []
+        preguntas = []
+        historial_puntos = []
+        duracion = None
+        posicion = CABECERA.size
+        # Un registro cortado al final (el juego se cerro mal) se descarta
+        try:
+            while posicion < len(datos):
+                tipo = datos[posicion]
+                if tipo == TIPO_CUADRO:
+                    _, tiempo, cantidad = CUADRO.unpack_from(datos, posicion)
+                    posicion += CUADRO.size
+                    eventos = [decodificar_evento(*EVENTO.unpack_from(datos, posicion + i * EVENTO.size))
+                               for i in range(cantidad)]
+                    posicion += cantidad * EVENTO.size
+                    cuadros.append((tiempo, eventos))
+                elif tipo == TIPO_PREGUNTA:
+                    preguntas.append(PREGUNTA.unpack_from(datos, posicion)[1:])
+                    posicion += PREGUNTA.size
+                elif tipo == TIPO_PUNTOS:
+                    historial_puntos.append(PUNTOS.unpack_from(datos, posicion)[1])
+                    posicion += PUNTOS.size
+                elif tipo == TIPO_FIN:
+                    duracion = FIN.unpack_from(datos, posicion)[1]
+                    break
+                else:
+                    raise ValueError(f"registro desconocido en la posicion {posicion}")
+        except struct.error:
+            pass
+        return cls(semilla, DIFICULTADES[dificultad], cuadros, preguntas, historial_puntos, duracion)
+
+
+def reproducir(juego, grabacion, tiempo_real=False, dibujar=True, mouse=None):
+    """
+    Repite una partida grabada pasando sus eventos por manejar_eventos y actualizar,
+    con el reloj de los temporizadores puesto en el tiempo de cada cuadro
+
+    Args:
+        juego: JuegoSetZero creado con un RelojSimulado y la semilla y dificultad de
+            la grabacion
+        grabacion: Grabacion
+        tiempo_real: Si es True espera entre cuadros lo mismo que la partida original;
+            si no, corre lo mas rapido posible
+        dibujar: Si es True tambien dibuja cada cuadro
+        mouse: Objeto con atributo posicion (como benchmark.MouseSimulado) que se
+            mueve con los eventos del mouse, o None
+
+    Returns:
+        Diccionario con si coinciden las preguntas y el puntaje, la primera
+        diferencia encontrada y el tiempo de cada cuadro en ms
+    """
+    reloj = juego.planificador.reloj
+    seguimiento = Seguimiento()
+    tiempos = []
+    inicio = time.perf_counter()
+
+    for tiempo, eventos in grabacion.cuadros:
+        if tiempo_real:
+            espera = inicio + tiempo - time.perf_counter()
+            if espera > 0:
+                time.sleep(espera)
+        reloj.tiempo = tiempo
+
+        # La entrada real no participa; solo los eventos grabados
+        pygame.event.clear()
+        juego.eventos_pendientes = list(eventos)
+        if mouse is not None:
+            for evento in eventos:
+                if evento.type in (pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN):
+                    mouse.posicion = evento.pos
+
+        t0 = time.perf_counter()
+        juego.manejar_eventos()
+        juego.actualizar()
+        if dibujar:
+            juego.dibujar()
+        tiempos.append((time.perf_counter() - t0) * 1000)
+
+        seguimiento.observar(juego)
+        if not juego.ejecutando:
+            break
+
+    diferencia = None
+    if seguimiento.preguntas != grabacion.preguntas:
+        diferencia = primera_diferencia("pregunta", grabacion.preguntas, seguimiento.preguntas)
+    elif seguimiento.historial_puntos != grabacion.historial_puntos:
+        diferencia = primera_diferencia("puntos", grabacion.historial_puntos, seguimiento.historial_puntos)
+
+    return {
+        "cuadros": len(tiempos),
+        "coincide": diferencia is None,
+        "diferencia": diferencia,
+        "preguntas": len(seguimiento.preguntas),
+        "puntos": seguimiento.puntos,
+        "tiempos_ms": tiempos,
+    }
+
+
+def primera_diferencia(nombre, grabados, reproducidos):
+    """
+    Describe el primer elemento en que difieren dos secuencias
+    """
+    for i, (grabado, reproducido) in enumerate(zip(grabados, reproducidos)):
+        if grabado != reproducido:
+            return f"{nombre} {i}: grabado {grabado}, reproducido {reproducido}"
+    return f"{nombre}: {len(grabados)} grabados, {len(reproducidos)} reproducidos"
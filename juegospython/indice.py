@@ -0,0 +1,266 @@
+import os
+import random
+import struct
+from array import array
+from conjuntos import UNIVERSO, MASCARA_UNIVERSO
+from muestreo import TablaAlias
+from pregunta import NOMBRES
+
+# Version del formato del archivo; cambiarla invalida los caches viejos
+VERSION_INDICE = 1
+MAGICO = b"SZIX"
+
+# Nombres de las operaciones; la posicion es el valor de pregunta.Operacion
+OPERACIONES = NOMBRES
+
+# Niveles de dificultad segun el puntaje de dificultad_de
+NIVELES = {
+    "facil": range(0, 2),
+    "media": range(2, 4),
+    "dificil": range(4, 8),
+}
+
+
+def aplicar(operacion, a, b):
+    """
+    Aplica una operacion (indice de OPERACIONES) a dos mascaras
+    """
+    if operacion == 0:
+        return a | b
+    elif operacion == 1:
+        return a & b
+    elif operacion == 2:
+        return a & ~b
+    return a ^ b
+
+
+def dificultad_de(operacion, tamaño_resultado, tamaño_interseccion):
+    """
+    Calcula un puntaje de dificultad de 0 a 7 para una pregunta
+
+    Args:
+        operacion: Indice de la operacion en OPERACIONES
+        tamaño_resultado: Cantidad de elementos del resultado
+        tamaño_interseccion: Cantidad de elementos en comun entre A y B
+
+    Returns:
+        Entero; mayor es mas dificil
+    """
+    # Union e interseccion son las primeras que se aprenden
+    puntaje = (0, 1, 2, 3)[operacion]
+
+    # Resultados grandes cuestan mas de verificar
+    if tamaño_resultado >= 7:
+        puntaje += 2
+    elif tamaño_resultado >= 4:
+        puntaje += 1
+
+    # Con mucho solapamiento es facil confundir las regiones
+    if tamaño_interseccion >= 3 and operacion != 1:
+        puntaje += 1
+    return min(puntaje, 7)
+
+
+def ruta_cache_por_defecto():
+    """
+    Retorna la ruta del archivo de cache dentro del directorio de cache del usuario
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "set-zero", f"indice_preguntas_v{VERSION_INDICE}.bin")
+
+
+# Clase con todas las preguntas posibles agrupadas por caracteristicas
+class IndicePreguntas:
+    def __init__(self, cubetas, min_elementos=3, max_elementos=6):
+        """
+        Inicializa el indice a partir de cubetas ya calculadas
+
+        Args:
+            cubetas: Diccionario (operacion, tamaño_resultado, tamaño_interseccion) ->
+                array('I') con (mascara_a << 10) | mascara_b por cada pregunta
+            min_elementos, max_elementos: Tamaños de A y B con los que se construyo
+        """
+        self.cubetas = cubetas
+        self.min_elementos = min_elementos
+        self.max_elementos = max_elementos
+
+    @classmethod
+    def construir(cls, min_elementos=3, max_elementos=6):
+        """
+        Recorre todo el espacio de preguntas y lo agrupa en cubetas
+
+        Returns:
+            IndicePreguntas nuevo
+        """
+        bits = len(UNIVERSO)
+        cantidad = [bin(m).count("1") for m in range(MASCARA_UNIVERSO + 1)]
+        mascaras = [m for m in range(MASCARA_UNIVERSO + 1)
+                    if min_elementos <= cantidad[m] <= max_elementos]
+
+        cubetas = {}
+        for operacion in range(len(OPERACIONES)):
+            for a in mascaras:
+                for b in mascaras:
+                    resultado = aplicar(operacion, a, b)
+                    clave = (operacion, cantidad[resultado], cantidad[a & b])
+                    cubeta = cubetas.get(clave)
+                    if cubeta is None:
+                        cubeta = cubetas[clave] = array("I")
+                    cubeta.append(a << bits | b)
+        return cls(cubetas, min_elementos, max_elementos)
+
+    @classmethod
+    def cargar_o_construir(cls, ruta=None, min_elementos=3, max_elementos=6):
+        """
+        Lee el indice del cache en disco, o lo construye y lo guarda
+
+        Args:
+            ruta: Archivo de cache (por defecto en el directorio de cache del usuario)
+
+        Returns:
+            IndicePreguntas listo para usar
+        """
+        ruta = ruta or ruta_cache_por_defecto()
+        try:
+            indice = cls.cargar(ruta)
+            if (indice.min_elementos, indice.max_elementos) == (min_elementos, max_elementos):
+                return indice
+        except (OSError, ValueError, struct.error):
+            pass
+
+        indice = cls.construir(min_elementos, max_elementos)
+        try:
+            indice.guardar(ruta)
+        except OSError:
+            # Sin permiso de escritura: se usa solo en memoria
+            pass
+        return indice
+
+    def guardar(self, ruta):
+        """
+        Guarda el indice en un archivo binario
+        """
+        carpeta = os.path.dirname(ruta)
+        if carpeta:
+            os.makedirs(carpeta, exist_ok=True)
+        temporal = ruta + ".tmp"
+        with open(temporal, "wb") as archivo:
+            archivo.write(struct.pack("<4sHBBI", MAGICO, VERSION_INDICE,
+                                      self.min_elementos, self.max_elementos, len(self.cubetas)))
+            for (operacion, resultado, interseccion), cubeta in sorted(self.cubetas.items()):
+                archivo.write(struct.pack("<BBBI", operacion, resultado, interseccion, len(cubeta)))
+            for clave in sorted(self.cubetas):
+                archivo.write(self.cubetas[clave].tobytes())
+        os.replace(temporal, ruta)
+
+    @classmethod
+    def cargar(cls, ruta):
+        """
+        Lee un indice guardado con guardar
+
+        Raises:
+            ValueError si el archivo no es un indice de esta version
+        """
+        with open(ruta, "rb") as archivo:
+            cabecera = archivo.read(struct.calcsize("<4sHBBI"))
+            magico, version, min_elementos, max_elementos, total = struct.unpack("<4sHBBI", cabecera)
+            if magico != MAGICO or version != VERSION_INDICE:
+                raise ValueError("cache de indice incompatible")
+
+            tamaño_entrada = struct.calcsize("<BBBI")
+            entradas = [struct.unpack("<BBBI", archivo.read(tamaño_entrada)) for _ in range(total)]
+
+            cubetas = {}
+            for operacion, resultado, interseccion, largo in entradas:
+                cubeta = array("I")
+                cubeta.frombytes(archivo.read(largo * 4))
+                if len(cubeta) != largo:
+                    raise ValueError("cache de indice truncado")
+                cubetas[(operacion, resultado, interseccion)] = cubeta
+        return cls(cubetas, min_elementos, max_elementos)
+
+    def claves(self, dificultad=None, operaciones=None, sin_vacias=False,
+               tamaño_resultado=None, tamaño_interseccion=None):
+        """
+        Retorna las cubetas que cumplen un filtro
+
+        Args:
+            dificultad: 'facil', 'media', 'dificil' o None para todas
+            operaciones: Nombres de operaciones permitidas, o None para todas
+            sin_vacias: Si True, excluye preguntas cuya respuesta es el conjunto vacio
+            tamaño_resultado: Rango (o contenedor) de tamaños de resultado permitidos
+            tamaño_interseccion: Rango (o contenedor) de tamaños de A n B permitidos
+
+        Returns:
+            Lista de claves (operacion, tamaño_resultado, tamaño_interseccion)
+        """
+        permitidas = None
+        if operaciones is not None:
+            permitidas = {OPERACIONES.index(nombre) for nombre in operaciones}
+        nivel = NIVELES[dificultad] if dificultad is not None else None
+
+        claves = []
+        for clave in sorted(self.cubetas):
+            operacion, resultado, interseccion = clave
+            if permitidas is not None and operacion not in permitidas:
+                continue
+            if sin_vacias and resultado == 0:
+                continue
+            if tamaño_resultado is not None and resultado not in tamaño_resultado:
+                continue
+            if tamaño_interseccion is not None and interseccion not in tamaño_interseccion:
+                continue
+            if nivel is not None and dificultad_de(operacion, resultado, interseccion) not in nivel:
+                continue
+            claves.append(clave)
+        return claves
+
+    def muestreador(self, claves=None, pesos=None, **filtro):
+        """
+        Crea un muestreador sobre una mezcla de cubetas
+
+        Args:
+            claves: Cubetas a usar; si es None se calculan con el filtro
+            pesos: Peso de cada cubeta; por defecto su tamaño (uniforme por pregunta)
+            **filtro: Argumentos de claves()
+
+        Returns:
+            MuestreadorPreguntas
+        """
+        if claves is None:
+            claves = self.claves(**filtro)
+        if not claves:
+            raise ValueError("ninguna pregunta cumple el filtro")
+        cubetas = [self.cubetas[clave] for clave in claves]
+        if pesos is None:
+            pesos = [len(cubeta) for cubeta in cubetas]
+        return MuestreadorPreguntas(claves, cubetas, pesos)
+
+    def __len__(self):
+        return sum(len(cubeta) for cubeta in self.cubetas.values())
+
+
+# Clase que elige preguntas al azar de un grupo de cubetas en O(1)
+class MuestreadorPreguntas:
+    def __init__(self, claves, cubetas, pesos):
+        """
+        Args:
+            claves: Claves de las cubetas elegidas
+            cubetas: Arrays de preguntas empaquetadas, en el mismo orden
+            pesos: Peso de cada cubeta
+        """
+        self.claves = claves
+        self.cubetas = cubetas
+        self.tabla = TablaAlias(pesos)
+
+    def elegir(self, rng=random):
+        """
+        Elige una pregunta
+
+        Returns:
+            Tupla (mascara_a, mascara_b, nombre_operacion)
+        """
+        i = self.tabla.elegir(rng)
+        cubeta = self.cubetas[i]
+        valor = cubeta[int(rng.random() * len(cubeta))]
+        return valor >> len(UNIVERSO), valor & MASCARA_UNIVERSO, OPERACIONES[self.claves[i][0]]
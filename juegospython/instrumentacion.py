@@ -0,0 +1,197 @@
+import pygame
+from array import array
+from texto import motor_texto
+
+# Fases del loop principal, en el orden en que se ejecutan
+FASES = ["eventos", "actualizar", "dibujar", "espera"]
+
+# Clase para guardar las ultimas N muestras sin crear objetos nuevos
+class BufferCircular:
+    def __init__(self, capacidad=240):
+        """
+        Inicializa el buffer con espacio fijo
+
+        Args:
+            capacidad: Cantidad maxima de muestras guardadas
+        """
+        self.datos = array("d", bytes(8 * capacidad))
+        self.capacidad = capacidad
+        self.indice = 0
+        self.cantidad = 0
+
+    def agregar(self, valor):
+        """
+        Guarda una muestra, reemplazando la mas antigua si esta lleno
+        """
+        self.datos[self.indice] = valor
+        self.indice = (self.indice + 1) % self.capacidad
+        if self.cantidad < self.capacidad:
+            self.cantidad += 1
+
+    def promedio(self):
+        """
+        Retorna el promedio de las muestras guardadas
+        """
+        if self.cantidad == 0:
+            return 0.0
+        return sum(self.datos[:self.cantidad]) / self.cantidad
+
+    def percentiles(self, *ps):
+        """
+        Retorna los percentiles pedidos (0-100) de las muestras guardadas
+        """
+        if self.cantidad == 0:
+            return [0.0 for _ in ps]
+        ordenados = sorted(self.datos[:self.cantidad])
+        ultimo = self.cantidad - 1
+        return [ordenados[min(ultimo, int(round(p / 100 * ultimo)))] for p in ps]
+
+
+# Clase que registra cuanto tarda cada fase de cada cuadro
+class Instrumentacion:
+    def __init__(self, capacidad=240, ruta_csv=None):
+        """
+        Inicializa los buffers de cada fase
+
+        Args:
+            capacidad: Cuadros que se recuerdan para las estadisticas
+            ruta_csv: Si se indica, cada cuadro se escribe como una fila en ese archivo
+        """
+        self.fases = {fase: BufferCircular(capacidad) for fase in FASES}
+        self.cuadros = BufferCircular(capacidad)
+        self.pantallas = {}
+        self.capacidad = capacidad
+        self.numero_cuadro = 0
+        self.estado = ""
+        # Segundos de cada fase del arranque (importar, iniciar, primer_cuadro), si se midieron
+        self.arranque = None
+
+        self.archivo_csv = None
+        if ruta_csv:
+            self.archivo_csv = open(ruta_csv, "w", encoding="utf-8")
+            self.archivo_csv.write("cuadro,estado," + ",".join(f + "_ms" for f in FASES) + ",total_ms\n")
+
+    def registrar_pantalla(self, estado, segundos):
+        """
+        Registra cuanto tardo el dibujar de una pantalla
+
+        Args:
+            estado: Nombre de la pantalla ('menu', 'juego', 'tutorial')
+            segundos: Duracion medida
+        """
+        buffer = self.pantallas.get(estado)
+        if buffer is None:
+            buffer = BufferCircular(self.capacidad)
+            self.pantallas[estado] = buffer
+        buffer.agregar(segundos * 1000)
+        self.estado = estado
+
+    def registrar_cuadro(self, eventos, actualizar, dibujar, espera):
+        """
+        Registra la duracion en segundos de cada fase de un cuadro
+        """
+        fases = self.fases
+        fases["eventos"].agregar(eventos * 1000)
+        fases["actualizar"].agregar(actualizar * 1000)
+        fases["dibujar"].agregar(dibujar * 1000)
+        fases["espera"].agregar(espera * 1000)
+        self.cuadros.agregar((eventos + actualizar + dibujar) * 1000)
+        self.numero_cuadro += 1
+
+        if self.archivo_csv is not None:
+            total = eventos + actualizar + dibujar + espera
+            self.archivo_csv.write(
+                f"{self.numero_cuadro},{self.estado},{eventos * 1000:.3f},{actualizar * 1000:.3f},"
+                f"{dibujar * 1000:.3f},{espera * 1000:.3f},{total * 1000:.3f}\n")
+
+    def fps(self):
+        """
+        Retorna los cuadros por segundo reales, incluyendo la espera del reloj
+        """
+        total = self.cuadros.promedio() + self.fases["espera"].promedio()
+        return 1000 / total if total > 0 else 0.0
+
+    def cerrar(self):
+        """
+        Cierra el archivo CSV si hay uno abierto
+        """
+        if self.archivo_csv is not None:
+            self.archivo_csv.close()
+            self.archivo_csv = None
+
+
+# Panel con las estadisticas de rendimiento, estilo F3
+class OverlayRendimiento:
+    def __init__(self, instrumentacion, intervalo_ms=250):
+        """
+        Inicializa el panel oculto
+
+        Args:
+            instrumentacion: Instrumentacion de donde se leen los datos
+            intervalo_ms: Cada cuanto se vuelve a escribir el texto del panel
+        """
+        self.instrumentacion = instrumentacion
+        self.intervalo_ms = intervalo_ms
+        self.visible = False
+        self.rect = pygame.Rect(0, 0, 400, 160)
+        self.superficie = None
+        self.ultima_actualizacion = 0
+
+    def alternar(self):
+        """
+        Muestra u oculta el panel
+
+        Returns:
+            True si el panel quedo visible
+        """
+        self.visible = not self.visible
+        self.superficie = None
+        return self.visible
+
+    def lineas(self):
+        """
+        Construye las lineas de texto del panel
+        """
+        inst = self.instrumentacion
+        p50, p95, p99 = inst.cuadros.percentiles(50, 95, 99)
+        fases = "  ".join(f"{fase} {inst.fases[fase].promedio():.2f}" for fase in FASES)
+        cache = motor_texto.estadisticas()
+        consultas = cache["aciertos"] + cache["fallos"]
+        tasa = cache["aciertos"] / consultas if consultas else 0.0
+
+        lineas = [
+            f"FPS {inst.fps():.1f}",
+            f"cuadro ms  p50 {p50:.2f}  p95 {p95:.2f}  p99 {p99:.2f}",
+            fases,
+        ]
+        for estado, buffer in inst.pantallas.items():
+            lineas.append(f"dibujar {estado} {buffer.promedio():.2f} ms")
+        lineas.append(f"texto cache {cache['tamaño']}/{cache['limite']}  aciertos {tasa:.0%}")
+        if inst.arranque is not None:
+            lineas.append("arranque ms  " + "  ".join(
+                f"{fase} {segundos * 1000:.0f}" for fase, segundos in inst.arranque.items()))
+        return lineas
+
+    def dibujar(self, pantalla):
+        """
+        Dibuja el panel si esta visible
+
+        Returns:
+            Rectangulo que ocupa el panel, o None si esta oculto
+        """
+        if not self.visible:
+            return None
+
+        ahora = pygame.time.get_ticks()
+        if self.superficie is None or ahora - self.ultima_actualizacion >= self.intervalo_ms:
+            superficie = pygame.Surface(self.rect.size)
+            superficie.fill((20, 20, 20))
+            # Texto que cambia siempre: se renderiza directo para no llenar el cache
+            for i, linea in enumerate(self.lineas()):
+                texto = motor_texto.fuente(20).render(linea, True, (230, 230, 230))
+                superficie.blit(texto, (8, 8 + i * 18))
+            self.superficie = superficie
+            self.ultima_actualizacion = ahora
+
+        pantalla.blit(self.superficie, self.rect)
+        return self.rect
@@ -0,0 +1,174 @@
+from temporizador import Planificador
+
+# Segundos para responder cada pregunta y duracion del feedback
+TIEMPO_LIMITE = 15
+DURACION_FEEDBACK = 1.0
+# Puntos que suma cada respuesta correcta
+PUNTOS_POR_ACIERTO = 10
+
+
+# Clase con las reglas de una partida, sin pygame: preguntas, tiempo, feedback y puntaje
+# El tiempo sale del reloj del planificador, asi que se puede simular
+class Partida:
+    def __init__(self, siguiente_pregunta, planificador=None, tiempo_limite=TIEMPO_LIMITE,
+                 duracion_feedback=DURACION_FEEDBACK, puntos_por_acierto=PUNTOS_POR_ACIERTO,
+                 adaptativo=None):
+        """
+        Args:
+            siguiente_pregunta: Funcion sin argumentos que retorna la proxima Pregunta
+                (por ejemplo GeneradorConjuntos.generar_pregunta)
+            planificador: Planificador de los temporizadores; quien lo crea es
+                responsable de llamar a procesar()
+            tiempo_limite: Segundos para responder cada pregunta
+            duracion_feedback: Segundos que se muestra el resultado antes de seguir
+            puntos_por_acierto: Puntos de cada respuesta correcta
+            adaptativo: adaptativo.MotorAdaptativo al que se informa cada respuesta
+                y cada pregunta vencida, o None
+        """
+        self.siguiente_pregunta = siguiente_pregunta
+        self.planificador = planificador if planificador is not None else Planificador()
+        self.tiempo_limite = tiempo_limite
+        self.duracion_feedback = duracion_feedback
+        self.puntos_por_acierto = puntos_por_acierto
+        self.adaptativo = adaptativo
+
+        self.activa = False
+        self.inicio_partida = None
+        self.puntos = 0
+        self.tiempo_restante = tiempo_limite
+        self.pregunta = None
+        self.mostrando_feedback = False
+        self.respuesta_seleccionada = None
+        self.es_correcta = None
+        # Momento en que se mostro la pregunta actual, para medir el tiempo de respuesta
+        self.inicio_pregunta = None
+        self.tiempo_respuesta = None
+
+        # Totales de la partida
+        self.aciertos = 0
+        self.errores = 0
+        self.vencidas = 0
+
+        # Temporizadores de la pregunta o del feedback en curso
+        self.temporizadores = []
+
+        # Funciones que llama la partida, las asigna quien la muestra:
+        # al_nueva_pregunta(pregunta), al_responder(indice, es_correcta), al_vencer(pregunta),
+        # al_terminar() cuando termina una partida que estaba en curso
+        self.al_nueva_pregunta = None
+        self.al_responder = None
+        self.al_vencer = None
+        self.al_terminar = None
+
+    def iniciar(self):
+        """
+        Empieza una partida nueva con la primera pregunta
+        """
+        self.activa = True
+        self.inicio_partida = self.planificador.ahora()
+        self.puntos = 0
+        self.aciertos = 0
+        self.errores = 0
+        self.vencidas = 0
+        self.nueva_pregunta()
+
+    def terminar(self):
+        """
+        Termina la partida y detiene sus temporizadores
+        """
+        estaba_activa = self.activa
+        self.activa = False
+        self.cancelar_temporizadores()
+        if estaba_activa and self.al_terminar is not None:
+            self.al_terminar()
+
+    def duracion(self):
+        """
+        Retorna los segundos desde que empezo la partida
+        """
+        return self.planificador.ahora() - self.inicio_partida
+
+    def nueva_pregunta(self):
+        """
+        Pasa a la proxima pregunta y reinicia el tiempo
+        """
+        self.pregunta = self.siguiente_pregunta()
+        self.inicio_pregunta = self.planificador.ahora()
+        self.tiempo_restante = self.tiempo_limite
+        self.mostrando_feedback = False
+        self.respuesta_seleccionada = None
+        self.es_correcta = None
+
+        # Descontar un segundo por vez; al agotarse el tiempo se pasa a otra pregunta
+        self.cancelar_temporizadores()
+        self.temporizadores = [
+            self.planificador.cada(1, self.descontar_segundo),
+            self.planificador.despues(self.tiempo_limite, self.vencer),
+        ]
+
+        if self.al_nueva_pregunta is not None:
+            self.al_nueva_pregunta(self.pregunta)
+
+    def descontar_segundo(self):
+        """
+        Temporizador de cada segundo de la pregunta
+        """
+        self.tiempo_restante = max(0, self.tiempo_restante - 1)
+
+    def vencer(self):
+        """
+        Se acabo el tiempo sin respuesta: cuenta como vencida y sigue otra pregunta
+        """
+        self.vencidas += 1
+        if self.adaptativo is not None:
+            self.adaptativo.registrar(self.pregunta, False, self.tiempo_limite)
+        if self.al_vencer is not None:
+            self.al_vencer(self.pregunta)
+        self.nueva_pregunta()
+
+    def puede_responder(self):
+        """
+        Retorna True si hay una pregunta esperando respuesta
+        """
+        return self.activa and self.pregunta is not None and not self.mostrando_feedback
+
+    def responder(self, indice):
+        """
+        Responde la pregunta actual; se ignora si no hay pregunta o se esta mostrando feedback
+
+        Args:
+            indice: Posicion de la opcion elegida (0-3)
+
+        Returns:
+            True o False segun la respuesta, o None si se ignoro
+        """
+        if not self.puede_responder():
+            return None
+
+        self.respuesta_seleccionada = indice
+        self.es_correcta = self.pregunta.es_correcta(indice)
+        self.tiempo_respuesta = self.planificador.ahora() - self.inicio_pregunta
+        if self.adaptativo is not None:
+            self.adaptativo.registrar(self.pregunta, self.es_correcta, self.tiempo_respuesta)
+        if self.es_correcta:
+            self.aciertos += 1
+            self.puntos += self.puntos_por_acierto
+        else:
+            self.errores += 1
+
+        # El reloj se detiene durante el feedback y despues sigue otra pregunta
+        self.mostrando_feedback = True
+        self.cancelar_temporizadores()
+        self.temporizadores = [self.planificador.despues(self.duracion_feedback, self.nueva_pregunta)]
+
+        if self.al_responder is not None:
+            self.al_responder(indice, self.es_correcta)
+        return self.es_correcta
+
+    def cancelar_temporizadores(self):
+        """
+        Cancela los temporizadores de la pregunta o del feedback en curso
+        """
+        for temporizador in self.temporizadores:
+            temporizador.cancelar()
+        self.temporizadores = []
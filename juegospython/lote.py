@@ -0,0 +1,220 @@
+from itertools import permutations
+from conjuntos import ConjuntoBits, UNIVERSO, MASCARA_UNIVERSO
+from pregunta import Operacion, Pregunta
+
+# NumPy solo hace falta para generar preguntas en lote (hojas de ejercicios,
+# analisis); el juego funciona sin el
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Indice de la operacion con un error tipico de mas (B - A)
+DIFERENCIA = int(Operacion.DIFERENCIA)
+
+# Cantidad de preguntas que se generan juntas en el modo por bloques
+TAMAÑO_BLOQUE = 1 << 16
+
+if np is not None:
+    # Las 24 formas de ordenar 4 columnas, y donde queda la columna 0 en cada una
+    PERMUTACIONES_4 = np.array(list(permutations(range(4))), dtype=np.intp)
+    POSICION_DEL_0 = np.argmin(PERMUTACIONES_4, axis=1).astype(np.uint8)
+
+    # Para cada mascara: cantidad de bits y el bit numero k (como mascara)
+    CANTIDAD_BITS = np.array([bin(m).count("1") for m in range(MASCARA_UNIVERSO + 1)])
+    SELECCION = np.zeros((MASCARA_UNIVERSO + 1, len(UNIVERSO)), dtype=np.uint16)
+    for _mascara in range(MASCARA_UNIVERSO + 1):
+        _bits = [1 << i for i in range(len(UNIVERSO)) if _mascara >> i & 1]
+        SELECCION[_mascara, :len(_bits)] = _bits
+
+
+def requerir_numpy():
+    """
+    Raises:
+        ImportError si NumPy no esta instalado
+    """
+    if np is None:
+        raise ImportError("la generacion en lote necesita NumPy (pip install numpy)")
+
+
+# Clase con N preguntas guardadas como arrays de mascaras
+class LotePreguntas:
+    def __init__(self, conjunto_a, conjunto_b, operacion, respuesta, opciones, indice_correcto):
+        """
+        Args:
+            conjunto_a, conjunto_b: Mascaras de los conjuntos, array uint16 de largo N
+            operacion: Indice de la operacion (valor de Operacion), array uint8
+            respuesta: Mascara de la respuesta correcta, array uint16
+            opciones: Mascaras de las 4 opciones, array uint16 de forma (N, 4)
+            indice_correcto: Posicion de la respuesta dentro de opciones, array uint8
+        """
+        self.conjunto_a = conjunto_a
+        self.conjunto_b = conjunto_b
+        self.operacion = operacion
+        self.respuesta = respuesta
+        self.opciones = opciones
+        self.indice_correcto = indice_correcto
+
+    def __len__(self):
+        return len(self.operacion)
+
+    def pregunta(self, i):
+        """
+        Retorna la pregunta i como Pregunta, igual que GeneradorConjuntos.generar_pregunta
+        """
+        return Pregunta(
+            ConjuntoBits.desde_mascara(int(self.conjunto_a[i])),
+            ConjuntoBits.desde_mascara(int(self.conjunto_b[i])),
+            int(self.operacion[i]),
+            [ConjuntoBits.desde_mascara(m) for m in self.opciones[i].tolist()],
+            int(self.indice_correcto[i])
+        )
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.pregunta(i)
+
+
+def tabla_mascaras(min_elementos, max_elementos):
+    """
+    Retorna las mascaras agrupadas por cantidad de elementos
+
+    Returns:
+        Tupla (mascaras, inicio, largo): mascaras ordenadas por cantidad; inicio[k] y
+        largo[k] dan la porcion con k elementos para k entre min y max
+    """
+    mascaras = np.argsort(CANTIDAD_BITS, kind="stable").astype(np.uint16)
+    largo = np.bincount(CANTIDAD_BITS, minlength=len(UNIVERSO) + 1)
+    inicio = np.concatenate(([0], np.cumsum(largo)[:-1]))
+    rango = slice(min_elementos, max_elementos + 1)
+    return mascaras, inicio[rango], largo[rango]
+
+
+def generar_conjuntos(rng, n, min_elementos=3, max_elementos=6):
+    """
+    Genera N conjuntos al azar con la misma distribucion que generar_conjunto:
+    primero la cantidad de elementos y despues un subconjunto uniforme de ese tamaño
+
+    Returns:
+        Array uint16 con las mascaras
+    """
+    mascaras, inicio, largo = tabla_mascaras(min_elementos, max_elementos)
+    cantidad = rng.integers(0, len(largo), n)
+    posicion = (rng.random(n) * largo[cantidad]).astype(np.int64)
+    return mascaras[inicio[cantidad] + posicion]
+
+
+def mezclar(tabla, indices, filas):
+    """
+    Retorna tabla[indices[k, i], i] para cada k, i; equivale a indexar con dos arrays
+    pero con un solo take plano, que es bastante mas rapido
+
+    Args:
+        tabla: Array de forma (m, N)
+        indices: Array de forma (k, N) con filas de tabla
+        filas: np.arange(N)
+    """
+    return tabla.ravel().take(indices.astype(np.intp) * tabla.shape[1] + filas)
+
+
+def generar_preguntas(n, seed=None, min_elementos=3, max_elementos=6):
+    """
+    Genera N preguntas de una vez, con los mismos pasos que generar_pregunta
+    pero sobre arrays de mascaras
+
+    Args:
+        n: Cantidad de preguntas
+        seed: Semilla (o numpy.random.Generator) para obtener siempre el mismo lote
+        min_elementos, max_elementos: Tamaños de los conjuntos A y B
+
+    Returns:
+        LotePreguntas
+    """
+    requerir_numpy()
+    rng = np.random.default_rng(seed)
+
+    a = generar_conjuntos(rng, n, min_elementos, max_elementos)
+    b = generar_conjuntos(rng, n, min_elementos, max_elementos)
+    operacion = rng.integers(0, len(Operacion), n, dtype=np.uint8)
+
+    # Resultado de cada operacion; fila = operacion. Se trabaja con una fila por
+    # columna de preguntas para que cada paso recorra memoria contigua
+    resultados = np.stack((a | b, a & b, a & ~b, a ^ b))
+    filas = np.arange(n)
+    respuesta = mezclar(resultados, operacion[None, :], filas)[0]
+
+    # Errores tipicos: las otras tres operaciones, y B - A cuando se pregunta A - B,
+    # en orden aleatorio. Se usa 0 para "sin candidato": el vacio nunca es una opcion
+    otras = (operacion + np.arange(1, 4, dtype=np.uint8)[:, None]) % len(Operacion)
+    errores = np.empty((4, n), dtype=np.uint16)
+    errores[:3] = mezclar(resultados, otras, filas)
+    errores[3] = np.where(operacion == DIFERENCIA, b & ~a, 0)
+    errores = mezclar(errores, PERMUTACIONES_4[rng.integers(0, len(PERMUTACIONES_4), n)].T, filas)
+
+    # Igual que elegir_distractores: primero los errores validos y no repetidos, en orden.
+    # libres son los elementos que todavia se pueden agregar o quitar a la respuesta:
+    # no el que la deja vacia, ni los que repiten un error ya elegido
+    libres = np.full(n, MASCARA_UNIVERSO, dtype=np.uint16)
+    unico = (respuesta & (respuesta - 1)) == 0
+    libres[unico] &= ~respuesta[unico]
+    distractores = np.zeros((3, n), dtype=np.uint16)
+    usados = np.zeros(n, dtype=np.uint8)
+    for j in range(4):
+        error = errores[j]
+        valido = (error != 0) & (error != respuesta) & (usados < 3)
+        for k in range(j):
+            valido &= error != errores[k]
+        for k in range(min(j + 1, 3)):
+            destino = valido & (usados == k)
+            distractores[k] = np.where(destino, error, distractores[k])
+        diferencia = error ^ respuesta
+        libres = np.where(valido & ((diferencia & (diferencia - 1)) == 0), libres & ~diferencia, libres)
+        usados += valido
+
+    # Despues, la respuesta con un elemento de mas o de menos. Tomar los primeros
+    # validos de una permutacion de los 10 elementos es lo mismo que elegir al azar
+    # entre los elementos libres
+    for k in range(3):
+        falta = usados <= k
+        posicion = (rng.random(n) * CANTIDAD_BITS[libres]).astype(np.intp)
+        bit = SELECCION[libres, posicion]
+        distractores[k] = np.where(falta, respuesta ^ bit, distractores[k])
+        libres = np.where(falta, libres ^ bit, libres)
+
+    # Mezclar las 4 opciones; la respuesta es la fila 0 antes de mezclar
+    candidatas = np.concatenate((respuesta[None, :], distractores))
+    permutacion = rng.integers(0, len(PERMUTACIONES_4), n)
+    opciones = np.ascontiguousarray(mezclar(candidatas, PERMUTACIONES_4[permutacion].T, filas).T)
+    indice_correcto = POSICION_DEL_0[permutacion]
+
+    return LotePreguntas(a, b, operacion, respuesta, opciones, indice_correcto)
+
+
+def iterar_lotes(total, seed=None, tamaño_bloque=TAMAÑO_BLOQUE, **opciones):
+    """
+    Genera preguntas por bloques, para lotes que no caben en memoria
+
+    Args:
+        total: Cantidad total de preguntas (None para no terminar nunca)
+        seed: Semilla del generador; la secuencia completa depende solo de ella
+        tamaño_bloque: Preguntas por bloque
+        **opciones: Argumentos de generar_preguntas
+
+    Yields:
+        LotePreguntas de a lo sumo tamaño_bloque preguntas
+    """
+    requerir_numpy()
+    rng = np.random.default_rng(seed)
+    generadas = 0
+    while total is None or generadas < total:
+        n = tamaño_bloque if total is None else min(tamaño_bloque, total - generadas)
+        yield generar_preguntas(n, rng, **opciones)
+        generadas += n
+
+
+def iterar_preguntas(total, seed=None, tamaño_bloque=TAMAÑO_BLOQUE, **opciones):
+    """
+    Como iterar_lotes, pero entrega una Pregunta por vez, como generar_pregunta
+    """
+    for lote in iterar_lotes(total, seed, tamaño_bloque, **opciones):
+        yield from lote
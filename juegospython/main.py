@@ -1,113 +1,378 @@
+from time import perf_counter
+INICIO_IMPORTACION = perf_counter()
+
 import pygame
+import os
 import sys
+import math
+import random
+import argparse
 from pantallas import Menu, Juego, Tutorial
+from instrumentacion import Instrumentacion, OverlayRendimiento
+from entrada import configurar_eventos, leer_eventos
+from temporizador import Planificador, RelojCuadro, RelojSimulado
+from grabacion import Grabador, Grabacion, reproducir
+from analitica import RegistroAnalitica, ruta_por_defecto as ruta_analitica_por_defecto
+
+FIN_IMPORTACION = perf_counter()
 
 # Configuracion de la ventana
 ANCHO_VENTANA = 1080
 ALTO_VENTANA = 600
 FPS = 60
+# Espera maxima sin eventos cuando la pantalla no pide cuadros
+ESPERA_MAXIMA_MS = 1000
 TITULO = "Set-Zero"
 
 class JuegoSetZero:
-    def __init__(self):
+    def __init__(self, ruta_csv_rendimiento=None, dificultad=None, reloj=None, semilla=None,
+                 ruta_grabacion=None, ruta_analitica=None):
         """
         Inicializa el juego principal
+        
+        Args:
+            ruta_csv_rendimiento: Archivo CSV donde guardar los tiempos de cada cuadro
+            dificultad: Nivel de las preguntas ('facil', 'media', 'dificil',
+                'adaptativa') o None
+            reloj: Reloj de los temporizadores (por defecto time.monotonic); un
+                RelojSimulado permite correr la partida mas rapido que el tiempo real
+            semilla: Semilla de las preguntas; con la misma semilla y los mismos
+                eventos la partida se repite igual
+            ruta_grabacion: Si no es None, graba la partida en ese archivo para
+                reproducirla despues con --reproducir
+            ruta_analitica: Si no es None, agrega a ese archivo cada respuesta y el
+                puntaje final de cada partida
         """
-        # Inicializar pygame
-        pygame.init()
+        inicio = perf_counter()
+        
+        # Solo video y fuentes; pygame.init() tambien arrancaria audio, joystick, etc.
+        pygame.display.init()
+        pygame.font.init()
         
         # Crear ventana
         self.pantalla = pygame.display.set_mode((ANCHO_VENTANA, ALTO_VENTANA))
         pygame.display.set_caption(TITULO)
         
+        # Solo los eventos que se usan llegan a la cola
+        configurar_eventos()
+        
         # Reloj para controlar FPS
         self.reloj = pygame.time.Clock()
         
+        # Al grabar, el reloj se lee una vez por cuadro para poder repetir cada vencimiento
+        self.reloj_cuadro = None
+        if ruta_grabacion is not None:
+            if semilla is None:
+                semilla = random.randrange(1 << 63)
+            self.reloj_cuadro = reloj = RelojCuadro(reloj) if reloj is not None else RelojCuadro()
+        
+        # Temporizadores de todas las pantallas
+        self.planificador = Planificador(reloj) if reloj is not None else Planificador()
+        
         # Estado actual del juego
         self.estado = "menu"  # Puede ser: 'menu', 'juego', 'tutorial'
         
-        # Instanciar pantallas
-        self.menu = Menu(ANCHO_VENTANA, ALTO_VENTANA)
-        self.juego = Juego(ANCHO_VENTANA, ALTO_VENTANA)
-        self.tutorial = Tutorial(ANCHO_VENTANA, ALTO_VENTANA)
+        # Las pantallas se crean la primera vez que se entra en ellas
+        self.dificultad = dificultad
+        self.semilla = semilla
+        self.pantallas = {}
+        
+        # Grabacion de la partida: semilla, eventos y preguntas
+        self.grabador = None
+        if ruta_grabacion is not None:
+            self.grabador = Grabador(ruta_grabacion, self.planificador.reloj, semilla, dificultad)
+        
+        # Registro de respuestas y puntajes; si no se puede abrir el juego sigue sin el
+        self.analitica = None
+        if ruta_analitica is not None:
+            try:
+                self.analitica = RegistroAnalitica(ruta_analitica)
+            except (OSError, ValueError) as error:
+                print(f"analitica desactivada: {error}", file=sys.stderr)
         
         # Variable de control del loop principal
         self.ejecutando = True
+        
+        # Evento que desperto al loop mientras esperaba; se procesa en el cuadro siguiente
+        self.eventos_pendientes = []
+        
+        # Tiempos por fase y panel de rendimiento (se alterna con F3)
+        self.instrumentacion = Instrumentacion(ruta_csv=ruta_csv_rendimiento)
+        self.overlay = OverlayRendimiento(self.instrumentacion)
+        
+        # Tiempos de arranque en segundos; primer_cuadro se completa en ejecutar
+        self.arranque = {
+            "importar": FIN_IMPORTACION - INICIO_IMPORTACION,
+            "iniciar": perf_counter() - inicio,
+            "primer_cuadro": None,
+        }
+        self.inicio_primer_cuadro = perf_counter()
+        self.mostrar_arranque = False
+    
+    def obtener_pantalla(self, estado):
+        """
+        Retorna la pantalla de un estado, creandola si todavia no existe
+        
+        Args:
+            estado: 'menu', 'juego' o 'tutorial'
+        """
+        pantalla = self.pantallas.get(estado)
+        if pantalla is None:
+            if estado == "juego":
+                pantalla = Juego(ANCHO_VENTANA, ALTO_VENTANA, self.dificultad, self.planificador,
+                                 self.semilla, self.analitica)
+            elif estado == "tutorial":
+                pantalla = Tutorial(ANCHO_VENTANA, ALTO_VENTANA)
+            else:
+                pantalla = Menu(ANCHO_VENTANA, ALTO_VENTANA)
+            pantalla.navegar = self.navegar
+            self.pantallas[estado] = pantalla
+        return pantalla
+    
+    @property
+    def menu(self):
+        return self.obtener_pantalla("menu")
+    
+    @property
+    def juego(self):
+        return self.obtener_pantalla("juego")
+    
+    @property
+    def tutorial(self):
+        return self.obtener_pantalla("tutorial")
+    
+    def pantalla_actual(self):
+        """
+        Retorna la pantalla que corresponde al estado actual
+        """
+        return self.obtener_pantalla(self.estado)
+    
+    def cambiar_estado(self, estado):
+        """
+        Cambia de pantalla y fuerza un redibujo completo de la nueva
+        
+        Args:
+            estado: 'menu', 'juego' o 'tutorial'
+        """
+        self.estado = estado
+        self.pantalla_actual().invalidar()
+    
+    def navegar(self, destino):
+        """
+        Atiende los botones de navegacion de las pantallas
+        
+        Args:
+            destino: 'menu', 'juego', 'tutorial' o 'salir'
+        """
+        if destino == "salir":
+            self.ejecutando = False
+        else:
+            self.cambiar_estado(destino)
     
     def manejar_eventos(self):
         """
         Maneja todos los eventos del juego
+        
+        Returns:
+            Lista de eventos atendidos
         """
-        for evento in pygame.event.get():
+        eventos = leer_eventos(self.eventos_pendientes)
+        if not eventos:
+            return eventos
+        self.eventos_pendientes = []
+        for evento in eventos:
             # Evento de cierre de ventana
             if evento.type == pygame.QUIT:
                 self.ejecutando = False
             
-            # Delegar eventos segun el estado actual
-            if self.estado == "menu":
-                accion = self.menu.manejar_evento(evento)
-                if accion == "jugar":
-                    self.estado = "juego"
-                elif accion == "tutorial":
-                    self.estado = "tutorial"
-                elif accion == "salir":
-                    self.ejecutando = False
+            # Clicks y teclas van a las funciones registradas por la pantalla actual
+            elif evento.type == pygame.MOUSEBUTTONDOWN:
+                self.pantalla_actual().entrada.click(evento.pos)
             
-            elif self.estado == "juego":
-                accion = self.juego.manejar_evento(evento)
-                if accion == "menu":
-                    self.estado = "menu"
+            elif evento.type == pygame.KEYDOWN:
+                # F3 muestra u oculta el panel de rendimiento
+                if evento.key == pygame.K_F3:
+                    if not self.overlay.alternar():
+                        self.pantalla_actual().invalidar()
+                else:
+                    self.pantalla_actual().entrada.presionar(evento.key)
             
-            elif self.estado == "tutorial":
-                accion = self.tutorial.manejar_evento(evento)
-                if accion == "menu":
-                    self.estado = "menu"
+            # Si la ventana se muestra de nuevo hay que repintarla entera
+            elif evento.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED):
+                self.pantalla_actual().invalidar()
+        return eventos
     
     def actualizar(self):
         """
-        Actualiza la logica del juego
+        Actualiza la logica del juego: ejecuta los temporizadores vencidos
+        
+        Returns:
+            Cantidad de temporizadores ejecutados
         """
-        if self.estado == "juego":
-            self.juego.actualizar()
+        return self.planificador.procesar()
     
     def dibujar(self):
         """
         Dibuja el estado actual del juego
         """
-        # Dibujar segun el estado actual
-        if self.estado == "menu":
-            self.menu.dibujar(self.pantalla)
-        elif self.estado == "juego":
-            self.juego.dibujar(self.pantalla)
-        elif self.estado == "tutorial":
-            self.tutorial.dibujar(self.pantalla)
+        # Dibujar segun el estado actual; cada pantalla reporta lo que cambio
+        inicio = perf_counter()
+        rects = self.pantalla_actual().dibujar(self.pantalla)
+        self.instrumentacion.registrar_pantalla(self.estado, perf_counter() - inicio)
+        
+        # El panel de rendimiento va encima de todo
+        rect_overlay = self.overlay.dibujar(self.pantalla)
+        if rect_overlay is not None:
+            rects.append(rect_overlay)
+        
+        # Actualizar solo las regiones modificadas; una sola region se pasa sin la
+        # lista, porque con una lista de un elemento pygame asigna memoria al leerla
+        if len(rects) == 1:
+            pygame.display.update(rects[0])
+        elif rects:
+            pygame.display.update(rects)
+    
+    def esperar(self):
+        """
+        Espera hasta el proximo cuadro segun lo que pide la pantalla actual:
+        a ritmo completo si hay animaciones; si no, bloqueado hasta que llegue un
+        evento, el proximo temporizador o el refresco del panel de rendimiento
+        """
+        # Nunca mas rapido que FPS, aunque lleguen muchos eventos seguidos
+        self.reloj.tick(FPS)
+        
+        pantalla = self.pantalla_actual()
+        fps = pantalla.fps_objetivo()
+        if fps >= FPS:
+            return
+        
+        espera = 1000 // fps if fps else ESPERA_MAXIMA_MS
+        if self.reloj_cuadro is not None:
+            self.reloj_cuadro.medir()
+        proximo = self.planificador.proximo()
+        if proximo is not None:
+            espera = min(espera, math.ceil(proximo * 1000))
+        if self.overlay.visible:
+            espera = min(espera, self.overlay.intervalo_ms)
         
-        # Actualizar pantalla
-        pygame.display.flip()
+        if espera > 0:
+            evento = pygame.event.wait(espera)
+            if evento.type != pygame.NOEVENT:
+                self.eventos_pendientes.append(evento)
+    
+    def registrar_primer_cuadro(self):
+        """
+        Completa los tiempos de arranque al terminar el primer cuadro
+        """
+        self.arranque["primer_cuadro"] = perf_counter() - self.inicio_primer_cuadro
+        self.instrumentacion.arranque = self.arranque
+        if self.mostrar_arranque:
+            print(self.reporte_arranque(), file=sys.stderr)
+    
+    def reporte_arranque(self):
+        """
+        Retorna los tiempos de arranque como texto
+        """
+        partes = [f"{fase} {segundos * 1000:.1f} ms" for fase, segundos in self.arranque.items()
+                  if segundos is not None]
+        total = sum(s for s in self.arranque.values() if s is not None)
+        return "arranque: " + ", ".join(partes) + f" (total {total * 1000:.1f} ms)"
     
     def ejecutar(self):
         """
         Loop principal del juego
         """
         while self.ejecutando:
+            t0 = perf_counter()
+            if self.reloj_cuadro is not None:
+                self.reloj_cuadro.medir()
+            
             # Manejar eventos
-            self.manejar_eventos()
+            eventos = self.manejar_eventos()
+            t1 = perf_counter()
             
             # Actualizar logica
-            self.actualizar()
+            ejecutados = self.actualizar()
+            t2 = perf_counter()
+            
+            # Solo se graban los cuadros en que paso algo
+            if self.grabador is not None and (eventos or ejecutados):
+                self.grabador.cuadro(eventos)
+                self.grabador.observar(self)
             
             # Dibujar
             self.dibujar()
+            t3 = perf_counter()
+            
+            if self.arranque["primer_cuadro"] is None:
+                self.registrar_primer_cuadro()
+            
+            # Esperar al proximo cuadro
+            self.esperar()
             
-            # Controlar FPS
-            self.reloj.tick(FPS)
+            self.instrumentacion.registrar_cuadro(t1 - t0, t2 - t1, t3 - t2, perf_counter() - t3)
         
-        # Salir del juego
-        pygame.quit()
+        self.cerrar()
         sys.exit()
+    
+    def cerrar(self):
+        """
+        Libera todo antes de salir; el hilo de preguntas usa pygame
+        """
+        if "juego" in self.pantallas:
+            # Una partida en curso al cerrar la ventana tambien guarda su puntaje
+            self.juego.partida.terminar()
+            self.juego.cola_preguntas.detener()
+        if self.grabador is not None:
+            self.grabador.cerrar()
+        if self.analitica is not None:
+            self.analitica.cerrar()
+        self.instrumentacion.cerrar()
+        pygame.quit()
 
 
 # Punto de entrada del programa
 if __name__ == "__main__":
-    juego = JuegoSetZero()
+    parser = argparse.ArgumentParser(description=TITULO)
+    parser.add_argument("--perf", action="store_true",
+                        help="mostrar el panel de rendimiento desde el inicio (F3 lo alterna)")
+    parser.add_argument("--perf-csv", help="guardar los tiempos de cada cuadro en un archivo CSV")
+    parser.add_argument("--dificultad", choices=["facil", "media", "dificil", "adaptativa"],
+                        help="elegir preguntas de ese nivel del indice precalculado, o "
+                             "adaptarlas a las respuestas del jugador")
+    parser.add_argument("--arranque", action="store_true",
+                        help="mostrar cuanto tardan la importacion, la inicializacion y el primer cuadro")
+    parser.add_argument("--semilla", type=int, help="semilla de las preguntas")
+    parser.add_argument("--grabar", metavar="ARCHIVO", help="grabar la partida para reproducirla despues")
+    parser.add_argument("--reproducir", metavar="ARCHIVO",
+                        help="repetir una partida grabada y verificar preguntas y puntaje")
+    parser.add_argument("--analitica", metavar="ARCHIVO", default=ruta_analitica_por_defecto(),
+                        help="registro de respuestas y puntajes (se resume con analitica.py)")
+    parser.add_argument("--sin-analitica", action="store_true",
+                        help="no registrar respuestas ni puntajes")
+    parser.add_argument("--tiempo-real", action="store_true",
+                        help="con --reproducir, mostrar la partida a la velocidad original")
+    args = parser.parse_args()
+    
+    if args.reproducir:
+        grabacion = Grabacion.cargar(args.reproducir)
+        if not args.tiempo_real:
+            # Sin ventana y sin esperas: solo importa el resultado
+            os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        juego = JuegoSetZero(dificultad=grabacion.dificultad, reloj=RelojSimulado(),
+                             semilla=grabacion.semilla)
+        resultado = reproducir(juego, grabacion, tiempo_real=args.tiempo_real,
+                               dibujar=args.tiempo_real)
+        juego.cerrar()
+        print(f"{resultado['cuadros']} cuadros, {resultado['preguntas']} preguntas, "
+              f"{resultado['puntos']} puntos: "
+              + ("coincide con la grabacion" if resultado["coincide"] else resultado["diferencia"]))
+        sys.exit(0 if resultado["coincide"] else 1)
+    
+    juego = JuegoSetZero(ruta_csv_rendimiento=args.perf_csv, dificultad=args.dificultad,
+                         semilla=args.semilla, ruta_grabacion=args.grabar,
+                         ruta_analitica=None if args.sin_analitica else args.analitica)
+    juego.mostrar_arranque = args.arranque
+    if args.perf:
+        juego.overlay.alternar()
     juego.ejecutar()
\ No newline at end of file
@@ -0,0 +1,127 @@
+import random
+from array import array
+
+# Tabla de alias (metodo de Vose) para elegir un indice segun pesos en O(1)
+class TablaAlias:
+    def __init__(self, pesos):
+        """
+        Construye la tabla en O(n)
+
+        Args:
+            pesos: Pesos no negativos, al menos uno mayor que cero
+        """
+        n = len(pesos)
+        total = float(sum(pesos))
+        if n == 0 or total <= 0:
+            raise ValueError("se necesita al menos un peso positivo")
+
+        self.n = n
+        self.probabilidad = array("d", bytes(8 * n))
+        self.alias = array("l", bytes(array("l").itemsize * n))
+
+        escalados = [p * n / total for p in pesos]
+        pequeños = [i for i, p in enumerate(escalados) if p < 1.0]
+        grandes = [i for i, p in enumerate(escalados) if p >= 1.0]
+
+        while pequeños and grandes:
+            chico = pequeños.pop()
+            grande = grandes[-1]
+            self.probabilidad[chico] = escalados[chico]
+            self.alias[chico] = grande
+            escalados[grande] -= 1.0 - escalados[chico]
+            if escalados[grande] < 1.0:
+                grandes.pop()
+                pequeños.append(grande)
+
+        # Lo que queda tiene probabilidad 1 (salvo error de redondeo)
+        for i in grandes + pequeños:
+            self.probabilidad[i] = 1.0
+            self.alias[i] = i
+
+    def elegir(self, rng=random):
+        """
+        Retorna un indice con probabilidad proporcional a su peso
+
+        Args:
+            rng: Fuente de numeros aleatorios con random()
+        """
+        x = rng.random() * self.n
+        i = int(x)
+        if x - i < self.probabilidad[i]:
+            return i
+        return self.alias[i]
+
+
+# Tabla de alias con pesos que cambian: actualizar un peso es O(1) y la tabla
+# se reconstruye solo cuando los pesos se alejaron mucho de los que uso al armarse
+class TablaAliasDinamica:
+    def __init__(self, pesos, desvio_maximo=2.0):
+        """
+        Args:
+            pesos: Pesos iniciales, todos mayores que cero
+            desvio_maximo: Intentos esperados por eleccion a partir de los cuales
+                se reconstruye la tabla (mayor: menos reconstrucciones, mas rechazos)
+
+        Raises:
+            ValueError si algun peso no es positivo
+        """
+        if not pesos or min(pesos) <= 0:
+            raise ValueError("todos los pesos deben ser positivos")
+        self.pesos = array("d", pesos)
+        self.desvio_maximo = desvio_maximo
+        self.reconstrucciones = 0
+        self.reconstruir()
+
+    def reconstruir(self):
+        """
+        Arma la tabla de alias con los pesos actuales, en O(n)
+        """
+        self.tabla = TablaAlias(self.pesos)
+        # Pesos con los que se armo la tabla y sus totales
+        self.pesos_tabla = array("d", self.pesos)
+        self.total_tabla = self.total = sum(self.pesos)
+        # Cota del cociente peso / peso_tabla; solo sube hasta la proxima reconstruccion
+        self.cociente_maximo = 1.0
+        self.reconstrucciones += 1
+
+    def actualizar(self, i, peso):
+        """
+        Cambia el peso de un indice en O(1)
+
+        Args:
+            i: Indice
+            peso: Peso nuevo, mayor que cero
+
+        Raises:
+            ValueError si el peso no es positivo
+        """
+        if peso <= 0:
+            raise ValueError("el peso debe ser positivo")
+        self.total += peso - self.pesos[i]
+        self.pesos[i] = peso
+        cociente = peso / self.pesos_tabla[i]
+        if cociente > self.cociente_maximo:
+            self.cociente_maximo = cociente
+
+    def intentos_esperados(self):
+        """
+        Retorna cuantas veces se espera usar la tabla vieja por cada eleccion
+        """
+        return self.cociente_maximo * self.total_tabla / self.total
+
+    def elegir(self, rng=random):
+        """
+        Retorna un indice con probabilidad proporcional a su peso actual
+
+        Elige con la tabla vieja y acepta con probabilidad (peso / peso_tabla) /
+        cociente_maximo, lo que corrige la diferencia entre los dos pesos
+
+        Args:
+            rng: Fuente de numeros aleatorios con random()
+        """
+        if self.intentos_esperados() > self.desvio_maximo:
+            self.reconstruir()
+        while True:
+            i = self.tabla.elegir(rng)
+            if rng.random() * self.cociente_maximo * self.pesos_tabla[i] < self.pesos[i]:
+                return i
@@ -1,5 +1,14 @@
 import pygame
-from componentes import Boton, GeneradorConjuntos, dibujar_texto, dibujar_conjunto, dibujar_diagrama_venn
+import random
+from componentes import (Boton, CapasEstaticas, GeneradorConjuntos, dibujar_texto,
+                         dibujar_conjunto, dibujar_diagrama_venn, redibujar_botones)
+from texto import motor_texto
+from preguntas import ColaPreguntas
+from indice import IndicePreguntas
+from entrada import MapaEntrada
+from temporizador import Planificador
+from logica import Partida, TIEMPO_LIMITE
+from adaptativo import MotorAdaptativo
 
 # Colores globales
 BLANCO = (255, 255, 255)
@@ -11,6 +20,11 @@ GRIS = (200, 200, 200)
 VERDE = (0, 200, 0)
 ROJO = (200, 0, 0)
 
+# Cuadros por segundo que pide cada pantalla segun lo que esta cambiando;
+# una pantalla con animaciones pediria el maximo del loop principal
+FPS_TEMPORIZADOR = 1  # solo cambia el reloj de la partida
+FPS_INACTIVO = 0      # nada cambia hasta el proximo evento
+
 class Menu:
     def __init__(self, ancho, alto):
         """
@@ -44,63 +58,118 @@ class Menu:
             "SALIR", BLANCO, GRIS_CLARO, MORADO
         )
         
-    def dibujar(self, pantalla):
+        self.botones = [self.boton_jugar, self.boton_tutorial, self.boton_salir]
+        
+        # Funcion (destino) para cambiar de pantalla; la asigna JuegoSetZero
+        self.navegar = None
+        
+        # Funciones de cada boton
+        self.entrada = MapaEntrada()
+        self.entrada.boton(self.boton_jugar, lambda: self.navegar("juego"))
+        self.entrada.boton(self.boton_tutorial, lambda: self.navegar("tutorial"))
+        self.entrada.boton(self.boton_salir, lambda: self.navegar("salir"))
+        
+        # Fondo estatico de la pantalla
+        self.capas = CapasEstaticas()
+        
+        # Si es True, el siguiente cuadro redibuja la pantalla completa
+        self.redibujo_completo = True
+        
+    def invalidar(self):
         """
-        Dibuja el menu principal en la pantalla
+        Fuerza a redibujar la pantalla completa en el siguiente cuadro
+        """
+        self.redibujo_completo = True
+    
+    def fps_objetivo(self):
+        """
+        Cuadros por segundo que necesita la pantalla; el menu solo cambia con eventos
+        """
+        return FPS_INACTIVO
+        
+    def construir_fondo(self, capa):
+        """
+        Dibuja el contenido que no cambia del menu
         """
         # Fondo blanco
-        pantalla.fill(BLANCO)
+        capa.fill(BLANCO)
         
         # Titulo del juego
-        dibujar_texto(pantalla, "SET-ZERO", self.ancho // 2, 150, 100, MORADO)
+        dibujar_texto(capa, "SET-ZERO", self.ancho // 2, 150, 100, MORADO)
         
         # Subtitulo
-        dibujar_texto(pantalla, "Domina la Teoria de Conjuntos", 
+        dibujar_texto(capa, "Domina la Teoria de Conjuntos", 
                      self.ancho // 2, 220, 28, GRIS)
         
-        # Dibujar botones
-        self.boton_jugar.dibujar(pantalla)
-        self.boton_tutorial.dibujar(pantalla)
-        self.boton_salir.dibujar(pantalla)
-        
-    def manejar_evento(self, evento):
+    def dibujar(self, pantalla):
         """
-        Maneja los eventos del menu
+        Dibuja el menu principal en la pantalla
         
         Returns:
-            String indicando la accion: 'jugar', 'tutorial', 'salir', o None
-        """
-        if self.boton_jugar.click(evento):
-            return "jugar"
-        elif self.boton_tutorial.click(evento):
-            return "tutorial"
-        elif self.boton_salir.click(evento):
-            return "salir"
-        return None
+            Lista de rectangulos de la pantalla que cambiaron
+        """
+        mouse_pos = pygame.mouse.get_pos()
+        fondo = self.capas.obtener(pantalla, "menu", self.construir_fondo)
+        
+        if not self.redibujo_completo:
+            # Solo pueden cambiar los botones al pasar el mouse
+            rects = []
+            redibujar_botones(pantalla, self.botones, mouse_pos, fondo, rects)
+            return rects
+        
+        self.redibujo_completo = False
+        pantalla.blit(fondo, (0, 0))
+        
+        # Dibujar botones con una sola consulta del mouse
+        for boton in self.botones:
+            boton.dibujar(pantalla, mouse_pos)
+        
+        return [pantalla.get_rect()]
 
 class Juego:
-    def __init__(self, ancho, alto):
+    def __init__(self, ancho, alto, dificultad=None, planificador=None, semilla=None,
+                 analitica=None):
         """
         Inicializa el juego Set Battle
         
         Args:
             ancho: Ancho de la pantalla
             alto: Alto de la pantalla
+            dificultad: 'facil', 'media' o 'dificil' para elegir preguntas del indice
+                precalculado (sin respuestas vacias); 'adaptativa' para que la operacion
+                y los tamaños sigan las respuestas del jugador; None genera al azar
+            planificador: Planificador que ejecuta los temporizadores de la partida;
+                quien lo crea es responsable de llamar a procesar()
+            semilla: Si no es None, las preguntas salen de random.Random(semilla) en
+                un orden fijo, para poder grabar y reproducir la partida
+            analitica: RegistroAnalitica donde se anotan las respuestas y el puntaje
+                final de cada partida, o None
         """
         self.ancho = ancho
         self.alto = alto
-        self.generador = GeneradorConjuntos()
-        self.puntos = 0
-        self.tiempo_restante = 15
-        self.tiempo_inicio = None
-        self.pregunta_actual = None
-        self.juego_activo = False
-        
-        # Variables para feedback visual
-        self.respuesta_seleccionada = None
-        self.es_correcta = None
-        self.tiempo_feedback = 0
-        self.mostrando_feedback = False
+        self.semilla = semilla
+        self.generador = GeneradorConjuntos(random.Random(semilla) if semilla is not None else None)
+        # Estadisticas del jugador; duran mientras exista la pantalla, entre partidas
+        self.adaptativo = None
+        if dificultad == "adaptativa":
+            self.adaptativo = MotorAdaptativo()
+            self.generador.usar_adaptativo(self.adaptativo)
+        elif dificultad is not None:
+            indice = IndicePreguntas.cargar_o_construir()
+            self.generador.usar_muestreador(indice.muestreador(dificultad=dificultad, sin_vacias=True))
+        
+        # Reglas de la partida (tiempo, feedback, puntaje); esta clase solo la muestra
+        self.planificador = planificador if planificador is not None else Planificador()
+        self.partida = Partida(self.siguiente_pregunta, self.planificador,
+                               adaptativo=self.adaptativo)
+        self.partida.al_nueva_pregunta = self.mostrar_pregunta
+        self.partida.al_responder = self.mostrar_respuesta
+        self.partida.al_vencer = self.pregunta_vencida
+        self.partida.al_terminar = self.partida_terminada
+        
+        # Registro de respuestas y puntajes, e identificador de la partida en curso
+        self.analitica = analitica
+        self.id_partida = 0
         
         # Crear boton de volver
         self.boton_volver = Boton(
@@ -112,6 +181,79 @@ class Juego:
         self.botones_respuesta = []
         self.crear_botones_respuesta()
         
+        # Botones visibles con y sin pregunta, en el orden en que se dibujan; Volver
+        # se superpone con la tercera respuesta, asi que se redibujan juntos
+        self.botones_pregunta = self.botones_respuesta + [self.boton_volver]
+        self.botones_inicio = [self.boton_volver]
+        
+        # Funcion (destino) para cambiar de pantalla; la asigna JuegoSetZero
+        self.navegar = None
+        
+        # Funciones de cada boton y tecla
+        self.entrada = MapaEntrada()
+        self.entrada.boton(self.boton_volver, self.volver)
+        self.entrada.tecla(pygame.K_SPACE, self.comenzar)
+        for i, boton in enumerate(self.botones_respuesta):
+            self.entrada.boton(boton, lambda i=i: self.responder(i))
+        
+        # Preguntas preparadas en segundo plano; el hilo arma los textos de las
+        # opciones con un atlas creado aca, sin usar la fuente compartida
+        boton = self.botones_respuesta[0]
+        self.atlas_opciones = motor_texto.atlas(boton.tamaño_fuente, boton.color_texto)
+        # Con el motor adaptativo una pregunta preparada de antemano no conoce las
+        # ultimas respuestas: se prepara una sola, o ninguna si hay semilla (al
+        # reproducir la partida las preguntas tienen que salir iguales)
+        capacidad = 4
+        if self.adaptativo is not None:
+            capacidad = 0 if semilla is not None else 1
+        self.cola_preguntas = ColaPreguntas(self.generador, self.preparar_pregunta, capacidad,
+                                            en_orden=semilla is not None)
+        # Superficies de los botones para la pregunta que entrega siguiente_pregunta
+        self.superficies_pregunta = None
+        
+        # Regiones del encabezado y ultimos valores dibujados en ellas
+        self.rect_tiempo = pygame.Rect(50, 30, 200, 60)
+        self.rect_puntos = pygame.Rect(ancho - 250, 30, 200, 60)
+        self.tiempo_dibujado = None
+        self.puntos_dibujados = None
+        
+        # Textos ya formateados; se arman solo cuando cambia su valor
+        self.textos_tiempo = [f"Tiempo: {segundos}s" for segundos in range(TIEMPO_LIMITE + 1)]
+        self.texto_puntos = f"Puntos: {self.partida.puntos}"
+        
+        # El reloj cambia cada segundo: sus textos se renderizan y ubican una sola vez,
+        # asi el cuadro de cada segundo solo copia una superficie
+        fuente_tiempo = motor_texto.fuente(32)
+        self.relojes = []
+        for texto in self.textos_tiempo:
+            superficie = fuente_tiempo.render(texto, True, BLANCO)
+            self.relojes.append((superficie, superficie.get_rect(center=self.rect_tiempo.center)))
+        
+        # Posicion del mouse con la que se revisaron los botones por ultima vez;
+        # None obliga a revisarlos en el proximo cuadro
+        self.mouse_revisado = None
+        
+        # Fondos estaticos: pantalla de inicio y partida en curso
+        self.capas = CapasEstaticas()
+        
+        # Si es True, el siguiente cuadro redibuja la pantalla completa
+        self.redibujo_completo = True
+        
+    def invalidar(self):
+        """
+        Fuerza a redibujar la pantalla completa en el siguiente cuadro
+        """
+        self.redibujo_completo = True
+    
+    def fps_objetivo(self):
+        """
+        Cuadros por segundo que necesita la pantalla; durante la partida
+        solo cambia el reloj, una vez por segundo
+        """
+        if self.partida.activa:
+            return FPS_TEMPORIZADOR
+        return FPS_INACTIVO
+        
     def crear_botones_respuesta(self):
         """
         Crea los 4 botones para las opciones de respuesta
@@ -139,109 +281,182 @@ class Juego:
         """
         Inicia una nueva partida
         """
-        self.juego_activo = True
-        self.puntos = 0
-        self.nueva_pregunta()
+        self.cola_preguntas.iniciar()
+        if self.analitica is not None:
+            self.id_partida = self.analitica.nueva_partida()
+        self.partida.iniciar()
+        self.actualizar_texto_puntos()
         
-    def nueva_pregunta(self):
-        """
-        Genera una nueva pregunta y reinicia el temporizador
+    def preparar_pregunta(self, pregunta, en_hilo):
         """
-        self.pregunta_actual = self.generador.generar_pregunta()
-        self.tiempo_inicio = pygame.time.get_ticks()
-        self.tiempo_restante = 15
+        Renderiza por adelantado los botones de respuesta de una pregunta
         
-        # Resetear feedback
-        self.mostrando_feedback = False
-        self.respuesta_seleccionada = None
-        self.es_correcta = None
-        
-        # Actualizar texto de los botones con las opciones
-        for i, opcion in enumerate(self.pregunta_actual["opciones"]):
-            elementos = sorted(list(opcion))
-            texto = "{" + ", ".join(map(str, elementos)) + "}"
-            self.botones_respuesta[i].texto = texto
+        Args:
+            pregunta: Pregunta generada
+            en_hilo: True si se llama desde el hilo productor; el atlas ya tiene
+                todos los caracteres de un conjunto, asi que no cambia nada
             
-    def actualizar(self):
+        Returns:
+            Lista con las superficies de cada boton de respuesta
         """
-        Actualiza el estado del juego (temporizador y feedback)
+        return [
+            boton.preparar(texto, self.atlas_opciones)
+            for boton, texto in zip(self.botones_respuesta, pregunta.textos_opciones)
+        ]
+        
+    def siguiente_pregunta(self):
         """
-        if self.juego_activo and self.tiempo_inicio:
-            tiempo_actual = pygame.time.get_ticks()
-            tiempo_transcurrido = (tiempo_actual - self.tiempo_inicio) // 1000
-            self.tiempo_restante = 15 - tiempo_transcurrido
-            
-            # Si se acaba el tiempo, generar nueva pregunta
-            if self.tiempo_restante <= 0:
-                self.nueva_pregunta()
-            
-            # Manejar feedback visual (mostrar por 1 segundo)
-            if self.mostrando_feedback:
-                tiempo_desde_feedback = tiempo_actual - self.tiempo_feedback
-                if tiempo_desde_feedback > 1000:  # 1 segundo
-                    self.mostrando_feedback = False
-                    self.respuesta_seleccionada = None
-                    self.es_correcta = None
-                    self.nueva_pregunta()
+        Entrega a la partida la proxima pregunta de la cola y guarda sus botones ya renderizados
+        """
+        pregunta, self.superficies_pregunta = self.cola_preguntas.siguiente()
+        return pregunta
     
-    def verificar_respuesta(self, indice_boton):
+    def mostrar_pregunta(self, pregunta):
         """
-        Verifica si la respuesta seleccionada es correcta
-        
-        Args:
-            indice_boton: Indice del boton clickeado (0-3)
+        La partida paso a otra pregunta: poner sus opciones en los botones
         """
-        opcion_seleccionada = self.pregunta_actual["opciones"][indice_boton]
-        respuesta_correcta = self.pregunta_actual["respuesta_correcta"]
+        for boton, texto, superficie in zip(self.botones_respuesta, pregunta.textos_opciones,
+                                            self.superficies_pregunta):
+            boton.asignar(texto, superficie)
+            boton.feedback = None
         
-        # Guardar que boton fue clickeado
-        self.respuesta_seleccionada = indice_boton
+        # La pregunta cambia casi toda la pantalla
+        self.invalidar()
+    
+    def mostrar_respuesta(self, indice_boton, es_correcta):
+        """
+        La partida verifico una respuesta: pintar el boton y actualizar el puntaje
+        """
+        self.botones_respuesta[indice_boton].feedback = es_correcta
+        self.mouse_revisado = None
+        self.actualizar_texto_puntos()
+        
+        partida = self.partida
+        if self.analitica is not None:
+            self.analitica.respuesta(self.id_partida, partida.pregunta, indice_boton, es_correcta,
+                                     partida.tiempo_respuesta, partida.puntos)
+    
+    def pregunta_vencida(self, pregunta):
+        """
+        La partida paso a otra pregunta porque se acabo el tiempo
+        """
+        if self.analitica is not None:
+            self.analitica.vencida(self.id_partida, pregunta, self.partida.tiempo_limite,
+                                   self.partida.puntos)
+    
+    def partida_terminada(self):
+        """
+        La partida termino (volver al menu o cerrar la ventana): guardar el puntaje
+        """
+        if self.analitica is not None:
+            self.analitica.fin(self.id_partida, self.partida.puntos, self.partida.duracion())
+    
+    def actualizar_texto_puntos(self):
+        """
+        Arma el texto del puntaje; solo se llama cuando puede haber cambiado
+        """
+        self.texto_puntos = f"Puntos: {self.partida.puntos}"
+    
+    def construir_fondo_inicio(self, capa):
+        """
+        Dibuja la pantalla de inicio del juego
+        """
+        capa.fill(BLANCO)
+        dibujar_texto(capa, "SET BATTLE", self.ancho // 2, 200, 80, MORADO)
+        dibujar_texto(capa, "Presiona ESPACIO para comenzar", 
+                     self.ancho // 2, 300, 36, GRIS)
+    
+    def construir_fondo_partida(self, capa):
+        """
+        Dibuja lo que no cambia entre preguntas: cajas del encabezado y area de pregunta
+        """
+        capa.fill(BLANCO)
         
-        # Verificar si es correcta
-        if opcion_seleccionada == respuesta_correcta:
-            self.es_correcta = True
-            self.puntos += 10
-        else:
-            self.es_correcta = False
+        # Cajas de tiempo y puntos
+        pygame.draw.rect(capa, MORADO, self.rect_tiempo, border_radius=12)
+        pygame.draw.rect(capa, MORADO, self.rect_puntos, border_radius=12)
         
-        # Activar feedback visual
-        self.mostrando_feedback = True
-        self.tiempo_feedback = pygame.time.get_ticks()
+        # Area de pregunta
+        pygame.draw.rect(capa, GRIS_CLARO, (100, 120, self.ancho - 200, 300), border_radius=15)
+    
+    def dibujar_tiempo(self, pantalla, fondo):
+        """
+        Dibuja la caja del temporizador
+        """
+        pantalla.blit(fondo, self.rect_tiempo, self.rect_tiempo)
+        superficie, rect = self.relojes[self.partida.tiempo_restante]
+        pantalla.blit(superficie, rect)
+        self.tiempo_dibujado = self.partida.tiempo_restante
+    
+    def dibujar_puntos(self, pantalla, fondo):
+        """
+        Dibuja la caja de puntos
+        """
+        pantalla.blit(fondo, self.rect_puntos, self.rect_puntos)
+        dibujar_texto(pantalla, self.texto_puntos,
+                      self.rect_puntos.centerx, self.rect_puntos.centery, 32, BLANCO)
+        self.puntos_dibujados = self.partida.puntos
     
     def dibujar(self, pantalla):
         """
         Dibuja el juego en la pantalla
-        """
-        # Fondo blanco
-        pantalla.fill(BLANCO)
         
-        if not self.juego_activo or not self.pregunta_actual:
+        Returns:
+            Lista de rectangulos de la pantalla que cambiaron
+        """
+        mouse_pos = pygame.mouse.get_pos()
+        partida = self.partida
+        en_pregunta = partida.activa and partida.pregunta
+        
+        # Cuadro sin cambios: no se toca la pantalla ni se asigna memoria
+        if (not self.redibujo_completo and mouse_pos == self.mouse_revisado and
+                (not en_pregunta or (partida.tiempo_restante == self.tiempo_dibujado and
+                                     partida.puntos == self.puntos_dibujados))):
+            return []
+        
+        if en_pregunta:
+            fondo = self.capas.obtener(pantalla, "partida", self.construir_fondo_partida)
+        else:
+            fondo = self.capas.obtener(pantalla, "inicio", self.construir_fondo_inicio)
+        
+        if not self.redibujo_completo:
+            # Solo redibujar las regiones cuyo contenido cambio
+            rects = []
+            if en_pregunta:
+                if partida.tiempo_restante != self.tiempo_dibujado:
+                    self.dibujar_tiempo(pantalla, fondo)
+                    rects.append(self.rect_tiempo)
+                if partida.puntos != self.puntos_dibujados:
+                    self.dibujar_puntos(pantalla, fondo)
+                    rects.append(self.rect_puntos)
+            
+            # Los botones solo cambian si se movio el mouse o empezo el feedback
+            if mouse_pos != self.mouse_revisado:
+                botones = self.botones_pregunta if en_pregunta else self.botones_inicio
+                redibujar_botones(pantalla, botones, mouse_pos, fondo, rects)
+                self.mouse_revisado = mouse_pos
+            return rects
+        
+        self.redibujo_completo = False
+        self.mouse_revisado = mouse_pos
+        pantalla.blit(fondo, (0, 0))
+        
+        if not en_pregunta:
             # Pantalla de inicio del juego
-            dibujar_texto(pantalla, "SET BATTLE", self.ancho // 2, 200, 80, MORADO)
-            dibujar_texto(pantalla, "Presiona ESPACIO para comenzar", 
-                         self.ancho // 2, 300, 36, GRIS)
-            self.boton_volver.dibujar(pantalla)
-            return
+            self.boton_volver.dibujar(pantalla, mouse_pos)
+            return [pantalla.get_rect()]
         
         # Dibujar encabezado con tiempo y puntos
-        # Caja de tiempo
-        pygame.draw.rect(pantalla, MORADO, (50, 30, 200, 60), border_radius=12)
-        dibujar_texto(pantalla, f"Tiempo: {self.tiempo_restante}s", 150, 60, 32, BLANCO)
-        
-        # Caja de puntos
-        pygame.draw.rect(pantalla, MORADO, (self.ancho - 250, 30, 200, 60), border_radius=12)
-        dibujar_texto(pantalla, f"Puntos: {self.puntos}", self.ancho - 150, 60, 32, BLANCO)
-        
-        # Area de pregunta
-        pygame.draw.rect(pantalla, GRIS_CLARO, (100, 120, self.ancho - 200, 300), border_radius=15)
+        self.dibujar_tiempo(pantalla, fondo)
+        self.dibujar_puntos(pantalla, fondo)
         
-        # Texto de la pregunta
-        pregunta_texto = f"Cual es el resultado de A {self.pregunta_actual['simbolo']} B?"
-        dibujar_texto(pantalla, pregunta_texto, self.ancho // 2, 160, 36, NEGRO)
+        # Texto de la pregunta; si no entra en una linea se reparte en varias
+        bloque = motor_texto.diagramar(partida.pregunta.texto, 36, self.ancho - 200)
+        bloque.dibujar(pantalla, self.ancho // 2, 160, NEGRO, centrado=True)
         
         # Dibujar conjuntos
-        conjunto_a = self.pregunta_actual["conjunto_a"]
-        conjunto_b = self.pregunta_actual["conjunto_b"]
+        conjunto_a = partida.pregunta.conjunto_a
+        conjunto_b = partida.pregunta.conjunto_b
         
         dibujar_conjunto(pantalla, conjunto_a, 150, 200, 250, 100, "A", MORADO)
         dibujar_conjunto(pantalla, conjunto_b, self.ancho - 400, 200, 250, 100, "B", MORADO_OSCURO)
@@ -250,50 +465,36 @@ class Juego:
         dibujar_diagrama_venn(pantalla, self.ancho // 2, 280, conjunto_a, conjunto_b)
         
         # Dibujar botones de respuesta con colores segun feedback
-        for i, boton in enumerate(self.botones_respuesta):
-            # Si esta mostrando feedback y es este boton
-            if self.mostrando_feedback and i == self.respuesta_seleccionada:
-                # Cambiar color segun si es correcta o no
-                if self.es_correcta:
-                    boton.color = VERDE
-                    boton.color_hover = VERDE
-                else:
-                    boton.color = ROJO
-                    boton.color_hover = ROJO
-            else:
-                # Colores normales
-                boton.color = BLANCO
-                boton.color_hover = GRIS_CLARO
-            
-            boton.dibujar(pantalla)
+        for boton in self.botones_respuesta:
+            boton.dibujar(pantalla, mouse_pos)
         
         # Boton volver
-        self.boton_volver.dibujar(pantalla)
+        self.boton_volver.dibujar(pantalla, mouse_pos)
+        
+        return [pantalla.get_rect()]
+    
+    def volver(self):
+        """
+        Termina la partida y vuelve al menu
+        """
+        self.partida.terminar()
+        self.navegar("menu")
+    
+    def comenzar(self):
+        """
+        Inicia una partida con ESPACIO, si no hay una en curso
+        """
+        if not self.partida.activa:
+            self.iniciar_juego()
     
-    def manejar_evento(self, evento):
+    def responder(self, indice_boton):
         """
-        Maneja los eventos del juego
+        Click en un boton de respuesta; se ignora si no hay pregunta o se esta mostrando feedback
         
-        Returns:
-            String indicando la accion o None
+        Args:
+            indice_boton: Indice del boton clickeado (0-3)
         """
-        # Boton volver
-        if self.boton_volver.click(evento):
-            self.juego_activo = False
-            return "menu"
-        
-        # Iniciar juego con ESPACIO
-        if evento.type == pygame.KEYDOWN and evento.key == pygame.K_SPACE:
-            if not self.juego_activo:
-                self.iniciar_juego()
-        
-        # Verificar clicks en botones de respuesta solo si no esta mostrando feedback
-        if self.juego_activo and self.pregunta_actual and not self.mostrando_feedback:
-            for i, boton in enumerate(self.botones_respuesta):
-                if boton.click(evento):
-                    self.verificar_respuesta(i)
-        
-        return None
+        self.partida.responder(indice_boton)
 
 class Tutorial:
     def __init__(self, ancho, alto):
@@ -352,6 +553,12 @@ class Tutorial:
             }
         ]
         
+        # Las descripciones se reparten en lineas una sola vez
+        self.descripciones = [
+            motor_texto.diagramar(concepto["descripcion"], 28, ancho - 300, 30)
+            for concepto in self.conceptos
+        ]
+        
         # Crear botones de navegacion
         self.boton_volver = Boton(
             50, alto - 80, 200, 50,
@@ -367,113 +574,129 @@ class Tutorial:
             ancho // 2 + 20, alto - 80, 200, 50,
             "SIGUIENTE", MORADO, MORADO_OSCURO, BLANCO
         )
+        
+        # Funcion (destino) para cambiar de pantalla; la asigna JuegoSetZero
+        self.navegar = None
+        
+        # Funciones de cada boton
+        self.entrada = MapaEntrada()
+        self.entrada.boton(self.boton_volver, lambda: self.navegar("menu"))
+        self.entrada.boton(self.boton_anterior, self.pagina_anterior)
+        self.entrada.boton(self.boton_siguiente, self.pagina_siguiente)
+        
+        # Un fondo estatico por pagina
+        self.capas = CapasEstaticas()
+        
+        # Si es True, el siguiente cuadro redibuja la pantalla completa
+        self.redibujo_completo = True
     
-    def dibujar(self, pantalla):
+    def invalidar(self):
         """
-        Dibuja el tutorial en la pantalla
+        Fuerza a redibujar la pantalla completa en el siguiente cuadro
+        """
+        self.redibujo_completo = True
+    
+    def fps_objetivo(self):
+        """
+        Cuadros por segundo que necesita la pantalla; el tutorial solo cambia con eventos
+        """
+        return FPS_INACTIVO
+    
+    def botones_visibles(self):
+        """
+        Retorna los botones que se muestran en la pagina actual
+        """
+        botones = [self.boton_volver]
+        
+        # Solo mostrar boton anterior si no estamos en la primera pagina
+        if self.pagina_actual > 0:
+            botones.append(self.boton_anterior)
+        
+        # Solo mostrar boton siguiente si no estamos en la ultima pagina
+        if self.pagina_actual < len(self.conceptos) - 1:
+            botones.append(self.boton_siguiente)
+        
+        return botones
+    
+    def construir_pagina(self, capa):
+        """
+        Dibuja el contenido que no cambia de la pagina actual
         """
         # Fondo blanco
-        pantalla.fill(BLANCO)
+        capa.fill(BLANCO)
         
         # Titulo
-        dibujar_texto(pantalla, "TUTORIAL", self.ancho // 2, 60, 64, MORADO)
-        dibujar_texto(pantalla, "Operaciones de Conjuntos", self.ancho // 2, 110, 32, GRIS)
+        dibujar_texto(capa, "TUTORIAL", self.ancho // 2, 60, 64, MORADO)
+        dibujar_texto(capa, "Operaciones de Conjuntos", self.ancho // 2, 110, 32, GRIS)
         
         # Obtener concepto actual
         concepto = self.conceptos[self.pagina_actual]
         
         # Caja del concepto
-        pygame.draw.rect(pantalla, GRIS_CLARO, (100, 160, self.ancho - 200, 350), border_radius=15)
+        pygame.draw.rect(capa, GRIS_CLARO, (100, 160, self.ancho - 200, 350), border_radius=15)
         
         # Borde izquierdo de color
-        pygame.draw.rect(pantalla, MORADO, (100, 160, 8, 350), border_radius=15)
+        pygame.draw.rect(capa, MORADO, (100, 160, 8, 350), border_radius=15)
         
         # Nombre y simbolo del concepto
         texto_titulo = f"{concepto['nombre']} ({concepto['simbolo']})"
-        dibujar_texto(pantalla, texto_titulo, self.ancho // 2, 200, 48, NEGRO)
+        dibujar_texto(capa, texto_titulo, self.ancho // 2, 200, 48, NEGRO)
         
-        # Descripcion
-        self.dibujar_texto_multiple_lineas(
-            pantalla, concepto['descripcion'], 
-            150, 250, self.ancho - 300, 28, NEGRO
-        )
+        # Descripcion, ya diagramada
+        self.descripciones[self.pagina_actual].dibujar(capa, 150, 250, NEGRO)
         
         # Caja de ejemplo
-        pygame.draw.rect(pantalla, BLANCO, (150, 350, self.ancho - 300, 130), border_radius=10)
+        pygame.draw.rect(capa, BLANCO, (150, 350, self.ancho - 300, 130), border_radius=10)
         
-        dibujar_texto(pantalla, "Ejemplo:", 200, 370, 28, MORADO, centrado=False)
+        dibujar_texto(capa, "Ejemplo:", 200, 370, 28, MORADO, centrado=False)
         
         # Lineas del ejemplo
         y_ejemplo = 400
-        dibujar_texto(pantalla, f"A = {concepto['ejemplo_a']}", 200, y_ejemplo, 24, NEGRO, centrado=False)
-        dibujar_texto(pantalla, f"B = {concepto['ejemplo_b']}", 200, y_ejemplo + 30, 24, NEGRO, centrado=False)
-        dibujar_texto(pantalla, concepto['ejemplo_resultado'], 200, y_ejemplo + 60, 24, MORADO, centrado=False)
+        dibujar_texto(capa, f"A = {concepto['ejemplo_a']}", 200, y_ejemplo, 24, NEGRO, centrado=False)
+        dibujar_texto(capa, f"B = {concepto['ejemplo_b']}", 200, y_ejemplo + 30, 24, NEGRO, centrado=False)
+        dibujar_texto(capa, concepto['ejemplo_resultado'], 200, y_ejemplo + 60, 24, MORADO, centrado=False)
         
         # Indicador de pagina
         texto_pagina = f"{self.pagina_actual + 1} / {len(self.conceptos)}"
-        dibujar_texto(pantalla, texto_pagina, self.ancho // 2, 540, 24, GRIS)
-        
-        # Dibujar botones
-        self.boton_volver.dibujar(pantalla)
-        
-        # Solo mostrar boton anterior si no estamos en la primera pagina
-        if self.pagina_actual > 0:
-            self.boton_anterior.dibujar(pantalla)
-        
-        # Solo mostrar boton siguiente si no estamos en la ultima pagina
-        if self.pagina_actual < len(self.conceptos) - 1:
-            self.boton_siguiente.dibujar(pantalla)
-    
-    def dibujar_texto_multiple_lineas(self, pantalla, texto, x, y, ancho_max, tamaño, color):
-        """
-        Dibuja texto que se ajusta en multiples lineas
-        
-        Args:
-            pantalla: Surface de pygame
-            texto: Texto a dibujar
-            x, y: Posicion inicial
-            ancho_max: Ancho maximo antes de hacer salto de linea
-            tamaño: Tamaño de fuente
-            color: Color del texto
-        """
-        fuente = pygame.font.Font(None, tamaño)
-        palabras = texto.split(' ')
-        lineas = []
-        linea_actual = ""
-        
-        for palabra in palabras:
-            prueba = linea_actual + palabra + " "
-            if fuente.size(prueba)[0] <= ancho_max:
-                linea_actual = prueba
-            else:
-                if linea_actual:
-                    lineas.append(linea_actual)
-                linea_actual = palabra + " "
-        
-        if linea_actual:
-            lineas.append(linea_actual)
-        
-        # Dibujar cada linea
-        for i, linea in enumerate(lineas):
-            superficie_texto = fuente.render(linea, True, color)
-            pantalla.blit(superficie_texto, (x, y + i * 30))
+        dibujar_texto(capa, texto_pagina, self.ancho // 2, 540, 24, GRIS)
     
-    def manejar_evento(self, evento):
+    def dibujar(self, pantalla):
         """
-        Maneja los eventos del tutorial
+        Dibuja el tutorial en la pantalla
         
         Returns:
-            String indicando la accion o None
+            Lista de rectangulos de la pantalla que cambiaron
         """
-        if self.boton_volver.click(evento):
-            return "menu"
+        mouse_pos = pygame.mouse.get_pos()
+        fondo = self.capas.obtener(pantalla, self.pagina_actual, self.construir_pagina)
         
-        if self.boton_anterior.click(evento):
-            if self.pagina_actual > 0:
-                self.pagina_actual -= 1
+        if not self.redibujo_completo:
+            # Solo pueden cambiar los botones al pasar el mouse
+            rects = []
+            redibujar_botones(pantalla, self.botones_visibles(), mouse_pos, fondo, rects)
+            return rects
         
-        if self.boton_siguiente.click(evento):
-            if self.pagina_actual < len(self.conceptos) - 1:
-                self.pagina_actual += 1
+        self.redibujo_completo = False
+        pantalla.blit(fondo, (0, 0))
+        
+        # Dibujar botones
+        for boton in self.botones_visibles():
+            boton.dibujar(pantalla, mouse_pos)
         
-        return None
\ No newline at end of file
+        return [pantalla.get_rect()]
+    
+    def pagina_anterior(self):
+        """
+        Vuelve a la pagina anterior, si hay una
+        """
+        if self.pagina_actual > 0:
+            self.pagina_actual -= 1
+            self.invalidar()
+    
+    def pagina_siguiente(self):
+        """
+        Avanza a la pagina siguiente, si hay una
+        """
+        if self.pagina_actual < len(self.conceptos) - 1:
+            self.pagina_actual += 1
+            self.invalidar()
\ No newline at end of file
@@ -0,0 +1,96 @@
+from enum import IntEnum
+
+# Datos de cada operacion, en el orden de Operacion
+NOMBRES = ("union", "interseccion", "diferencia", "diferencia_simetrica")
+SIMBOLOS = ("U", "n", "-", "Δ")
+# Enunciado de la pregunta para cada operacion; se arma una sola vez
+TEXTOS = tuple(f"Cual es el resultado de A {simbolo} B?" for simbolo in SIMBOLOS)
+
+
+# Operaciones de las preguntas; el valor es el mismo indice que usan lote e indice
+class Operacion(IntEnum):
+    UNION = 0
+    INTERSECCION = 1
+    DIFERENCIA = 2
+    DIFERENCIA_SIMETRICA = 3
+
+    @property
+    def nombre(self):
+        return NOMBRES[self]
+
+    @property
+    def simbolo(self):
+        return SIMBOLOS[self]
+
+    @classmethod
+    def desde_nombre(cls, nombre):
+        """
+        Retorna la operacion con ese nombre ('union', 'interseccion', ...)
+
+        Raises:
+            ValueError si el nombre no es de una operacion
+        """
+        return cls(NOMBRES.index(nombre))
+
+
+# Clase inmutable con una pregunta lista para mostrar
+class Pregunta:
+    __slots__ = ("conjunto_a", "conjunto_b", "operacion", "opciones", "indice_correcto",
+                 "texto", "textos_opciones")
+
+    def __init__(self, conjunto_a, conjunto_b, operacion, opciones, indice_correcto):
+        """
+        Args:
+            conjunto_a, conjunto_b: ConjuntoBits de la pregunta
+            operacion: Operacion (o su indice)
+            opciones: Las 4 opciones, en el orden de los botones
+            indice_correcto: Posicion de la respuesta correcta dentro de opciones
+        """
+        operacion = Operacion(operacion)
+        opciones = tuple(opciones)
+        asignar = object.__setattr__
+        asignar(self, "conjunto_a", conjunto_a)
+        asignar(self, "conjunto_b", conjunto_b)
+        asignar(self, "operacion", operacion)
+        asignar(self, "opciones", opciones)
+        asignar(self, "indice_correcto", int(indice_correcto))
+        asignar(self, "texto", TEXTOS[operacion])
+        asignar(self, "textos_opciones", tuple(opcion.texto for opcion in opciones))
+
+    def __setattr__(self, nombre, valor):
+        raise AttributeError("Pregunta no se puede modificar")
+
+    def __delattr__(self, nombre):
+        raise AttributeError("Pregunta no se puede modificar")
+
+    @property
+    def respuesta_correcta(self):
+        return self.opciones[self.indice_correcto]
+
+    @property
+    def simbolo(self):
+        return SIMBOLOS[self.operacion]
+
+    def es_correcta(self, indice):
+        """
+        Retorna True si la opcion en esa posicion es la respuesta correcta
+        """
+        return indice == self.indice_correcto
+
+    def __eq__(self, otra):
+        if isinstance(otra, Pregunta):
+            return (self.conjunto_a == otra.conjunto_a and self.conjunto_b == otra.conjunto_b and
+                    self.operacion == otra.operacion and self.opciones == otra.opciones)
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((self.conjunto_a, self.conjunto_b, self.operacion, self.opciones))
+
+    def __repr__(self):
+        return (f"Pregunta(A={self.conjunto_a.texto}, B={self.conjunto_b.texto}, "
+                f"{self.operacion.nombre}, opciones={list(self.textos_opciones)}, "
+                f"correcta={self.indice_correcto})")
+
+    def __reduce__(self):
+        return (Pregunta, (self.conjunto_a, self.conjunto_b, self.operacion,
+                           self.opciones, self.indice_correcto))
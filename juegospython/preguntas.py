@@ -0,0 +1,126 @@
+import queue
+import threading
+
+# Clase que mantiene preguntas listas para mostrar, preparadas en otro hilo
+class ColaPreguntas:
+    def __init__(self, generador, preparar, capacidad=4, en_orden=False):
+        """
+        Inicializa la cola vacia; el hilo productor arranca con iniciar()
+
+        Args:
+            generador: GeneradorConjuntos que crea las preguntas
+            preparar: Funcion (pregunta, en_hilo) -> datos ya renderizados de esa pregunta;
+                en_hilo indica si se llama desde el hilo productor
+            capacidad: Cantidad maxima de preguntas preparadas en espera; con 0 no
+                hay hilo y cada pregunta se genera al pedirla
+            en_orden: Si es True, con la cola vacia se espera al productor en lugar de
+                generar en el momento; asi las preguntas salen en el orden en que el
+                generador las creo (necesario para grabar y reproducir partidas)
+        """
+        self.generador = generador
+        self.preparar = preparar
+        self.capacidad = capacidad
+        self.en_orden = en_orden
+        self.cola = queue.Queue(maxsize=capacidad)
+
+        # El generador no se usa desde dos hilos a la vez
+        self.bloqueo = threading.Lock()
+        self.hilo = None
+        self.detenida = threading.Event()
+
+        # Metricas
+        self.desde_cola = 0
+        self.sincronicas = 0
+        self.producidas = 0
+        self.profundidad_minima = capacidad
+
+    def iniciar(self):
+        """
+        Arranca el hilo productor si no esta corriendo
+        """
+        if self.capacidad == 0 or (self.hilo is not None and self.hilo.is_alive()):
+            return
+        self.detenida.clear()
+        self.hilo = threading.Thread(target=self.producir, name="ColaPreguntas", daemon=True)
+        self.hilo.start()
+
+    def detener(self):
+        """
+        Detiene el hilo productor y descarta las preguntas en espera
+        """
+        self.detenida.set()
+        # Vaciar la cola desbloquea al productor si estaba esperando lugar
+        self.vaciar()
+        if self.hilo is not None:
+            self.hilo.join(timeout=1)
+            self.hilo = None
+        self.vaciar()
+
+    def vaciar(self):
+        """
+        Descarta las preguntas en espera
+        """
+        while not self.cola.empty():
+            self.cola.get_nowait()
+
+    def crear(self, en_hilo):
+        """
+        Genera y prepara una pregunta
+
+        Args:
+            en_hilo: True si se llama desde el hilo productor
+
+        Returns:
+            Tupla (pregunta, datos preparados)
+        """
+        with self.bloqueo:
+            pregunta = self.generador.generar_pregunta()
+        return pregunta, self.preparar(pregunta, en_hilo)
+
+    def producir(self):
+        """
+        Loop del hilo productor: mantiene la cola llena
+        Con la cola llena queda bloqueado en put, sin despertarse cada tanto;
+        detener() lo libera vaciando la cola
+        """
+        while not self.detenida.is_set():
+            elemento = self.crear(True)
+            self.cola.put(elemento)
+            self.producidas += 1
+
+    def siguiente(self):
+        """
+        Retorna la siguiente pregunta preparada
+        Si la cola esta vacia la genera en el momento
+
+        Returns:
+            Tupla (pregunta, datos preparados)
+        """
+        profundidad = self.cola.qsize()
+        if profundidad < self.profundidad_minima:
+            self.profundidad_minima = profundidad
+        # En orden: generar aca podria adelantarse a la que el productor esta creando
+        bloquear = self.en_orden and self.hilo is not None
+        try:
+            elemento = self.cola.get(block=bloquear)
+            self.desde_cola += 1
+            return elemento
+        except queue.Empty:
+            self.sincronicas += 1
+            return self.crear(False)
+
+    def metricas(self):
+        """
+        Retorna el estado de la cola
+
+        Returns:
+            Diccionario con la profundidad actual y minima y el origen de las preguntas
+        """
+        return {
+            "profundidad": self.cola.qsize(),
+            "profundidad_minima": self.profundidad_minima,
+            "capacidad": self.capacidad,
+            "desde_cola": self.desde_cola,
+            "sincronicas": self.sincronicas,
+            "producidas": self.producidas
+        }
@@ -0,0 +1,262 @@
+import os
+import sys
+import math
+import time
+import random
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from adaptativo import MotorAdaptativo
+from generador import GeneradorConjuntos
+from indice import IndicePreguntas
+from logica import Partida
+from temporizador import Planificador, RelojSimulado
+
+# Segundos simulados de cada partida
+DURACION_PARTIDA = 120
+# Partidas que juega cada proceso por tarea; tareas mas grandes pasan menos datos entre procesos
+TAMAÑO_LOTE = 250
+# Ancho de los intervalos del histograma de puntajes
+ANCHO_HISTOGRAMA = 50
+
+# Muestreadores del indice por dificultad, uno por proceso
+_muestreadores = {}
+
+
+# Jugador simulado: acierta con una probabilidad fija y tarda un tiempo al azar en responder
+class Bot:
+    def __init__(self, nombre, precision, reaccion_media, reaccion_desvio):
+        """
+        Args:
+            nombre: Nombre para el reporte
+            precision: Probabilidad de elegir la respuesta correcta (0 a 1)
+            reaccion_media: Segundos que tarda en responder, en promedio
+            reaccion_desvio: Desvio estandar de ese tiempo; la distribucion es
+                lognormal, asi nunca es negativo y tiene cola hacia la derecha
+        """
+        self.nombre = nombre
+        self.precision = precision
+        self.reaccion_media = reaccion_media
+        self.reaccion_desvio = reaccion_desvio
+        # Parametros de la lognormal con esa media y ese desvio
+        varianza = math.log(1 + (reaccion_desvio / reaccion_media) ** 2)
+        self.mu = math.log(reaccion_media) - varianza / 2
+        self.sigma = math.sqrt(varianza)
+
+    def tiempo_reaccion(self, rng):
+        """
+        Retorna los segundos que tarda en responder una pregunta
+        """
+        return rng.lognormvariate(self.mu, self.sigma)
+
+    def elegir(self, pregunta, rng):
+        """
+        Retorna la posicion de la opcion que elige
+        """
+        if rng.random() < self.precision:
+            return pregunta.indice_correcto
+        incorrecta = rng.randrange(len(pregunta.opciones) - 1)
+        return incorrecta + (incorrecta >= pregunta.indice_correcto)
+
+    @classmethod
+    def desde_texto(cls, texto):
+        """
+        Crea un bot a partir de 'nombre:precision:reaccion_media:reaccion_desvio'
+
+        Raises:
+            ValueError si el texto no tiene ese formato
+        """
+        nombre, precision, media, desvio = texto.split(":")
+        return cls(nombre, float(precision), float(media), float(desvio))
+
+
+BOTS_PREDETERMINADOS = [
+    Bot("principiante", 0.5, 8.0, 3.0),
+    Bot("promedio", 0.75, 5.0, 2.0),
+    Bot("experto", 0.95, 2.5, 1.0),
+]
+
+
+def muestreador(dificultad):
+    """
+    Retorna el muestreador del indice para una dificultad, cargandolo una vez por proceso
+    """
+    elegido = _muestreadores.get(dificultad)
+    if elegido is None:
+        indice = IndicePreguntas.cargar_o_construir()
+        elegido = _muestreadores[dificultad] = indice.muestreador(dificultad=dificultad, sin_vacias=True)
+    return elegido
+
+
+def jugar_partida(bot, semilla, duracion=DURACION_PARTIDA, dificultad=None):
+    """
+    Juega una partida completa saltando de un temporizador al siguiente
+
+    Args:
+        bot: Bot que juega
+        semilla: Semilla de las preguntas y de las decisiones del bot
+        duracion: Segundos simulados de la partida
+        dificultad: 'facil', 'media', 'dificil', 'adaptativa' o None para preguntas al azar
+
+    Returns:
+        Tupla (puntos, aciertos, errores, vencidas)
+    """
+    rng = random.Random(semilla)
+    generador = GeneradorConjuntos(random.Random(rng.getrandbits(64)))
+    adaptativo = None
+    if dificultad == "adaptativa":
+        adaptativo = MotorAdaptativo()
+        generador.usar_adaptativo(adaptativo)
+    elif dificultad is not None:
+        generador.usar_muestreador(muestreador(dificultad))
+
+    reloj = RelojSimulado()
+    planificador = Planificador(reloj)
+    partida = Partida(generador.generar_pregunta, planificador, adaptativo=adaptativo)
+
+    def al_nueva_pregunta(pregunta):
+        def responder():
+            # Si la pregunta ya vencio, la respuesta llega tarde y no cuenta
+            if partida.pregunta is pregunta:
+                partida.responder(bot.elegir(pregunta, rng))
+        planificador.despues(bot.tiempo_reaccion(rng), responder)
+
+    partida.al_nueva_pregunta = al_nueva_pregunta
+    partida.iniciar()
+    while True:
+        momento = planificador.momento_proximo()
+        if momento is None or momento > duracion:
+            break
+        reloj.tiempo = momento
+        planificador.procesar()
+    partida.terminar()
+    return partida.puntos, partida.aciertos, partida.errores, partida.vencidas
+
+
+def jugar_lote(bot, semillas, duracion=DURACION_PARTIDA, dificultad=None):
+    """
+    Juega una partida por semilla; es la tarea que recibe cada proceso
+
+    Returns:
+        Lista de resultados de jugar_partida
+    """
+    return [jugar_partida(bot, semilla, duracion, dificultad) for semilla in semillas]
+
+
+def percentil(valores_ordenados, p):
+    """
+    Retorna el percentil p (0-100) de una lista ya ordenada
+    """
+    if not valores_ordenados:
+        return 0
+    indice = min(len(valores_ordenados) - 1, int(round(p / 100 * (len(valores_ordenados) - 1))))
+    return valores_ordenados[indice]
+
+
+def resumir(resultados):
+    """
+    Resume las partidas de un bot
+
+    Returns:
+        Diccionario con media, desvio, percentiles e histograma de puntos y
+        promedios de aciertos, errores y vencidas por partida
+    """
+    puntos = sorted(r[0] for r in resultados)
+    n = len(resultados)
+    media = sum(puntos) / n
+    histograma = {}
+    for valor in puntos:
+        inicio = valor // ANCHO_HISTOGRAMA * ANCHO_HISTOGRAMA
+        histograma[inicio] = histograma.get(inicio, 0) + 1
+    return {
+        "partidas": n,
+        "media": round(media, 2),
+        "desvio": round(math.sqrt(sum((p - media) ** 2 for p in puntos) / n), 2),
+        "minimo": puntos[0],
+        "p10": percentil(puntos, 10),
+        "p50": percentil(puntos, 50),
+        "p90": percentil(puntos, 90),
+        "maximo": puntos[-1],
+        "aciertos": round(sum(r[1] for r in resultados) / n, 2),
+        "errores": round(sum(r[2] for r in resultados) / n, 2),
+        "vencidas": round(sum(r[3] for r in resultados) / n, 2),
+        "histograma": histograma,
+    }
+
+
+def simular(bots, partidas, procesos=None, semilla=0, duracion=DURACION_PARTIDA,
+            dificultad=None, tamaño_lote=TAMAÑO_LOTE):
+    """
+    Juega muchas partidas de cada bot repartidas entre varios procesos
+
+    Args:
+        bots: Lista de Bot
+        partidas: Partidas por bot
+        procesos: Procesos a usar (por defecto uno por CPU); con 1 no se crean procesos
+        semilla: Semilla de toda la simulacion; con la misma semilla el resultado es el mismo
+        duracion: Segundos simulados de cada partida
+        dificultad: Dificultad de las preguntas, o None
+        tamaño_lote: Partidas por tarea
+
+    Returns:
+        Tupla (diccionario nombre del bot -> resumen, partidas por segundo)
+    """
+    rng = random.Random(semilla)
+    tareas = []
+    for i, bot in enumerate(bots):
+        semillas = [rng.getrandbits(63) for _ in range(partidas)]
+        for inicio in range(0, partidas, tamaño_lote):
+            tareas.append((i, bot, semillas[inicio:inicio + tamaño_lote]))
+
+    resultados = [[] for _ in bots]
+    comienzo = time.perf_counter()
+    if procesos == 1:
+        for i, bot, semillas in tareas:
+            resultados[i].extend(jugar_lote(bot, semillas, duracion, dificultad))
+    else:
+        with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+            futuros = [(i, ejecutor.submit(jugar_lote, bot, semillas, duracion, dificultad))
+                       for i, bot, semillas in tareas]
+            for i, futuro in futuros:
+                resultados[i].extend(futuro.result())
+    segundos = time.perf_counter() - comienzo
+
+    resumenes = {bot.nombre: resumir(r) for bot, r in zip(bots, resultados)}
+    return resumenes, len(bots) * partidas / segundos
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(
+        description="Simula partidas de Set-Zero con jugadores automaticos, sin pygame")
+    parser.add_argument("--partidas", type=int, default=2000, help="partidas por bot")
+    parser.add_argument("--procesos", type=int, default=os.cpu_count(),
+                        help="procesos en paralelo (1 para no crear procesos)")
+    parser.add_argument("--duracion", type=float, default=DURACION_PARTIDA,
+                        help="segundos simulados de cada partida")
+    parser.add_argument("--dificultad", choices=["facil", "media", "dificil", "adaptativa"],
+                        help="elegir preguntas de ese nivel del indice precalculado, o "
+                             "adaptarlas a las respuestas de cada bot")
+    parser.add_argument("--semilla", type=int, default=0, help="semilla de la simulacion")
+    parser.add_argument("--bot", action="append", type=Bot.desde_texto,
+                        metavar="NOMBRE:PRECISION:MEDIA:DESVIO",
+                        help="bot a simular (se puede repetir); reaccion en segundos")
+    args = parser.parse_args(argumentos)
+
+    bots = args.bot or BOTS_PREDETERMINADOS
+    resumenes, velocidad = simular(bots, args.partidas, args.procesos, args.semilla,
+                                   args.duracion, args.dificultad)
+
+    for nombre, resumen in resumenes.items():
+        print(f"{nombre:14} puntos media {resumen['media']:7.2f}  desvio {resumen['desvio']:6.2f}  "
+              f"p10 {resumen['p10']:4}  p50 {resumen['p50']:4}  p90 {resumen['p90']:4}  "
+              f"aciertos {resumen['aciertos']:5.2f}  errores {resumen['errores']:5.2f}  "
+              f"vencidas {resumen['vencidas']:5.2f}")
+        mayor = max(resumen["histograma"].values())
+        for inicio, cantidad in sorted(resumen["histograma"].items()):
+            barra = "#" * max(1, round(cantidad / mayor * 40))
+            print(f"    {inicio:4}-{inicio + ANCHO_HISTOGRAMA - 1:<4} {cantidad:6}  {barra}")
+    print(f"{velocidad:.0f} partidas por segundo ({args.procesos} procesos)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+import heapq
+import itertools
+from time import monotonic
+
+# Clase para un temporizador programado; se obtiene de Planificador.despues o Planificador.cada
+class Temporizador:
+    __slots__ = ("momento", "intervalo", "funcion", "cancelado")
+
+    def __init__(self, momento, intervalo, funcion):
+        """
+        Args:
+            momento: Instante (segun el reloj del planificador) en que vence
+            intervalo: Segundos entre repeticiones, o None si se ejecuta una sola vez
+            funcion: Funcion sin argumentos que se llama al vencer
+        """
+        self.momento = momento
+        self.intervalo = intervalo
+        self.funcion = funcion
+        self.cancelado = False
+
+    def cancelar(self):
+        """
+        Evita que el temporizador se vuelva a ejecutar
+        """
+        self.cancelado = True
+
+
+# Clase que ejecuta funciones cuando vencen sus temporizadores
+class Planificador:
+    def __init__(self, reloj=monotonic):
+        """
+        Inicializa el planificador sin temporizadores
+
+        Args:
+            reloj: Funcion sin argumentos que retorna segundos de un reloj monotono;
+                se puede reemplazar por un RelojSimulado
+        """
+        self.reloj = reloj
+        # Monticulo de (momento, orden, temporizador); orden desempata por llegada
+        self.cola = []
+        self.contador = itertools.count()
+
+    def ahora(self):
+        """
+        Retorna el tiempo actual del reloj del planificador
+        """
+        return self.reloj()
+
+    def programar(self, temporizador):
+        """
+        Agrega un temporizador a la cola
+        """
+        heapq.heappush(self.cola, (temporizador.momento, next(self.contador), temporizador))
+        return temporizador
+
+    def despues(self, segundos, funcion):
+        """
+        Programa una funcion para que se ejecute una vez
+
+        Returns:
+            Temporizador, para poder cancelarlo
+        """
+        return self.programar(Temporizador(self.reloj() + segundos, None, funcion))
+
+    def cada(self, segundos, funcion):
+        """
+        Programa una funcion para que se ejecute cada cierta cantidad de segundos,
+        la primera vez dentro de un intervalo
+
+        Returns:
+            Temporizador, para poder cancelarlo
+
+        Raises:
+            ValueError si el intervalo no es positivo; se reprogramaria siempre en el
+            pasado y procesar no terminaria nunca
+        """
+        if not segundos > 0:
+            raise ValueError(f"el intervalo debe ser positivo: {segundos!r}")
+        return self.programar(Temporizador(self.reloj() + segundos, segundos, funcion))
+
+    def procesar(self):
+        """
+        Ejecuta los temporizadores vencidos, en orden de vencimiento
+
+        Returns:
+            Cantidad de funciones ejecutadas
+        """
+        ahora = self.reloj()
+        ejecutadas = 0
+        while self.cola and self.cola[0][0] <= ahora:
+            _, _, temporizador = heapq.heappop(self.cola)
+            if temporizador.cancelado:
+                continue
+            if temporizador.intervalo is not None:
+                # Se reprograma desde el momento previsto, asi no acumula atraso
+                temporizador.momento += temporizador.intervalo
+                self.programar(temporizador)
+            temporizador.funcion()
+            ejecutadas += 1
+        return ejecutadas
+
+    def momento_proximo(self):
+        """
+        Retorna el instante (segun el reloj del planificador) del proximo
+        vencimiento, o None si no hay temporizadores pendientes
+        """
+        while self.cola and self.cola[0][2].cancelado:
+            heapq.heappop(self.cola)
+        if not self.cola:
+            return None
+        return self.cola[0][0]
+
+    def proximo(self):
+        """
+        Retorna los segundos que faltan para el proximo vencimiento,
+        o None si no hay temporizadores pendientes
+        """
+        momento = self.momento_proximo()
+        if momento is None:
+            return None
+        return max(0.0, momento - self.reloj())
+
+    def limpiar(self):
+        """
+        Cancela todos los temporizadores
+        """
+        for _, _, temporizador in self.cola:
+            temporizador.cancelado = True
+        self.cola = []
+
+
+# Reloj que solo avanza cuando se le pide; sirve para simular el juego mas rapido que el tiempo real
+class RelojSimulado:
+    def __init__(self, inicio=0.0):
+        self.tiempo = inicio
+
+    def __call__(self):
+        return self.tiempo
+
+    def avanzar(self, segundos):
+        """
+        Adelanta el reloj
+        """
+        self.tiempo += segundos
+
+
+# Reloj que se lee una vez por cuadro: todo lo que pasa en el cuadro ve el mismo instante,
+# asi una grabacion puede repetir exactamente cuando vencio cada temporizador
+class RelojCuadro:
+    def __init__(self, reloj=monotonic):
+        self.reloj = reloj
+        self.tiempo = reloj()
+
+    def __call__(self):
+        return self.tiempo
+
+    def medir(self):
+        """
+        Lee el reloj real; se llama al empezar cada cuadro
+
+        Returns:
+            El instante leido
+        """
+        self.tiempo = self.reloj()
+        return self.tiempo
@@ -0,0 +1,377 @@
+import math
+import pygame
+from collections import OrderedDict
+
+# Caracteres de la notacion de conjuntos: todo lo que muestra un ConjuntoBits
+# y los simbolos de las operaciones
+ALFABETO_CONJUNTOS = "0123456789{}, UnΔ-"
+
+# Clase para renderizar texto reutilizando fuentes y superficies
+class MotorTexto:
+    def __init__(self, limite=256):
+        """
+        Inicializa el motor de texto con sus caches vacios
+
+        Args:
+            limite: Numero maximo de superficies guardadas en el cache
+        """
+        self.limite = limite
+        self.fuentes = {}
+        self.superficies = OrderedDict()
+        # Avance horizontal de cada caracter, por tamaño de fuente
+        self.avances = {}
+        # Bloques ya diagramados, por (texto, tamaño, ancho maximo, interlineado)
+        self.bloques = OrderedDict()
+        # Atlas de glifos, por (tamaño, color)
+        self.atlas_glifos = {}
+        self.aciertos = 0
+        self.fallos = 0
+
+    def fuente(self, tamaño):
+        """
+        Retorna la fuente de un tamaño, cargandola solo la primera vez
+
+        Args:
+            tamaño: Tamaño de la fuente
+
+        Returns:
+            Objeto pygame.font.Font compartido
+        """
+        fuente = self.fuentes.get(tamaño)
+        if fuente is None:
+            fuente = pygame.font.Font(None, tamaño)
+            self.fuentes[tamaño] = fuente
+        return fuente
+
+    def renderizar(self, texto, tamaño, color, antialias=True):
+        """
+        Retorna la superficie de un texto, usando el cache LRU
+
+        Args:
+            texto: Texto a renderizar
+            tamaño: Tamaño de la fuente
+            color: Color del texto
+            antialias: Si True, suaviza los bordes del texto
+
+        Returns:
+            Surface con el texto renderizado
+        """
+        clave = (texto, tamaño, color, antialias)
+        superficie = self.superficies.get(clave)
+
+        if superficie is not None:
+            self.superficies.move_to_end(clave)
+            self.aciertos += 1
+            return superficie
+
+        self.fallos += 1
+        superficie = self.fuente(tamaño).render(texto, antialias, color)
+        self.superficies[clave] = superficie
+
+        # Descartar la superficie usada hace mas tiempo
+        if len(self.superficies) > self.limite:
+            self.superficies.popitem(last=False)
+
+        return superficie
+
+    def ancho(self, texto, tamaño):
+        """
+        Mide un texto sumando el avance de cada caracter, sin volver a medir
+        todo el texto; cada caracter se mide una sola vez por tamaño
+
+        Args:
+            texto: Texto a medir
+            tamaño: Tamaño de la fuente
+
+        Returns:
+            Ancho en pixeles
+        """
+        avances = self.avances.get(tamaño)
+        if avances is None:
+            avances = self.avances[tamaño] = {}
+        total = 0
+        for caracter in texto:
+            avance = avances.get(caracter)
+            if avance is None:
+                # El avance de un glifo tiene fraccion de pixel; medir 32 copias la conserva
+                avance = avances[caracter] = self.fuente(tamaño).size(caracter * 32)[0] / 32
+            total += avance
+        return math.ceil(total)
+
+    def diagramar(self, texto, tamaño, ancho_max, interlineado=None):
+        """
+        Reparte un texto en lineas que no superan un ancho
+        El resultado se guarda, asi que diagramar el mismo texto otra vez es gratis
+
+        Args:
+            texto: Texto a diagramar; los saltos de linea se respetan
+            tamaño: Tamaño de la fuente
+            ancho_max: Ancho maximo de cada linea en pixeles
+            interlineado: Distancia entre lineas (por defecto la de la fuente)
+
+        Returns:
+            BloqueTexto
+        """
+        clave = (texto, tamaño, ancho_max, interlineado)
+        bloque = self.bloques.get(clave)
+        if bloque is not None:
+            self.bloques.move_to_end(clave)
+            return bloque
+
+        espacio = self.ancho(" ", tamaño)
+        lineas = []
+        for parrafo in texto.split("\n"):
+            linea = []
+            ancho_linea = 0
+            for palabra in parrafo.split(" "):
+                ancho_palabra = self.ancho(palabra, tamaño)
+                # Una palabra mas ancha que la linea queda sola en su linea
+                if linea and ancho_linea + espacio + ancho_palabra > ancho_max:
+                    lineas.append(" ".join(linea))
+                    linea = []
+                    ancho_linea = 0
+                ancho_linea += (espacio if linea else 0) + ancho_palabra
+                linea.append(palabra)
+            lineas.append(" ".join(linea))
+
+        if interlineado is None:
+            interlineado = self.fuente(tamaño).get_linesize()
+        bloque = BloqueTexto(lineas, tamaño, interlineado)
+        self.bloques[clave] = bloque
+        if len(self.bloques) > self.limite:
+            self.bloques.popitem(last=False)
+        return bloque
+
+    def atlas(self, tamaño, color):
+        """
+        Retorna el atlas de glifos de un tamaño y color, creandolo la primera vez
+        Se crea desde el hilo principal: usa la fuente compartida
+
+        Args:
+            tamaño: Tamaño de la fuente
+            color: Color del texto
+
+        Returns:
+            AtlasGlifos con ALFABETO_CONJUNTOS ya rasterizado
+        """
+        clave = (tamaño, color)
+        atlas = self.atlas_glifos.get(clave)
+        if atlas is None:
+            atlas = AtlasGlifos(self.fuente(tamaño), color)
+            self.atlas_glifos[clave] = atlas
+        return atlas
+
+    def estadisticas(self):
+        """
+        Retorna los contadores del cache
+
+        Returns:
+            Diccionario con aciertos, fallos, tamaño y limite del cache
+        """
+        return {
+            "aciertos": self.aciertos,
+            "fallos": self.fallos,
+            "tamaño": len(self.superficies),
+            "limite": self.limite
+        }
+
+    def limpiar(self):
+        """
+        Vacia el cache de superficies y reinicia los contadores
+        """
+        self.superficies.clear()
+        self.bloques.clear()
+        self.atlas_glifos.clear()
+        self.aciertos = 0
+        self.fallos = 0
+
+
+# Clase para un texto ya repartido en lineas, que se dibuja como una sola superficie
+class BloqueTexto:
+    def __init__(self, lineas, tamaño, interlineado):
+        """
+        Args:
+            lineas: Texto de cada linea
+            tamaño: Tamaño de la fuente
+            interlineado: Distancia en pixeles entre el inicio de dos lineas
+        """
+        self.lineas = lineas
+        self.tamaño = tamaño
+        self.interlineado = interlineado
+        self.superficies = {}
+
+    def renderizar(self, color, centrado=False):
+        """
+        Retorna todo el bloque en una superficie transparente, creada una vez por color
+
+        Args:
+            color: Color del texto
+            centrado: Si True, cada linea se centra en el ancho del bloque
+        """
+        clave = (color, centrado)
+        superficie = self.superficies.get(clave)
+        if superficie is not None:
+            return superficie
+
+        fuente = motor_texto.fuente(self.tamaño)
+        renderizadas = [fuente.render(linea, True, color) for linea in self.lineas]
+        ancho = max(s.get_width() for s in renderizadas)
+        alto = self.interlineado * (len(renderizadas) - 1) + renderizadas[-1].get_height()
+
+        # Fondo transparente del mismo color, para que los bordes suavizados no se oscurezcan
+        superficie = pygame.Surface((ancho, alto), pygame.SRCALPHA)
+        superficie.fill((*color[:3], 0))
+        for i, renderizada in enumerate(renderizadas):
+            x = (ancho - renderizada.get_width()) // 2 if centrado else 0
+            superficie.blit(renderizada, (x, i * self.interlineado))
+
+        self.superficies[clave] = superficie
+        return superficie
+
+    def dibujar(self, pantalla, x, y, color, centrado=False):
+        """
+        Dibuja el bloque
+
+        Args:
+            pantalla: Surface donde dibujar
+            x, y: Esquina superior izquierda, o centro del bloque si centrado es True
+            color: Color del texto
+            centrado: Si True, centra el bloque y cada linea en x, y
+
+        Returns:
+            Rect ocupado
+        """
+        superficie = self.renderizar(color, centrado)
+        if centrado:
+            rect = superficie.get_rect(center=(x, y))
+        else:
+            rect = superficie.get_rect(topleft=(x, y))
+        pantalla.blit(superficie, rect)
+        return rect
+
+
+# Clase que dibuja textos de un alfabeto chico copiando glifos ya rasterizados
+class AtlasGlifos:
+    def __init__(self, fuente, color, alfabeto=ALFABETO_CONJUNTOS, limite=2048):
+        """
+        Rasteriza cada caracter del alfabeto una vez, uno al lado del otro en una
+        sola superficie, y mide los avances de todos los pares de caracteres
+
+        Args:
+            fuente: pygame.font.Font de la que salen los glifos
+            color: Color del texto
+            alfabeto: Caracteres que se rasterizan al crear el atlas
+            limite: Cantidad maxima de diagramas de texto guardados
+        """
+        self.fuente = fuente
+        self.color = color
+        self.limite = limite
+        # caracter -> Rect del glifo dentro de self.superficie
+        self.glifos = {}
+        # caracter -> avance; (a, b) -> avance de a cuando le sigue b, con kerning
+        self.avances = {}
+        self.pares = {}
+        # texto -> (ancho, alto, [(x, area), ...])
+        self.diagramas = {}
+        self.superficie = None
+        self.agregar(alfabeto)
+
+    def agregar(self, caracteres):
+        """
+        Rasteriza caracteres que todavia no estan en el atlas y vuelve a armar la superficie
+        Usa la fuente, asi que solo se llama desde el hilo principal
+        """
+        nuevos = [c for c in dict.fromkeys(caracteres) if c not in self.glifos]
+        if not nuevos:
+            return
+
+        glifos = [(c, self.superficie.subsurface(rect)) for c, rect in self.glifos.items()]
+        glifos += [(c, self.fuente.render(c, True, self.color)) for c in nuevos]
+        ancho = sum(glifo.get_width() for _, glifo in glifos)
+        alto = max(glifo.get_height() for _, glifo in glifos)
+
+        # Fondo transparente del mismo color, como en BloqueTexto
+        superficie = pygame.Surface((ancho, alto), pygame.SRCALPHA)
+        superficie.fill((*self.color[:3], 0))
+        x = 0
+        self.glifos = {}
+        for caracter, glifo in glifos:
+            self.glifos[caracter] = superficie.blit(glifo, (x, 0))
+            x += glifo.get_width()
+        self.superficie = superficie
+
+        # Avance de cada par: el ancho de los dos juntos menos el del segundo
+        for caracter in nuevos:
+            self.avances[caracter] = self.fuente.size(caracter)[0]
+        for a in self.glifos:
+            for b in self.glifos:
+                if (a, b) not in self.pares:
+                    self.pares[(a, b)] = self.fuente.size(a + b)[0] - self.avances[b]
+        self.diagramas.clear()
+
+    def diagramar(self, texto):
+        """
+        Calcula donde va cada glifo de un texto; el resultado se guarda
+
+        Returns:
+            Tupla (ancho, alto, [(x, area en el atlas), ...])
+        """
+        diagrama = self.diagramas.get(texto)
+        if diagrama is not None:
+            return diagrama
+
+        if not texto:
+            return 0, self.fuente.get_height(), []
+        self.agregar(texto)
+        posiciones = []
+        x = 0
+        for i, caracter in enumerate(texto):
+            posiciones.append((x, self.glifos[caracter]))
+            if i + 1 < len(texto):
+                x += self.pares[(caracter, texto[i + 1])]
+        ancho = x + self.avances[texto[-1]]
+        alto = max(area.height for _, area in posiciones)
+
+        if len(self.diagramas) >= self.limite:
+            self.diagramas.clear()
+        diagrama = self.diagramas[texto] = (ancho, alto, posiciones)
+        return diagrama
+
+    def dibujar(self, pantalla, texto, x, y, centrado=True):
+        """
+        Dibuja un texto con una sola llamada a blits
+
+        Args:
+            pantalla: Surface donde dibujar
+            texto: Texto a dibujar
+            x, y: Centro del texto, o su esquina superior izquierda si centrado es False
+            centrado: Si True, centra el texto en x, y
+
+        Returns:
+            Rect ocupado, igual al que tendria el texto renderizado con la fuente
+        """
+        ancho, alto, posiciones = self.diagramar(texto)
+        if centrado:
+            x -= ancho // 2
+            y -= alto // 2
+        atlas = self.superficie
+        pantalla.blits([(atlas, (x + dx, y), area) for dx, area in posiciones], False)
+        return pygame.Rect(x, y, ancho, alto)
+
+    def renderizar(self, texto):
+        """
+        Retorna una superficie transparente nueva con el texto, como Font.render
+        Si el texto solo usa caracteres del atlas no toca la fuente, asi que se
+        puede llamar desde otro hilo
+        """
+        ancho, alto, posiciones = self.diagramar(texto)
+        superficie = pygame.Surface((max(ancho, 1), alto), pygame.SRCALPHA)
+        # Sobre una superficie vacia, el maximo por canal copia el glifo tal cual
+        # y es bastante mas rapido que mezclar alfa con alfa
+        atlas = self.superficie
+        superficie.blits([(atlas, (dx, 0), area, pygame.BLEND_RGBA_MAX) for dx, area in posiciones], False)
+        return superficie
+
+
+# Instancia compartida por todas las pantallas
+motor_texto = MotorTexto()